@@ -3,12 +3,29 @@
 import os
 from flask import Flask
 from flask_cors import CORS
-from db import init_db
+from sqlalchemy.engine import make_url
+from db import init_db, is_sqlite_file, replicas
 from controllers import pet_bp
-from logger import get_logger
+from cli import pets_cli
+from response_cache import response_cache
+from metrics import metrics
+from storage import init_storage
+from logger import get_logger, init_request_id
 
 logger = get_logger(__name__)
 
+def _engine_options(database_uri: str) -> dict:
+    url = make_url(database_uri)
+    if url.get_backend_name() == 'sqlite' and not is_sqlite_file(url):
+        return {}
+    
+    return {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true',
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+    }
+
 def create_app(config_name='default'):
     app = Flask(__name__)
     
@@ -17,13 +34,33 @@ def create_app(config_name='default'):
         'sqlite:///pets.db'
     )
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = _engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
+    app.config['SQLITE_BUSY_TIMEOUT'] = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000))
+    app.config['DATABASE_REPLICA_URLS'] = [url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+    app.config['REPLICA_STICKY_SECONDS'] = float(os.environ.get('REPLICA_STICKY_SECONDS', 5))
     app.config['DEBUG'] = os.environ.get('FLASK_ENV') == 'development'
     app.config['RESTX_MASK_SWAGGER'] = False
+    app.config['RESPONSE_CACHE_ENABLED'] = os.environ.get('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+    app.config['RESPONSE_CACHE_TTL'] = float(os.environ.get('RESPONSE_CACHE_TTL', 30))
+    app.config['RESPONSE_CACHE_SIZE'] = int(os.environ.get('RESPONSE_CACHE_SIZE', 1024))
+    app.config['FOTO_STORAGE_PATH'] = os.environ.get('FOTO_STORAGE_PATH')
+    app.config['THUMBNAIL_WORKERS'] = int(os.environ.get('THUMBNAIL_WORKERS', 2))
+    app.config['DATA_ACCESS'] = os.environ.get('DATA_ACCESS', 'sync')
+    app.config['ASYNC_DATABASE_URL'] = os.environ.get('ASYNC_DATABASE_URL')
+    app.config['JSON_ENCODER'] = os.environ.get('JSON_ENCODER', 'json')
+    app.config['METRICS_ENABLED'] = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+    app.config['SERVER_TIMING_ENABLED'] = os.environ.get('SERVER_TIMING_ENABLED', 'false').lower() == 'true'
     
     CORS(app)
+    init_request_id(app)
     init_db(app)
+    replicas.init_app(app, _engine_options)
+    response_cache.init_app(app)
+    metrics.init_app(app)
+    init_storage(app)
     
     app.register_blueprint(pet_bp)
+    app.cli.add_command(pets_cli)
     
     return app
 
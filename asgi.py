@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Ponto de entrada ASGI (``uvicorn asgi:application``)."""
+import io
+import re
+from urllib.parse import parse_qs
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from werkzeug.wrappers import Response
+from app import create_app
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class _ThreadedWsgiToAsgiInstance(WsgiToAsgiInstance):
+    # O WsgiToAsgi do asgiref roda todas as requisições na mesma thread;
+    # aqui cada requisição síncrona usa uma thread do pool do event loop.
+    run_wsgi_app = sync_to_async(WsgiToAsgiInstance.__dict__['run_wsgi_app'].func, thread_sensitive=False)
+
+
+class ThreadedWsgiToAsgi(WsgiToAsgi):
+    async def __call__(self, scope, receive, send):
+        await _ThreadedWsgiToAsgiInstance(self.wsgi_application, self.duplicate_header_limit)(scope, receive, send)
+
+
+class AsgiApplication:
+    """Encaminha as leituras assíncronas para ``controllers.async_pet_controller`` e o resto para o Flask."""
+    
+    def __init__(self, app):
+        self.app = app
+        self.wsgi = ThreadedWsgiToAsgi(app)
+        self.routes = []
+        
+        if app.config.get('DATA_ACCESS') == 'async':
+            from async_db import init_async_db
+            from controllers import async_pet_controller
+            
+            init_async_db(app)
+            self.routes = [
+                (re.compile(r'^/api/pets$'), async_pet_controller.get_pets),
+                (re.compile(r'^/api/pets/(?P<pet_id>\d+)$'), async_pet_controller.get_pet),
+            ]
+            logger.info("Async data access enabled for pet reads")
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+        
+        handler, kwargs = self._match(scope)
+        if handler is None:
+            return await self.wsgi(scope, receive, send)
+        
+        environ = _build_environ(scope)
+        with self.app.request_context(environ):
+            response = self.app.preprocess_request()
+            if response is None:
+                response = await handler(**kwargs)
+            response = self.app.process_response(self.app.make_response(response))
+        await _send_response(send, response, environ)
+    
+    def _match(self, scope):
+        if scope['type'] != 'http' or scope['method'] != 'GET':
+            return None, None
+        if 'cursor' in parse_qs(scope['query_string'].decode('latin1'), keep_blank_values=True):
+            return None, None
+        
+        for pattern, handler in self.routes:
+            match = pattern.match(scope['path'])
+            if match:
+                return handler, {name: int(value) for name, value in match.groupdict().items()}
+        return None, None
+    
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                sessionmaker = self.app.extensions.get('async_db')
+                if sessionmaker is not None:
+                    await sessionmaker.kw['bind'].dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+def _build_environ(scope) -> dict:
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf8').decode('latin1'),
+        'PATH_INFO': scope['path'].encode('utf8').decode('latin1'),
+        'QUERY_STRING': scope['query_string'].decode('ascii'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f"HTTP/{scope['http_version']}",
+        'REMOTE_ADDR': (scope.get('client') or ('127.0.0.1', 0))[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': io.StringIO(),
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope['headers']:
+        name = name.decode('latin1').upper().replace('-', '_')
+        if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            name = f'HTTP_{name}'
+        value = value.decode('latin1')
+        environ[name] = f'{environ[name]},{value}' if name in environ else value
+    return environ
+
+
+async def _send_response(send, response: Response, environ: dict):
+    # get_wsgi_response aplica os mesmos ajustes do caminho WSGI (corpo vazio no 304, Location etc.)
+    app_iter, _, headers = response.get_wsgi_response(environ)
+    headers = [(name.lower().encode('latin1'), value.encode('latin1')) for name, value in headers]
+    await send({'type': 'http.response.start', 'status': response.status_code, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': b''.join(app_iter)})
+
+
+def create_asgi_app(app=None) -> AsgiApplication:
+    return AsgiApplication(app or create_app())
+
+
+application = create_asgi_app()
@@ -0,0 +1,29 @@
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from db import db, configure_sqlite
+from metrics import metrics
+
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+}
+
+
+def async_database_url(app) -> URL:
+    """URL do engine assíncrono: ``ASYNC_DATABASE_URL`` ou a mesma base do engine síncrono com o driver async."""
+    configured = app.config.get('ASYNC_DATABASE_URL')
+    if configured:
+        return make_url(configured)
+    
+    with app.app_context():
+        url = db.engine.url
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+
+
+def init_async_db(app) -> async_sessionmaker:
+    engine = create_async_engine(async_database_url(app), **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+    configure_sqlite(engine.sync_engine, app.config.get('SQLITE_BUSY_TIMEOUT', 5000))
+    metrics.instrument_engine(engine.sync_engine)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    app.extensions['async_db'] = sessionmaker
+    return sessionmaker
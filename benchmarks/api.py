@@ -0,0 +1,301 @@
+"""Benchmark da API: latência e vazão de cada operação, com resultado em JSON."""
+import argparse
+import http.client
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from urllib.parse import urlencode, urlsplit
+
+SCENARIOS = ('list', 'search', 'deep_page', 'deep_cursor', 'detail', 'create', 'update', 'delete')
+PAGE_SIZE = 20
+
+
+class TestClient:
+    """Requisições pelo test client do Flask, no mesmo processo."""
+    
+    def __init__(self, app):
+        self.client = app.test_client()
+    
+    def request(self, method: str, path: str, payload=None) -> tuple[int, dict]:
+        response = self.client.open(path, method=method, json=payload)
+        return response.status_code, response.get_json(silent=True)
+    
+    def close(self):
+        pass
+
+
+class HttpClient:
+    """Requisições HTTP/1.1 com keep-alive para um servidor em ``url``."""
+    
+    def __init__(self, url: str):
+        parts = urlsplit(url)
+        connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.connection = connection_class(parts.hostname, parts.port, timeout=60)
+        self.prefix = parts.path.rstrip('/')
+    
+    def request(self, method: str, path: str, payload=None) -> tuple[int, dict]:
+        body = None if payload is None else json.dumps(payload)
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        try:
+            self.connection.request(method, self.prefix + path, body, headers)
+            response = self.connection.getresponse()
+        except (http.client.HTTPException, OSError):
+            self.connection.close()
+            self.connection.request(method, self.prefix + path, body, headers)
+            response = self.connection.getresponse()
+        data = response.read()
+        try:
+            return response.status, json.loads(data)
+        except ValueError:
+            return response.status, None
+    
+    def close(self):
+        self.connection.close()
+
+
+def _pet_payload(rng: random.Random) -> dict:
+    from benchmarks.dataset import CORES, DETALHES, NOMES, RACAS
+    
+    tipo = rng.choice(['Cachorro', 'Gato'])
+    return {
+        'tipo': tipo,
+        'nome': rng.choice(NOMES),
+        'idade': rng.choice(['Filhote', 'Adulto', 'Idoso']),
+        'porte': rng.choice(['Pequeno', 'Medio', 'Grande']),
+        'raca': rng.choice(RACAS[tipo]),
+        'info_contato': 'Contato (11) 99999-9999',
+        'sexo': rng.choice(['Macho', 'Femea']),
+        'descricao': f'{tipo} {rng.choice(CORES)}, {rng.choice(DETALHES)}',
+        'data_desaparecimento': datetime(2024, rng.randint(1, 12), rng.randint(1, 28), 10, 0).isoformat(),
+        'endereco_desaparecimento': {
+            'cep': rng.choice(['01310100', '20040002', '30130010', '40020000', '80010000']),
+            'rua': f'Rua Benchmark, {rng.randint(1, 5000)}',
+            'bairro': 'Centro'
+        }
+    }
+
+
+def _search_path(rng: random.Random) -> str:
+    from benchmarks.dataset import CORES, RACAS
+    
+    filters = rng.choice([
+        {'tipo': rng.choice(['Cachorro', 'Gato'])},
+        {'cidade': rng.choice(['São Paulo', 'Rio de Janeiro', 'Belo Horizonte', 'Curitiba'])},
+        {'tipo': 'Cachorro', 'cidade': 'São Paulo'},
+        {'start_date': '2024-10-01T00:00:00', 'end_date': '2024-12-31T23:59:59'},
+        {'q': f"{rng.choice(RACAS['Cachorro'])} {rng.choice(CORES)}"},
+        {'near': '-23.5505,-46.6333', 'radius_km': 10},
+    ])
+    return '/api/pets?' + urlencode({**filters, 'page_size': PAGE_SIZE})
+
+
+def _sample_ids(client, rng: random.Random, pages: int = 5) -> tuple[list, int]:
+    status, body = client.request('GET', '/api/pets?fields=id&page_size=100')
+    if status != 200:
+        raise RuntimeError(f'Listagem inicial falhou com status {status}')
+    
+    total_count = body['pagination']['total_count'] or 0
+    ids = [pet['id'] for pet in body['data']]
+    for _ in range(pages - 1):
+        page_number = rng.randint(1, max(1, body['pagination']['total_pages'] or 1))
+        status, page = client.request('GET', f'/api/pets?fields=id&page_size=100&page_number={page_number}')
+        if status == 200:
+            ids.extend(pet['id'] for pet in page['data'])
+    return ids, total_count
+
+
+def _timed(client, method: str, path: str, payload=None) -> tuple[float, int, dict]:
+    started = time.perf_counter()
+    status, body = client.request(method, path, payload)
+    return time.perf_counter() - started, status, body
+
+
+def _requests(name: str, rng: random.Random, context: dict):
+    """Gera ``(método, caminho, corpo)`` do cenário; recebe de volta o status e o corpo da resposta."""
+    if name == 'list':
+        while True:
+            yield 'GET', f'/api/pets?page_size={PAGE_SIZE}', None
+    elif name == 'search':
+        while True:
+            yield 'GET', _search_path(rng), None
+    elif name == 'deep_page':
+        total_pages = max(1, context['total_count'] // PAGE_SIZE)
+        while True:
+            page_number = rng.randint(max(1, int(total_pages * 0.8)), total_pages)
+            yield 'GET', f'/api/pets?page_size={PAGE_SIZE}&page_number={page_number}&count=none', None
+    elif name == 'deep_cursor':
+        cursor = ''
+        while True:
+            status, body = yield 'GET', '/api/pets?' + urlencode({'cursor': cursor, 'page_size': PAGE_SIZE}), None
+            # Ao chegar na última página recomeça do início
+            cursor = (body['pagination']['next_cursor'] if status == 200 else None) or ''
+    elif name == 'detail':
+        while True:
+            yield 'GET', f"/api/pets/{rng.choice(context['ids'])}", None
+    elif name == 'create':
+        while True:
+            yield 'POST', '/api/pets', _pet_payload(rng)
+    elif name == 'update':
+        while True:
+            yield 'PUT', f"/api/pets/{rng.choice(context['created'])}", {'descricao': f'Atualizado {rng.random():.6f}'}
+    elif name == 'delete':
+        while True:
+            yield 'DELETE', f"/api/pets/{context['created'].pop()}", None
+
+
+def _run_scenario(name: str, client, rng: random.Random, context: dict, count: int, warmup: int) -> dict:
+    if name in ('update', 'delete') and not context['created']:
+        return {'count': 0, 'skipped': 'nenhum pet cadastrado no cenário create'}
+    if name == 'delete':
+        count = min(count, len(context['created']))
+    
+    requests = _requests(name, rng, context)
+    request = next(requests)
+    if request[0] != 'GET':
+        warmup = 0
+    
+    latencies, errors = [], 0
+    for iteration in range(warmup + count):
+        if iteration == warmup:
+            started = time.perf_counter()
+        elapsed, status, body = _timed(client, *request)
+        if iteration >= warmup:
+            latencies.append(elapsed)
+            errors += status >= 400
+        if name == 'create' and status == 201:
+            context['created'].append(body['data']['id'])
+        if iteration + 1 < warmup + count:
+            request = requests.send((status, body))
+    elapsed_total = time.perf_counter() - started
+    
+    latencies.sort()
+    return {
+        'count': len(latencies),
+        'errors': errors,
+        'p50_ms': _percentile(latencies, 0.50) * 1000,
+        'p95_ms': _percentile(latencies, 0.95) * 1000,
+        'p99_ms': _percentile(latencies, 0.99) * 1000,
+        'mean_ms': sum(latencies) / len(latencies) * 1000,
+        'rps': len(latencies) / elapsed_total,
+    }
+
+
+def _percentile(ordered: list, fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _git_commit() -> dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {'commit': None, 'dirty': None}
+    return {'commit': commit, 'dirty': dirty}
+
+
+def _run(client, args) -> dict:
+    rng = random.Random(args.seed)
+    ids, total_count = _sample_ids(client, rng)
+    if not ids:
+        raise RuntimeError('A base não tem pets; use --size ou popule o servidor com flask pets seed')
+    
+    context = {'ids': ids, 'total_count': total_count, 'created': []}
+    scenarios = {}
+    for name in args.scenarios:
+        scenarios[name] = _run_scenario(name, client, rng, context, args.requests, args.warmup)
+    return {'total_count': total_count, 'scenarios': scenarios}
+
+
+def _print_result(result: dict, baseline: dict = None, threshold: float = 0.10) -> list:
+    regressions = []
+    for name, stats in result['scenarios'].items():
+        if not stats['count']:
+            print(f"{name:<12} ignorado ({stats.get('skipped', 'sem requisições')})")
+            continue
+        
+        line = (
+            f"{name:<12} {stats['rps']:8.1f} req/s  p50 {stats['p50_ms']:7.2f} ms  p95 {stats['p95_ms']:7.2f} ms  "
+            f"p99 {stats['p99_ms']:7.2f} ms  erros {stats['errors']}"
+        )
+        previous = (baseline or {}).get('scenarios', {}).get(name)
+        if previous and previous.get('count'):
+            change = stats['p95_ms'] / previous['p95_ms'] - 1
+            line += f"  p95 {change:+.1%}  req/s {stats['rps'] / previous['rps'] - 1:+.1%}"
+            if change > threshold:
+                regressions.append(name)
+                line += '  REGRESSÃO'
+        print(line)
+    return regressions
+
+
+def main():
+    from benchmarks.dataset import SIZES
+    
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', choices=list(SIZES), default='10k', help='pets gerados na base temporária')
+    parser.add_argument('--url', help='servidor já no ar (ex.: http://localhost:5000); usa a base dele')
+    parser.add_argument('--requests', type=int, default=200, help='requisições medidas por cenário')
+    parser.add_argument('--warmup', type=int, default=10, help='requisições de leitura descartadas por cenário')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS), help='cenários executados, em ordem')
+    parser.add_argument('--seed', type=int, default=42, help='semente dos dados e das requisições')
+    parser.add_argument('--output', help='grava o resultado em JSON neste arquivo')
+    parser.add_argument('--compare', help='resultado JSON anterior para comparação')
+    parser.add_argument('--threshold', type=float, default=0.10, help='piora máxima do p95 aceita com --compare (0.10 = 10%%)')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    
+    started = datetime.now()
+    if args.url:
+        client = HttpClient(args.url)
+        try:
+            result = _run(client, args)
+        finally:
+            client.close()
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(directory, 'api.db')}"
+            os.environ['RESPONSE_CACHE_ENABLED'] = 'false'
+            os.environ['FOTO_STORAGE_PATH'] = os.path.join(directory, 'fotos')
+            
+            from app import create_app
+            from benchmarks.dataset import generate
+            
+            app = create_app()
+            with app.app_context():
+                generate(SIZES[args.size], args.seed)
+            result = _run(TestClient(app), args)
+    
+    result = {
+        **_git_commit(),
+        'timestamp': started.isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'target': args.url or 'test_client',
+        'size': None if args.url else args.size,
+        'requests': args.requests,
+        **result,
+    }
+    
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)
+        print(f"comparando com {baseline.get('commit') or args.compare}")
+    regressions = _print_result(result, baseline, args.threshold)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(result, file, indent=2)
+    if regressions:
+        print(f"p95 piorou mais de {args.threshold:.0%} em: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
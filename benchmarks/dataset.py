@@ -0,0 +1,130 @@
+"""Gerador de dados sintéticos: pets e endereços com distribuições realistas."""
+import random
+from itertools import accumulate
+from datetime import datetime, timedelta
+
+SIZES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+TIPOS = {'Cachorro': 55, 'Gato': 35, 'Ave': 6, 'Outro': 4}
+IDADES = {'Filhote': 25, 'Adulto': 60, 'Idoso': 15}
+PORTES = {'Pequeno': 40, 'Medio': 40, 'Grande': 20}
+RACAS = {
+    'Cachorro': ['SRD', 'SRD', 'SRD', 'Labrador', 'Poodle', 'Pinscher', 'Shih Tzu', 'Golden Retriever', 'Vira-lata caramelo', 'Pastor Alemão'],
+    'Gato': ['SRD', 'SRD', 'SRD', 'Siamês', 'Persa', 'Angorá', 'Maine Coon'],
+    'Ave': ['Calopsita', 'Periquito', 'Papagaio', 'Canário'],
+    'Outro': ['Coelho', 'Hamster', 'Tartaruga', 'Porquinho-da-índia'],
+}
+NOMES = ['Rex', 'Luna', 'Thor', 'Mel', 'Bob', 'Nina', 'Fred', 'Lola', 'Max', 'Amora', 'Pipoca', 'Simba', 'Bidu', 'Mia', 'Toby', 'Belinha']
+CORES = ['caramelo', 'preto', 'branco', 'cinza', 'malhado', 'tigrado', 'marrom', 'rajado', 'tricolor']
+DETALHES = [
+    'coleira azul', 'coleira vermelha', 'sem coleira', 'mancha no olho', 'rabo curto', 'orelha caída',
+    'muito dócil', 'assustado', 'castrado', 'com plaquinha de identificação', 'manca de uma pata'
+]
+RUAS = ['Rua das Flores', 'Avenida Brasil', 'Rua São João', 'Rua XV de Novembro', 'Avenida Central', 'Rua do Comércio', 'Rua Sete de Setembro']
+BAIRROS = ['Centro', 'Jardim América', 'Vila Nova', 'Boa Vista', 'Santa Cruz', 'Industrial', 'Bela Vista']
+
+REFERENCE_DATE = datetime(2025, 1, 1)
+
+
+def generate(count: int, seed: int = 42, batch_size: int = 10000) -> dict:
+    """Grava ``count`` pets (e cerca de ``count / 4`` endereços) e devolve quantos pets e endereços criou."""
+    from db import db
+    from models import Endereco, Pet
+    from cep_index import default_index
+    from normalizer import address_hash, normalize_text
+    from services.search_service import SearchService, FTS_TABLE, create_fts_table, fts_table_exists, populate_fts_table
+    from services.geo_service import GeoService, RTREE_TABLE, create_rtree_table, rtree_table_exists, populate_rtree_table
+    from services.stats_service import StatsService
+    from services.pet_service import PetService
+    
+    rng = random.Random(seed)
+    connection = db.session.connection()
+    
+    ceps = default_index()
+    faixas = [ceps.lookup(str(cep_inicio).zfill(8)) for cep_inicio in ceps.starts]
+    faixas = [faixa for faixa in faixas if faixa.latitude is not None]
+    faixa_weights = [1 / (position + 1) for position in range(len(faixas))]
+    
+    last_endereco_id = connection.execute(db.select(db.func.max(Endereco.id))).scalar() or 0
+    now = datetime.utcnow()
+    
+    endereco_count = max(1, count // 4)
+    hashes = []
+    batch = []
+    for position, faixa in enumerate(rng.choices(faixas, faixa_weights, k=endereco_count)):
+        cep = str(rng.randint(faixa.cep_inicio, faixa.cep_fim)).zfill(8)
+        # O complemento com o próximo ID torna o endereço único, inclusive entre execuções
+        rua = f'{rng.choice(RUAS)}, {rng.randint(1, 3000)} - casa {last_endereco_id + position + 1}'
+        bairro = rng.choice(BAIRROS)
+        endereco_hash = address_hash(cep, rua, bairro, faixa.cidade, faixa.estado, 'Brasil')
+        hashes.append(endereco_hash)
+        batch.append({
+            'cep': cep, 'rua': rua, 'bairro': bairro, 'cidade': faixa.cidade, 'estado': faixa.estado, 'pais': 'Brasil',
+            'cidade_normalizada': normalize_text(faixa.cidade),
+            'latitude': faixa.latitude + rng.uniform(-0.15, 0.15),
+            'longitude': faixa.longitude + rng.uniform(-0.15, 0.15),
+            'endereco_hash': endereco_hash,
+            'created_at': now, 'updated_at': now
+        })
+        if len(batch) == batch_size:
+            connection.execute(Endereco.__table__.insert(), batch)
+            batch = []
+    if batch:
+        connection.execute(Endereco.__table__.insert(), batch)
+    
+    ids_by_hash = dict(connection.execute(
+        db.select(Endereco.endereco_hash, Endereco.id).where(Endereco.id > last_endereco_id)
+    ).all())
+    endereco_ids = [ids_by_hash[endereco_hash] for endereco_hash in hashes]
+    endereco_cum_weights = list(accumulate(rng.paretovariate(1.5) for _ in endereco_ids))
+    
+    tipos, tipo_weights = list(TIPOS), list(TIPOS.values())
+    idades, idade_weights = list(IDADES), list(IDADES.values())
+    portes, porte_weights = list(PORTES), list(PORTES.values())
+    
+    created = 0
+    while created < count:
+        size = min(batch_size, count - created)
+        batch = []
+        for tipo, idade, porte, endereco_id in zip(
+            rng.choices(tipos, tipo_weights, k=size),
+            rng.choices(idades, idade_weights, k=size),
+            rng.choices(portes, porte_weights, k=size),
+            rng.choices(endereco_ids, cum_weights=endereco_cum_weights, k=size)
+        ):
+            nome = rng.choice(NOMES)
+            raca = rng.choice(RACAS[tipo])
+            descricao = f'{tipo} {rng.choice(CORES)}, {rng.choice(DETALHES)}, {rng.choice(DETALHES)}'
+            data_desaparecimento = REFERENCE_DATE - timedelta(minutes=int(rng.expovariate(1 / (90 * 24 * 60))))
+            batch.append({
+                'tipo': tipo, 'nome': nome, 'idade': idade, 'porte': porte, 'raca': raca,
+                'info_contato': f'Contato (11) 9{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}',
+                'sexo': rng.choice(Pet.SEXOS), 'descricao': descricao,
+                'observacoes': rng.choice(DETALHES) if rng.random() < 0.3 else None,
+                'data_desaparecimento': data_desaparecimento,
+                'busca_normalizada': Pet.build_busca_normalizada(nome, raca, descricao),
+                'endereco_id': endereco_id,
+                'created_at': data_desaparecimento + timedelta(hours=rng.randint(1, 72)),
+                'updated_at': now
+            })
+        connection.execute(Pet.__table__.insert(), batch)
+        created += size
+    
+    if SearchService.backend() == 'fts5':
+        if fts_table_exists(connection):
+            connection.exec_driver_sql(f'DELETE FROM {FTS_TABLE}')
+        else:
+            create_fts_table(connection)
+        populate_fts_table(connection, batch_size)
+    
+    if GeoService.backend() == 'rtree':
+        if rtree_table_exists(connection):
+            connection.exec_driver_sql(f'DELETE FROM {RTREE_TABLE}')
+        else:
+            create_rtree_table(connection)
+        populate_rtree_table(connection, batch_size)
+    
+    db.session.commit()
+    StatsService.rebuild()
+    PetService._invalidate_caches()
+    return {'pets': count, 'enderecos': endereco_count}
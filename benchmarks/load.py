@@ -0,0 +1,143 @@
+"""Teste de carga das leituras: ASGI com acesso síncrono x assíncrono."""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+HOST = '127.0.0.1'
+
+
+def _seed(database_url: str, count: int):
+    os.environ['DATABASE_URL'] = database_url
+    os.environ['RESPONSE_CACHE_ENABLED'] = 'false'
+    
+    from app import create_app
+    from services.import_service import ImportService
+    
+    cidades = [('01310100', 'São Paulo', 'SP'), ('20040002', 'Rio de Janeiro', 'RJ'), ('30130010', 'Belo Horizonte', 'MG')]
+    records = []
+    for index in range(count):
+        cep, cidade, estado = cidades[index % len(cidades)]
+        records.append({
+            'tipo': ('Cachorro', 'Gato')[index % 2],
+            'nome': f'Pet {index}',
+            'idade': 'Adulto',
+            'porte': 'Medio',
+            'raca': 'SRD',
+            'info_contato': 'Contato (11) 99999-9999',
+            'sexo': 'Macho',
+            'descricao': 'Pet de porte médio, pelagem caramelo',
+            'data_desaparecimento': datetime(2024, 1, 1 + index % 28).isoformat(),
+            'endereco_desaparecimento': {'cep': cep, 'rua': 'Rua Teste, 100', 'bairro': 'Centro', 'cidade': cidade, 'estado': estado}
+        })
+    
+    app = create_app()
+    with app.app_context():
+        ImportService.import_pets(enumerate(records))
+
+
+async def _request(reader, writer, path: str) -> int:
+    writer.write(f'GET {path} HTTP/1.1\r\nHost: {HOST}\r\n\r\n'.encode('latin1'))
+    await writer.drain()
+    
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def _client(port: int, paths: list, latencies: list, errors: list):
+    reader, writer = await asyncio.open_connection(HOST, port)
+    try:
+        for path in paths:
+            started = time.perf_counter()
+            status = await _request(reader, writer, path)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def _load(port: int, paths: list, concurrency: int) -> dict:
+    latencies, errors = [], []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _client(port, paths[worker::concurrency], latencies, errors)
+        for worker in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+    
+    latencies.sort()
+    return {
+        'rps': len(latencies) / elapsed,
+        'p50': latencies[len(latencies) // 2] * 1000,
+        'p99': latencies[int(len(latencies) * 0.99)] * 1000,
+        'errors': len(errors),
+    }
+
+
+def _serve(data_access: str, database_url: str, port: int) -> subprocess.Popen:
+    env = dict(os.environ, DATA_ACCESS=data_access, DATABASE_URL=database_url, RESPONSE_CACHE_ENABLED='false')
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'asgi:application', '--host', HOST, '--port', str(port), '--log-level', 'warning', '--no-access-log'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            asyncio.run(_load(port, ['/api/pets'], 1))
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f'uvicorn ({data_access}) não respondeu na porta {port}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pets', type=int, default=2000, help='pets inseridos no banco de teste')
+    parser.add_argument('--requests', type=int, default=5000, help='requisições por cenário')
+    parser.add_argument('--concurrency', type=int, default=64, help='conexões simultâneas')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    
+    rng = random.Random(42)
+    listings = ['/api/pets?', '/api/pets?tipo=Gato&', '/api/pets?cidade=Rio%20de%20Janeiro&count=estimate&']
+    paths = [
+        f'/api/pets/{rng.randint(1, args.pets)}' if rng.random() < 0.5
+        else f'{rng.choice(listings)}page_number={rng.randint(1, 5)}'
+        for _ in range(args.requests)
+    ]
+    
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f'sqlite:///{os.path.join(directory, "load.db")}'
+        _seed(database_url, args.pets)
+        
+        for data_access in ('sync', 'async'):
+            process = _serve(data_access, database_url, args.port)
+            try:
+                result = asyncio.run(_load(args.port, paths, args.concurrency))
+            finally:
+                process.terminate()
+                process.wait()
+            print(f"{data_access:<6} {result['rps']:8.1f} req/s  p50 {result['p50']:7.1f} ms  p99 {result['p99']:7.1f} ms  erros {result['errors']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark do matching: candidatos para um pet em uma base sintética grande."""
+import argparse
+import logging
+import os
+import random
+import tempfile
+import time
+
+
+def _percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _unblocked(pet_id: int) -> float:
+    """Pontua todos os pets do mesmo tipo, sem o bloqueio por data e raio."""
+    from db import db
+    from models import Endereco, Pet
+    from services.match_service import MatchService, _distances_km
+    
+    pet = db.session.get(Pet, pet_id)
+    reference = {
+        'tipo': pet.tipo, 'porte': pet.porte, 'sexo': pet.sexo, 'idade': pet.idade, 'raca': pet.raca,
+        'descricao': pet.descricao, 'data_desaparecimento': pet.data_desaparecimento,
+        'latitude': pet.endereco.latitude, 'longitude': pet.endereco.longitude
+    }
+    
+    started = time.perf_counter()
+    rows = db.session.query(
+        Pet.id, Pet.porte, Pet.sexo, Pet.idade, Pet.raca, Pet.descricao, Pet.data_desaparecimento,
+        Endereco.latitude, Endereco.longitude
+    ).join(Endereco, Pet.endereco_id == Endereco.id).filter(Pet.tipo == pet.tipo).all()
+    MatchService._score(reference, rows, _distances_km(reference, rows), 20.0, 30)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pets', type=int, default=1000000, help='pets na base sintética')
+    parser.add_argument('--queries', type=int, default=200, help='pets de referência sorteados')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(directory, 'matching.db')}"
+        os.environ['RESPONSE_CACHE_ENABLED'] = 'false'
+        
+        from app import create_app
+        from services import MatchService
+        from benchmarks.dataset import generate
+        
+        app = create_app()
+        with app.app_context():
+            started = time.perf_counter()
+            generate(args.pets)
+            print(f'base sintética: {args.pets} pets em {time.perf_counter() - started:.1f}s')
+            
+            rng = random.Random(7)
+            latencies = []
+            found = 0
+            for _ in range(args.queries):
+                pet_id = rng.randint(1, args.pets)
+                started = time.perf_counter()
+                matches = MatchService.find_matches_for_pet(pet_id)
+                latencies.append(time.perf_counter() - started)
+                found += len(matches)
+            
+            print(f'{"com bloqueio":<16} p50 {_percentile(latencies, 0.5) * 1000:8.1f} ms  '
+                  f'p99 {_percentile(latencies, 0.99) * 1000:8.1f} ms  ({found / args.queries:.1f} resultados/consulta)')
+            print(f'{"sem bloqueio":<16}     {_unblocked(rng.randint(1, args.pets)) * 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
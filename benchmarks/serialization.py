@@ -0,0 +1,94 @@
+"""Benchmark de serialização: página de 100 pets da listagem."""
+import argparse
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+
+
+def _pets(count: int) -> list:
+    from models import Endereco, Pet
+    
+    created_at = datetime(2024, 1, 1, 12, 0, 0, 123456)
+    pets = []
+    for index in range(count):
+        endereco = Endereco(
+            id=index, cep='01310100', rua='Avenida Paulista, 1000', bairro='Bela Vista',
+            cidade='São Paulo', estado='SP', pais='Brasil', latitude=-23.5614, longitude=-46.6559,
+            created_at=created_at, updated_at=created_at + timedelta(minutes=index)
+        )
+        pets.append(Pet(
+            id=index, tipo='Cachorro', foto='https://example.com/foto.jpg', nome=f'Pet {index}',
+            idade='Adulto', porte='Medio', raca='SRD', info_contato='Contato (11) 99999-9999',
+            sexo='Macho', descricao='Cachorro de porte médio, pelagem caramelo', observacoes=None,
+            data_desaparecimento=datetime(2024, 1, 1 + index % 28), endereco=endereco,
+            created_at=created_at, updated_at=created_at + timedelta(seconds=index)
+        ))
+    return pets
+
+
+def _envelope(pets: list, data) -> dict:
+    return {
+        'message': f'{len(pets)} pets encontrados (página 1 de 1)',
+        'data': data,
+        'pagination': {
+            'page_number': 1, 'page_size': len(pets), 'total_count': len(pets), 'total_pages': 1,
+            'has_next': False, 'has_prev': False, 'next_cursor': None, 'prev_cursor': None
+        }
+    }
+
+
+def _measure(render, repeat: int) -> float:
+    render()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        render()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pets', type=int, default=100, help='pets por página')
+    parser.add_argument('--repeat', type=int, default=200, help='páginas serializadas por cenário')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    os.environ.setdefault('DATABASE_URL', 'sqlite://')
+    
+    from flask_restx import marshal
+    from app import create_app
+    from controllers.pet_controller import models, _marshal_page
+    from json_output import orjson
+    from schemas import pets_schema, compiled_serializer
+    from services.thumbnail_service import LIST_FOTO_SIZE
+    
+    app = create_app()
+    model = models['paginated_response']
+    pets = _pets(args.pets)
+    serializer = compiled_serializer(None, True, LIST_FOTO_SIZE, marshalled=True)
+    
+    def before():
+        return json.dumps(marshal(_envelope(pets, pets_schema.dump(pets)), model)).encode()
+    
+    def after():
+        return json.dumps(_marshal_page(_envelope(pets, serializer.dump(pets)), 200, model)).encode()
+    
+    def after_orjson():
+        return orjson.dumps(_marshal_page(_envelope(pets, serializer.dump(pets)), 200, model))
+    
+    with app.test_request_context('/api/pets'):
+        assert before() == after(), 'saídas diferentes'
+        
+        scenarios = [('antes (dump + marshal)', before), ('depois (compilado)', after)]
+        if orjson is not None:
+            scenarios.append(('depois (compilado + orjson)', after_orjson))
+        
+        baseline = None
+        for name, render in scenarios:
+            elapsed = _measure(render, args.repeat)
+            baseline = baseline or elapsed
+            print(f'{name:<30} {elapsed:8.3f} ms/página  {baseline / elapsed:5.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark de validação do caminho de escrita: marshmallow x ``schemas.validator``."""
+import argparse
+import logging
+import time
+
+
+def _records(count: int) -> list:
+    tipos, idades, portes, sexos = ('Cachorro', 'Gato', 'Ave', 'Outro'), ('Filhote', 'Adulto', 'Idoso'), ('Pequeno', 'Medio', 'Grande'), ('Macho', 'Femea')
+    return [
+        {
+            'tipo': tipos[index % len(tipos)],
+            'foto': 'https://example.com/foto.jpg',
+            'nome': f'Pet {index}',
+            'idade': idades[index % len(idades)],
+            'porte': portes[index % len(portes)],
+            'raca': 'SRD',
+            'info_contato': 'Contato (11) 99999-9999',
+            'sexo': sexos[index % len(sexos)],
+            'descricao': 'Pet de porte médio, pelagem caramelo',
+            'observacoes': None,
+            'data_desaparecimento': f'2024-01-{1 + index % 28:02d}T10:30:00',
+            'endereco_desaparecimento': {
+                'cep': '01310100', 'rua': 'Avenida Paulista, 1000', 'bairro': 'Bela Vista',
+                'cidade': 'São Paulo', 'estado': 'SP'
+            }
+        }
+        for index in range(count)
+    ]
+
+
+def _measure(run, repeat: int) -> float:
+    run()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        run()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=1000, help='registros por lote')
+    parser.add_argument('--repeat', type=int, default=20, help='lotes validados por cenário')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    
+    from schemas import pet_create_schema, pets_create_schema, pet_update_schema, pet_create_validator, pet_update_validator
+    
+    records = _records(args.records)
+    updates = [{'nome': record['nome'], 'porte': record['porte'], 'observacoes': 'Visto perto da praça'} for record in records]
+    
+    scenarios = [
+        ('cadastro', lambda: [pet_create_schema.load(record) for record in records], lambda: [pet_create_validator.load(record) for record in records]),
+        ('lote', lambda: pets_create_schema.load(records), lambda: pet_create_validator.load(records, many=True)),
+        ('atualização', lambda: [pet_update_schema.load(update, partial=True) for update in updates], lambda: [pet_update_validator.load(update) for update in updates]),
+    ]
+    for name, before, after in scenarios:
+        assert before() == after(), f'{name}: dados carregados diferentes'
+        elapsed_before = _measure(before, args.repeat)
+        elapsed_after = _measure(after, args.repeat)
+        print(
+            f'{name:<12} marshmallow {elapsed_before:8.2f} ms  validador {elapsed_after:7.2f} ms  '
+            f'{elapsed_before / elapsed_after:5.1f}x  ({args.records} registros)'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""Benchmark de escrita: cadastros, atualizações e remoções por segundo."""
+import argparse
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime
+
+
+def _pet_data(index: int) -> dict:
+    return {
+        'tipo': 'Cachorro',
+        'nome': f'Pet {index}',
+        'idade': 'Adulto',
+        'porte': 'Medio',
+        'raca': 'SRD',
+        'info_contato': 'Contato (11) 99999-9999',
+        'sexo': 'Macho',
+        'descricao': 'Cachorro de porte médio, pelagem caramelo',
+        'data_desaparecimento': datetime(2024, 1, 1),
+        'endereco_desaparecimento': {
+            'cep': '01310100',
+            'rua': f'Avenida Paulista, {1000 + index}',
+            'bairro': 'Bela Vista',
+            'cidade': 'São Paulo',
+            'estado': 'SP'
+        }
+    }
+
+
+def _update_data(index: int) -> dict:
+    return {
+        'nome': f'Pet {index} (atualizado)',
+        'endereco_desaparecimento': {
+            'cep': '01310100',
+            'rua': f'Avenida Paulista, {5000 + index}',
+            'bairro': 'Bela Vista',
+            'cidade': 'São Paulo',
+            'estado': 'SP'
+        }
+    }
+
+
+def _create_before(pet_data: dict) -> int:
+    from models import Endereco, Pet
+    from services import FotoService, PetService
+    
+    endereco_data = pet_data.pop('endereco_desaparecimento')
+    pet_data['foto'], pet_data['foto_hash'] = FotoService.store_foto(pet_data.get('foto'))
+    endereco = Endereco(**endereco_data)
+    endereco.save()
+    pet = Pet(endereco_id=endereco.id, **pet_data)
+    pet.save()
+    PetService._invalidate_caches(delta=1)
+    return pet.id
+
+
+def _update_before(pet_id: int, pet_data: dict):
+    from db import db
+    from models import Endereco, Pet
+    from services import PetService
+    
+    pet = db.session.get(Pet, pet_id)
+    endereco = db.session.get(Endereco, pet.endereco_id)
+    for key, value in pet_data.pop('endereco_desaparecimento').items():
+        setattr(endereco, key, value)
+    endereco.save()
+    for key, value in pet_data.items():
+        setattr(pet, key, value)
+    pet.save()
+    PetService._invalidate_caches()
+
+
+def _delete_before(pet_id: int):
+    from db import db
+    from models import Endereco, Pet
+    from services import PetService
+    
+    pet = db.session.get(Pet, pet_id)
+    pet.delete()
+    db.session.get(Endereco, pet.endereco_id).delete()
+    PetService._invalidate_caches(delta=-1)
+
+
+def _create_after(pet_data: dict) -> int:
+    from services import PetService
+    
+    return PetService.create_pet_with_endereco(pet_data).id
+
+
+def _update_after(pet_id: int, pet_data: dict):
+    from services import PetService
+    
+    PetService.update_pet_with_endereco(pet_id, pet_data)
+
+
+def _delete_after(pet_id: int):
+    from services import PetService
+    
+    PetService.delete_pet(pet_id)
+
+
+def _timed(operation, items) -> float:
+    started = time.perf_counter()
+    for item in items:
+        operation(*item)
+    return len(items) / (time.perf_counter() - started)
+
+
+def _run(create, update, delete, count: int) -> dict:
+    started = time.perf_counter()
+    pet_ids = [create(_pet_data(index)) for index in range(count)]
+    rates = {'create': count / (time.perf_counter() - started)}
+    rates['update'] = _timed(update, [(pet_id, _update_data(index)) for index, pet_id in enumerate(pet_ids)])
+    rates['delete'] = _timed(delete, [(pet_id,) for pet_id in pet_ids])
+    return rates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=500, help='pets cadastrados, atualizados e removidos por cenário')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    
+    scenarios = [
+        ('antes', 'antes (2 commits por operação)', (_create_before, _update_before, _delete_before)),
+        ('depois', 'depois (unit of work)', (_create_after, _update_after, _delete_after)),
+    ]
+    
+    print(f"{'':<32} {'create':>10} {'update':>10} {'delete':>10}  ops/s")
+    with tempfile.TemporaryDirectory() as directory:
+        for slug, name, operations in scenarios:
+            os.environ['DATABASE_URL'] = f'sqlite:///{os.path.join(directory, slug)}.db'
+            os.environ['RESPONSE_CACHE_ENABLED'] = 'false'
+            
+            from app import create_app
+            app = create_app()
+            with app.app_context():
+                rates = _run(*operations, args.count)
+            print(f"{name:<32} {rates['create']:10.1f} {rates['update']:10.1f} {rates['delete']:10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class CacheBackend:
+    """Interface mínima de um backend de cache (em memória, Redis, memcached...)."""
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        raise NotImplementedError
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        raise NotImplementedError
+    
+    def delete(self, key: Hashable):
+        raise NotImplementedError
+    
+    def clear(self):
+        raise NotImplementedError
+
+
+class TTLCache(CacheBackend):
+    """Cache LRU em memória com expiração por tempo (TTL), seguro entre threads."""
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, default: Any = None, allow_expired: bool = False) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            
+            value, expires_at = entry
+            if not allow_expired and expires_at <= time.monotonic():
+                return default
+            
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
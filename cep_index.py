@@ -0,0 +1,103 @@
+import csv
+import math
+import os
+import threading
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+from typing import Optional
+from normalizer import cep_digits, normalize_text
+
+DEFAULT_CEP_DATASET = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'cep_faixas.csv')
+
+CepFaixa = namedtuple('CepFaixa', ['cep_inicio', 'cep_fim', 'cidade', 'estado', 'latitude', 'longitude'])
+
+
+def normalize_cep(cep: Optional[str]) -> Optional[int]:
+    digits = cep_digits(cep) or ''
+    if len(digits) != 8:
+        return None
+    return int(digits)
+
+
+class CepIndex:
+    """Faixas de CEP em arrays tipados, consultadas por busca binária."""
+    
+    def __init__(self, faixas):
+        faixas = sorted(faixas, key=lambda faixa: faixa.cep_inicio)
+        localidades = {}
+        for faixa in faixas:
+            localidades.setdefault((faixa.cidade, faixa.estado), len(localidades))
+        
+        self.starts = array('i', (faixa.cep_inicio for faixa in faixas))
+        self.ends = array('i', (faixa.cep_fim for faixa in faixas))
+        self.localidade_ids = array('I', (localidades[faixa.cidade, faixa.estado] for faixa in faixas))
+        self.latitudes = array('d', (_nan_if_none(faixa.latitude) for faixa in faixas))
+        self.longitudes = array('d', (_nan_if_none(faixa.longitude) for faixa in faixas))
+        self.localidades = list(localidades)
+        self.cidades_normalizadas = frozenset(normalize_text(cidade) for cidade, _ in self.localidades)
+    
+    @classmethod
+    def load(cls, path: str = DEFAULT_CEP_DATASET) -> 'CepIndex':
+        with open(path, newline='', encoding='utf-8') as dataset:
+            faixas = [
+                CepFaixa(
+                    int(row['cep_inicio']),
+                    int(row['cep_fim']),
+                    row['cidade'],
+                    row['estado'],
+                    float(row['latitude']) if row['latitude'] else None,
+                    float(row['longitude']) if row['longitude'] else None
+                )
+                for row in csv.DictReader(dataset)
+            ]
+        return cls(faixas)
+    
+    def lookup(self, cep: Optional[str]) -> Optional[CepFaixa]:
+        value = normalize_cep(cep)
+        if value is None:
+            return None
+        
+        position = bisect_right(self.starts, value) - 1
+        if position < 0 or value > self.ends[position]:
+            return None
+        
+        cidade, estado = self.localidades[self.localidade_ids[position]]
+        return CepFaixa(
+            self.starts[position], self.ends[position], cidade, estado,
+            _none_if_nan(self.latitudes[position]), _none_if_nan(self.longitudes[position])
+        )
+    
+    def is_cidade(self, cidade_normalizada: Optional[str]) -> bool:
+        """Se o nome (já normalizado) é o de uma cidade da base, isto é, um valor canônico."""
+        return cidade_normalizada in self.cidades_normalizadas
+    
+    def __len__(self):
+        return len(self.starts)
+
+
+def _nan_if_none(value: Optional[float]) -> float:
+    return math.nan if value is None else value
+
+
+def _none_if_nan(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+_default_index: Optional[CepIndex] = None
+_lock = threading.Lock()
+
+
+def default_index() -> CepIndex:
+    global _default_index
+    with _lock:
+        if _default_index is None:
+            _default_index = CepIndex.load(os.environ.get('CEP_DATASET_PATH') or DEFAULT_CEP_DATASET)
+        return _default_index
+
+
+def coordinates_for_cep(cep: Optional[str]) -> tuple[Optional[float], Optional[float]]:
+    faixa = default_index().lookup(cep)
+    if faixa is None:
+        return None, None
+    return faixa.latitude, faixa.longitude
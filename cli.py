@@ -0,0 +1,178 @@
+import re
+import sys
+from datetime import datetime
+import click
+from flask.cli import AppGroup
+from db import db, copy_sqlite_database, replicas
+from models import Pet
+from services import PetService, SearchService, GeoService, FotoService, ThumbnailService, ImportService, StatsService
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+pets_cli = AppGroup('pets', help='Comandos de manutenção dos pets.')
+
+INDEXED_FILTER_COMBINATIONS = [
+    {},
+    {'tipo': 'Cachorro'},
+    {'cidade': 'São Paulo'},
+    {'start_date': datetime(2024, 1, 1), 'end_date': datetime(2024, 12, 31)},
+    {'tipo': 'Gato', 'cidade': 'Rio de Janeiro'},
+    {'tipo': 'Cachorro', 'start_date': datetime(2024, 1, 1), 'end_date': datetime(2024, 12, 31)},
+    {'q': 'labrador caramelo'},
+    {'near': (-23.5505, -46.6333), 'radius_km': 10.0},
+]
+
+_SQLITE_FULL_SCAN_RE = re.compile(r'^SCAN (pets|enderecos)$')
+
+
+def _explain(query) -> list[str]:
+    connection = db.session.connection()
+    compiled = query.statement.compile(dialect=connection.dialect)
+    params = [compiled.params[name] for name in compiled.positiontup or []]
+    params = [value.isoformat(' ') if isinstance(value, datetime) else value for value in params]
+    
+    if connection.dialect.name == 'sqlite':
+        rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {compiled}', tuple(params)).fetchall()
+        return [row[-1] for row in rows]
+    
+    rows = connection.execute(db.text(f'EXPLAIN {query.statement.compile(compile_kwargs={"literal_binds": True})}')).fetchall()
+    return [row[0] for row in rows]
+
+
+def _uses_full_scan(plan: list[str]) -> bool:
+    for line in plan:
+        if _SQLITE_FULL_SCAN_RE.match(line.strip()):
+            return True
+        if re.search(r'Seq Scan on (pets|enderecos)\b', line):
+            return True
+    return False
+
+
+@pets_cli.command('check-indexes')
+def check_indexes():
+    """Executa EXPLAIN nas combinações de filtros mais comuns e falha se alguma fizer full scan."""
+    failures = 0
+    for filters in INDEXED_FILTER_COMBINATIONS:
+        query = PetService._apply_filters(Pet.query, filters)
+        query = query.order_by(Pet.created_at.desc(), Pet.id.desc()).limit(20)
+        plan = _explain(query)
+        
+        description = PetService._describe_filters(filters)
+        if _uses_full_scan(plan):
+            failures += 1
+            click.echo(f'FALHA ({description}):')
+        else:
+            click.echo(f'OK ({description}):')
+        for line in plan:
+            click.echo(f'    {line}')
+    
+    if failures:
+        click.echo(f'{failures} combinação(ões) de filtros sem índice.')
+        sys.exit(1)
+    click.echo('Todas as combinações de filtros usam índice.')
+
+
+@pets_cli.command('import')
+@click.argument('file', type=click.File('r', encoding='utf-8'))
+@click.option('--batch-size', default=500, show_default=True, help='Registros gravados por transação.')
+def import_pets(file, batch_size):
+    """Importa pets de um arquivo JSON Lines (um pet por linha; '-' lê da entrada padrão)."""
+    result = ImportService.import_pets(ImportService.read_jsonl(file), batch_size)
+    
+    for error in result['errors']:
+        click.echo(f"linha {error['index']}: {error['errors']}", err=True)
+    click.echo(f"{result['created']} pets importados, {result['failed']} rejeitados.")
+    if result['failed']:
+        sys.exit(1)
+
+
+@pets_cli.command('seed')
+@click.option('--size', type=click.Choice(['10k', '100k', '1m']), default='10k', show_default=True, help='Quantidade de pets gerados.')
+@click.option('--seed', 'seed', default=42, show_default=True, help='Semente do gerador (mesma semente, mesmos dados).')
+def seed_pets(size, seed):
+    """Preenche a base com pets e endereços sintéticos, para testes de carga e benchmarks."""
+    from benchmarks.dataset import SIZES, generate
+    
+    result = generate(SIZES[size], seed)
+    click.echo(f"{result['pets']} pets e {result['enderecos']} endereços gerados.")
+
+
+@pets_cli.command('sync-replicas')
+def sync_replicas():
+    """Copia o banco primário para as réplicas de leitura em SQLite (DATABASE_REPLICA_URLS), para testes locais."""
+    if not replicas.engines:
+        click.echo('Nenhuma réplica configurada em DATABASE_REPLICA_URLS.')
+        sys.exit(1)
+    
+    db.session.remove()
+    for engine in replicas.engines:
+        engine.dispose()
+        copy_sqlite_database(db.engine.url, engine.url)
+        click.echo(f'{engine.url.database} atualizada.')
+
+
+@pets_cli.command('reindex-search')
+def reindex_search():
+    """Recalcula o texto normalizado e o índice de busca textual de todos os pets."""
+    total = SearchService.rebuild_index()
+    click.echo(f'{total} pets reindexados ({SearchService.backend()}).')
+
+
+@pets_cli.command('geocode')
+@click.option('--batch-size', default=1000, show_default=True, help='Endereços processados por lote.')
+def geocode(batch_size):
+    """Recalcula latitude/longitude dos endereços pelo CEP e refaz o índice espacial."""
+    total = GeoService.rebuild_index(batch_size)
+    PetService._invalidate_caches()
+    click.echo(f'{total} endereços geocodificados ({GeoService.backend()}).')
+
+
+@pets_cli.command('rebuild-stats')
+def rebuild_stats():
+    """Recalcula a tabela de resumo diário (pets perdidos por dia, cidade e tipo)."""
+    total = StatsService.rebuild()
+    PetService._invalidate_caches()
+    click.echo(f'{total} linhas no resumo diário.')
+
+
+@pets_cli.command('migrate-fotos')
+@click.option('--batch-size', default=100, show_default=True, help='Pets processados por transação.')
+def migrate_fotos(batch_size):
+    """Move as fotos em base64 guardadas na tabela pets para o storage de fotos."""
+    migrated = 0
+    last_id = 0
+    while True:
+        pets = Pet.query.filter(Pet.id > last_id, Pet.foto.isnot(None)).order_by(Pet.id).limit(batch_size).all()
+        if not pets:
+            break
+        
+        for pet in pets:
+            try:
+                foto, foto_hash = FotoService.store_foto(pet.foto)
+            except ValueError as e:
+                logger.warning("Skipping foto of pet %s: %s", pet.id, e)
+                continue
+            if foto_hash:
+                pet.foto, pet.foto_hash = foto, foto_hash
+                ThumbnailService.enqueue(foto_hash)
+                migrated += 1
+        
+        db.session.commit()
+        last_id = pets[-1].id
+    
+    if migrated:
+        PetService._invalidate_caches()
+    click.echo(f'{migrated} fotos migradas para o storage.')
+
+
+@pets_cli.command('generate-thumbnails')
+def generate_thumbnails():
+    """Gera as miniaturas que ainda não existem para as fotos dos pets."""
+    storage = FotoService.storage()
+    foto_hashes = [row.foto_hash for row in db.session.query(Pet.foto_hash).filter(Pet.foto_hash.isnot(None)).distinct()]
+    
+    generated = 0
+    for foto_hash in foto_hashes:
+        generated += ThumbnailService.generate(storage, foto_hash)
+    click.echo(f'{generated} miniaturas geradas para {len(foto_hashes)} fotos.')
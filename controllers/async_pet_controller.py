@@ -0,0 +1,99 @@
+from flask import current_app, request
+from flask_restx import marshal
+from services.async_pet_service import AsyncPetService
+from schemas.projection import parse_projection
+from response_cache import response_cache
+from db import replicas
+from logger import get_logger
+from .pet_controller import (
+    api, models, _dump_pets, _marshal_page, _page_number, _page_payload, _page_size, _parse_filters, _request_mask
+)
+
+logger = get_logger(__name__)
+
+
+async def get_pets():
+    """``GET /api/pets`` sobre a sessão assíncrona, com a mesma resposta do ``PetListResource.get``."""
+    return await _respond(_search_pets, models['paginated_response'], projected=True)
+
+
+async def get_pet(pet_id: int):
+    return await _respond(lambda: _find_pet(pet_id), models['success_response'])
+
+
+async def _respond(produce, model, projected: bool = False):
+    key = response_cache.make_key() if response_cache.enabled else None
+    # Como no ``response_cache.cached``: quem acabou de escrever não recebe a resposta em cache
+    if key is not None and not replicas.is_sticky():
+        entry = response_cache.backend.get(key)
+        if entry is not None:
+            return response_cache.conditional_response(entry)
+    
+    data, code = await produce()
+    if projected:
+        data = _marshal_page(data, code, model)
+    else:
+        data = marshal(data, model, mask=_request_mask(model))
+    response = api.make_response(data, code)
+    if key is None or code != 200:
+        return response
+    return response_cache.conditional_response(response_cache.store(key, data, response))
+
+
+async def _search_pets():
+    try:
+        filters = _parse_filters(request.args)
+        projection = parse_projection(request.args.get('fields'), request.args.get('include'))
+        page_size = _page_size(request.args)
+        page_number = _page_number(request.args)
+        count_mode = request.args.get('count', 'exact')
+        
+        async with current_app.extensions['async_db']() as session:
+            pets, total_count, lower_bound = await AsyncPetService.search_pets_with_filters(
+                session, filters, page_number, page_size, count_mode, projection
+            )
+            result = _dump_pets(pets, projection, many=True)
+        
+        return _page_payload(pets, result, total_count, lower_bound, page_number, page_size, count_mode, filters), 200
+    
+    except ValueError as e:
+        logger.warning("Value error getting pets: %s", e)
+        return {
+            'message': 'Parâmetros de consulta inválidos'
+        }, 400
+    
+    except Exception as e:
+        logger.error("Unexpected error getting pets: %s", e)
+        return {
+            'message': 'Erro interno do servidor'
+        }, 500
+
+
+async def _find_pet(pet_id: int):
+    try:
+        projection = parse_projection(request.args.get('fields'), request.args.get('include'))
+        
+        async with current_app.extensions['async_db']() as session:
+            pet = await AsyncPetService.get_pet_by_id(session, pet_id, projection)
+            if not pet:
+                return {
+                    'message': 'Pet não encontrado'
+                }, 404
+            result = _dump_pets(pet, projection, many=False)
+        
+        return {
+            'message': 'Pet encontrado',
+            'data': result
+        }, 200
+    
+    except ValueError as e:
+        logger.warning("Value error getting pet %s: %s", pet_id, e)
+        return {
+            'message': 'Parâmetros de consulta inválidos'
+        }, 400
+    
+    except Exception as e:
+        logger.error("Unexpected error getting pet %s: %s", pet_id, e)
+        return {
+            'message': 'Erro interno do servidor'
+        }, 500
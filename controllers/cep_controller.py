@@ -0,0 +1,58 @@
+from flask_restx import Resource, Namespace, fields
+from services import EnderecoService
+from cep_index import normalize_cep
+from logger import SAMPLED, get_logger
+
+logger = get_logger(__name__)
+
+CEP_MAX_AGE = 60 * 60 * 24
+
+cep_ns = Namespace('CEP', description='Consulta de CEP na base local de faixas (sem chamadas externas)', path='/cep')
+
+cep_model = cep_ns.model('Cep', {
+    'cep': fields.String(description='CEP (só dígitos)', example='01310100'),
+    'cidade': fields.String(description='Cidade', example='São Paulo'),
+    'estado': fields.String(description='Estado', example='SP'),
+    'latitude': fields.Float(description='Latitude aproximada (centro do município)', example=-23.5505),
+    'longitude': fields.Float(description='Longitude aproximada (centro do município)', example=-46.6333)
+})
+
+cep_response_model = cep_ns.model('CepResponse', {
+    'message': fields.String(description='Mensagem de sucesso'),
+    'data': fields.Nested(cep_model, description='Dados do CEP')
+})
+
+
+@cep_ns.route('/<string:cep>')
+class CepResource(Resource):
+    @cep_ns.doc('get_cep', description=(
+        'Cidade, estado e coordenadas do CEP, usados para preencher o endereço '
+        'no cadastro de pets. Aceita o CEP com ou sem hífen.'
+    ))
+    @cep_ns.response(200, 'Success', cep_response_model)
+    @cep_ns.response(400, 'CEP inválido')
+    @cep_ns.response(404, 'CEP não encontrado')
+    def get(self, cep):
+        if normalize_cep(cep) is None:
+            return {
+                'message': 'CEP deve ter 8 dígitos (com ou sem hífen)'
+            }, 400
+        
+        try:
+            resolved = EnderecoService.resolve_cep(cep)
+        except Exception as e:
+            logger.error("Unexpected error resolving CEP %s: %s", cep, e)
+            return {
+                'message': 'Erro interno do servidor'
+            }, 500
+        
+        if resolved is None:
+            logger.info("CEP not found: %s", cep, extra=SAMPLED)
+            return {
+                'message': 'CEP não encontrado'
+            }, 404
+        
+        return {
+            'message': 'CEP encontrado',
+            'data': resolved
+        }, 200, {'Cache-Control': f'public, max-age={CEP_MAX_AGE}'}
@@ -0,0 +1,65 @@
+from flask import request, send_file
+from flask_restx import Resource, Namespace
+from services import FotoService, ThumbnailService
+from services.thumbnail_service import THUMBNAIL_SIZES
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+FOTO_MAX_AGE = 60 * 60 * 24 * 365
+PENDING_THUMBNAIL_MAX_AGE = 60
+
+fotos_ns = Namespace('Fotos', description='Fotos dos pets armazenadas por hash de conteúdo', path='/fotos')
+
+
+@fotos_ns.route('/<string:foto_hash>')
+class FotoResource(Resource):
+    @fotos_ns.doc('get_foto')
+    @fotos_ns.param('size', 'Miniatura (220 ou 640); sem o parâmetro retorna a foto original', type='integer', enum=list(THUMBNAIL_SIZES))
+    @fotos_ns.response(200, 'Conteúdo binário da foto')
+    @fotos_ns.response(400, 'Tamanho inválido')
+    @fotos_ns.response(404, 'Foto não encontrada')
+    def get(self, foto_hash):
+        try:
+            size = request.args.get('size', type=int)
+            if 'size' in request.args and size not in THUMBNAIL_SIZES:
+                return {
+                    'message': 'Tamanho de foto inválido'
+                }, 400
+            
+            storage = FotoService.storage()
+            if not FotoService.is_valid_hash(foto_hash) or not storage.exists(foto_hash):
+                return {
+                    'message': 'Foto não encontrada'
+                }, 404
+            
+            key = foto_hash
+            max_age = FOTO_MAX_AGE
+            if size:
+                derivative_key = ThumbnailService.derivative_key(foto_hash, size)
+                if storage.exists(derivative_key):
+                    key = derivative_key
+                else:
+                    max_age = PENDING_THUMBNAIL_MAX_AGE
+            
+            foto_file = storage.open(key)
+            mimetype = FotoService.guess_mimetype(foto_file.read(16))
+            foto_file.seek(0)
+            
+            response = send_file(
+                foto_file,
+                mimetype=mimetype,
+                etag=key,
+                max_age=max_age,
+                conditional=True
+            )
+            response.cache_control.public = True
+            if max_age == FOTO_MAX_AGE:
+                response.cache_control.immutable = True
+            return response
+        
+        except Exception as e:
+            logger.error("Unexpected error getting foto %s: %s", foto_hash, e)
+            return {
+                'message': 'Erro interno do servidor'
+            }, 500
@@ -1,11 +1,24 @@
-from flask import Blueprint, request
-from flask_restx import Api, Resource, Namespace
+from functools import wraps
+from flask import Blueprint, Response, current_app, request, stream_with_context
+from flask_restx import Api, Resource, Namespace, marshal
+from flask_restx.utils import unpack
 from marshmallow import ValidationError
 from datetime import datetime
-from services import PetService
-from schemas import pet_schema, pets_schema, pet_create_schema, pet_update_schema
+from services import PetService, FacetService, MatchService, ImportService, ExportService, encode_cursor
+from services.export_service import EXPORT_FORMATS
+from services.geo_service import DEFAULT_RADIUS_KM, MAX_RADIUS_KM
+from services.match_service import DEFAULT_MATCH_LIMIT, MAX_MATCH_LIMIT, DEFAULT_MATCH_RADIUS_KM, DEFAULT_MATCH_WINDOW_DAYS
+from services.thumbnail_service import LIST_FOTO_SIZE, DETAIL_FOTO_SIZE
+from schemas import pet_schema, pet_create_validator, pet_update_validator, compiled_serializer
+from schemas.projection import PET_FIELDS, ENDERECO_FIELDS, parse_projection, projection_mask
 from swagger_models import create_swagger_models
+from response_cache import response_cache
+from json_output import output_json
+from metrics import metrics
 from logger import get_logger
+from .foto_controller import fotos_ns
+from .stats_controller import estatisticas_ns
+from .cep_controller import cep_ns
 
 logger = get_logger(__name__)
 
@@ -18,80 +31,257 @@ api = Api(
     description='API para gerenciar pets perdidos',
     doc='/docs/'
 )
+api.representations['application/json'] = output_json
 
 pets_ns = Namespace('Pets', description='Operações relacionadas a pets perdidos', path='/pets')
 api.add_namespace(pets_ns)
+api.add_namespace(fotos_ns)
+api.add_namespace(estatisticas_ns)
+api.add_namespace(cep_ns)
 
 models = create_swagger_models(api)
 
 
+def marshal_with_projection(model):
+    """Como ``marshal_with``, mas limita ``data`` aos campos pedidos em ``?fields=``/``?include=``."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            data, code, headers = unpack(func(*args, **kwargs))
+            return _marshal_page(data, code, model), code, headers
+        
+        return pets_ns.response(200, 'Success', model)(wrapper)
+    
+    return decorator
+
+
+def _marshal_page(data, code: int, model):
+    """Aplica o modelo só ao envelope da listagem, cujos itens já estão no formato do modelo."""
+    if code != 200 or request.headers.get(current_app.config['RESTX_MASK_HEADER']):
+        return marshal(data, model, mask=_request_mask(model, projected=True))
+    
+    envelope = marshal({**data, 'data': []}, model)
+    envelope['data'] = data['data']
+    return envelope
+
+
+def _request_mask(model, projected: bool = False):
+    mask = request.headers.get(current_app.config['RESTX_MASK_HEADER'])
+    if not projected:
+        return mask
+    
+    try:
+        projection = parse_projection(request.args.get('fields'), request.args.get('include'))
+    except ValueError:
+        projection = None
+    if projection is not None:
+        envelope = [name if name != 'data' else 'data' + projection_mask(projection) for name in model]
+        mask = '{' + ','.join(envelope) + '}'
+    return mask
+
+
+def _dump_pets(pets, projection, many: bool):
+    """Serializa os pets da listagem (já no formato do modelo ``Pet``) ou do detalhe (formato do ``PetSchema``)."""
+    foto_size = LIST_FOTO_SIZE if many else DETAIL_FOTO_SIZE
+    serializer = compiled_serializer(projection, many, foto_size, marshalled=many)
+    
+    with metrics.serialization():
+        return serializer.dump(pets)
+
+
+def _parse_filters(args) -> dict:
+    q = args.get('q')
+    nome = args.get('nome')
+    tipo = args.get('tipo')
+    cidade = args.get('cidade')
+    start_date = args.get('start_date')
+    end_date = args.get('end_date')
+    near = args.get('near')
+    sort = args.get('sort')
+    
+    filters = {}
+    if q:
+        filters['q'] = q
+    if nome:
+        filters['nome'] = nome
+    if tipo:
+        filters['tipo'] = tipo
+    if cidade:
+        filters['cidade'] = cidade
+    if start_date and end_date:
+        filters['start_date'] = datetime.fromisoformat(start_date)
+        filters['end_date'] = datetime.fromisoformat(end_date)
+    if near:
+        filters['near'] = _parse_near(near)
+        filters['radius_km'] = float(args.get('radius_km', DEFAULT_RADIUS_KM))
+        if not 0 < filters['radius_km'] <= MAX_RADIUS_KM:
+            raise ValueError(f"Raio inválido: {filters['radius_km']}")
+    if sort:
+        if sort != 'distance' or 'near' not in filters:
+            raise ValueError(f"Ordenação inválida: {sort}")
+        filters['sort'] = sort
+    
+    return filters
+
+
+def _page_size(args) -> int:
+    page_size = int(args.get('page_size', 20))
+    if page_size < 1 or page_size > 100:
+        page_size = 20
+    return page_size
+
+
+def _page_number(args) -> int:
+    page_number = int(args.get('page_number', 1))
+    if page_number < 1:
+        page_number = 1
+    return page_number
+
+
+def _page_payload(pets, result, total_count, lower_bound: bool, page_number: int, page_size: int, count_mode: str, filters: dict) -> dict:
+    total_pages = None
+    if total_count is None:
+        message = f'{len(pets)} pets encontrados (página {page_number})'
+    elif lower_bound:
+        message = f'{len(pets)} pets encontrados (página {page_number}, mais de {total_count} no total)'
+    else:
+        total_pages = (total_count + page_size - 1) // page_size
+        if count_mode == 'exact':
+            message = f'{len(pets)} pets encontrados (página {page_number} de {total_pages})'
+        else:
+            message = f'{len(pets)} pets encontrados (página {page_number} de aproximadamente {total_pages})'
+    
+    if count_mode == 'exact':
+        has_next = page_number < total_pages
+    else:
+        has_next = len(pets) == page_size
+    has_prev = page_number > 1
+    # Ordenadas por relevância ou distância, as páginas não seguem (created_at, id)
+    cursor_ordered = 'q' not in filters and filters.get('sort') != 'distance'
+    
+    return {
+        'message': message,
+        'data': result,
+        'pagination': {
+            'page_number': page_number,
+            'page_size': page_size,
+            'total_count': total_count,
+            'total_pages': total_pages,
+            'count_exact': count_mode == 'exact',
+            'total_count_is_lower_bound': lower_bound,
+            'has_next': has_next,
+            'has_prev': has_prev,
+            'next_cursor': encode_cursor(pets[-1], 'next') if has_next and pets and cursor_ordered else None,
+            'prev_cursor': encode_cursor(pets[0], 'prev') if has_prev and pets and cursor_ordered else None
+        }
+    }
+
+
+def _parse_near(value: str) -> tuple[float, float]:
+    try:
+        latitude, longitude = (float(part) for part in value.split(','))
+    except ValueError as e:
+        raise ValueError(f"Coordenadas inválidas: {value}") from e
+    
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError(f"Coordenadas inválidas: {value}")
+    return latitude, longitude
+
+
+def _parse_match_params(args) -> dict:
+    limit = int(args.get('limit', DEFAULT_MATCH_LIMIT))
+    radius_km = float(args.get('radius_km', DEFAULT_MATCH_RADIUS_KM))
+    window_days = int(args.get('window_days', DEFAULT_MATCH_WINDOW_DAYS))
+    
+    if not 1 <= limit <= MAX_MATCH_LIMIT:
+        raise ValueError(f"Limite inválido: {limit}")
+    if not 0 < radius_km <= MAX_RADIUS_KM:
+        raise ValueError(f"Raio inválido: {radius_km}")
+    if window_days < 1:
+        raise ValueError(f"Janela inválida: {window_days}")
+    return {'limit': limit, 'radius_km': radius_km, 'window_days': window_days}
+
+
+def _export_columns(projection) -> list:
+    pet_fields = PET_FIELDS if projection is None else projection.pet_fields
+    endereco_fields = ENDERECO_FIELDS if projection is None else projection.endereco_fields
+    
+    columns = []
+    for field in pet_fields:
+        if field == 'endereco':
+            columns.extend(f'endereco.{name}' for name in endereco_fields)
+        elif field != 'endereco_id':
+            columns.append(field)
+    return columns
+
+
 @pets_ns.route('')
 class PetListResource(Resource):
+    @response_cache.cached
     @pets_ns.doc('get_all_pets')
-    @pets_ns.marshal_with(models['paginated_response'])
+    @marshal_with_projection(models['paginated_response'])
+    @pets_ns.param('q', 'Busca textual em nome, raça e descrição (sem acentos, ordenada por relevância)')
     @pets_ns.param('nome', 'Filtrar por nome do pet')
     @pets_ns.param('tipo', 'Filtrar por tipo do pet')
     @pets_ns.param('cidade', 'Filtrar por cidade onde desapareceu')
     @pets_ns.param('start_date', 'Data inicial para filtro (ISO format)')
     @pets_ns.param('end_date', 'Data final para filtro (ISO format)')
+    @pets_ns.param('near', 'Ponto de referência "latitude,longitude" (ex.: -23.55,-46.63)')
+    @pets_ns.param('radius_km', f'Raio em km ao redor de near (padrão: {DEFAULT_RADIUS_KM:g}, máximo: {MAX_RADIUS_KM:g})', type='number')
+    @pets_ns.param('sort', 'distance ordena pela distância até near (não disponível com cursor)', enum=['distance'])
     @pets_ns.param('page_number', 'Número da página (padrão: 1)', type='integer')
     @pets_ns.param('page_size', 'Tamanho da página (padrão: 20, máximo: 100)', type='integer')
+    @pets_ns.param('count', 'Contagem total: exact (padrão), estimate ou none', enum=['exact', 'estimate', 'none'])
+    @pets_ns.param('cursor', 'Cursor opaco de paginação (next_cursor/prev_cursor); vazio inicia a paginação por cursor (não disponível com q)')
+    @pets_ns.param('fields', 'Campos retornados, separados por vírgula (ex.: id,nome,tipo,cidade,data_desaparecimento)')
+    @pets_ns.param('include', 'Relacionamentos incluídos por completo (endereco)')
     def get(self):
         try:
-            nome = request.args.get('nome')
-            tipo = request.args.get('tipo')
-            cidade = request.args.get('cidade')
-            start_date = request.args.get('start_date')
-            end_date = request.args.get('end_date')
-            
-            page_number = int(request.args.get('page_number', 1))
-            page_size = int(request.args.get('page_size', 20))
-            
-            if page_number < 1:
-                page_number = 1
-            if page_size < 1 or page_size > 100:
-                page_size = 20
-            
-            filters = {}
-            if nome:
-                filters['nome'] = nome
-            if tipo:
-                filters['tipo'] = tipo
-            if cidade:
-                filters['cidade'] = cidade
-            if start_date and end_date:
-                filters['start_date'] = datetime.fromisoformat(start_date)
-                filters['end_date'] = datetime.fromisoformat(end_date)
-            
-            pets, total_count = PetService.search_pets_with_filters(filters, page_number, page_size)
-            
-            result = pets_schema.dump(pets)
-            
-            total_pages = (total_count + page_size - 1) // page_size
-            has_next = page_number < total_pages
-            has_prev = page_number > 1
-            
-            return {
-                'message': f'{len(pets)} pets encontrados (página {page_number} de {total_pages})',
-                'data': result,
-                'pagination': {
-                    'page_number': page_number,
-                    'page_size': page_size,
-                    'total_count': total_count,
-                    'total_pages': total_pages,
-                    'has_next': has_next,
-                    'has_prev': has_prev
-                }
-            }, 200
+            filters = _parse_filters(request.args)
+            projection = parse_projection(request.args.get('fields'), request.args.get('include'))
+            
+            page_size = _page_size(request.args)
+            
+            if 'cursor' in request.args:
+                cursor = request.args.get('cursor') or None
+                pets, next_cursor, prev_cursor = PetService.search_pets_by_cursor(filters, page_size, cursor, projection)
+                
+                result = _dump_pets(pets, projection, many=True)
+                
+                return {
+                    'message': f'{len(pets)} pets encontrados',
+                    'data': result,
+                    'pagination': {
+                        'page_number': None,
+                        'page_size': page_size,
+                        'total_count': None,
+                        'total_pages': None,
+                        'count_exact': False,
+                        'total_count_is_lower_bound': False,
+                        'has_next': next_cursor is not None,
+                        'has_prev': prev_cursor is not None,
+                        'next_cursor': next_cursor,
+                        'prev_cursor': prev_cursor
+                    }
+                }, 200
+            
+            page_number = _page_number(request.args)
+            count_mode = request.args.get('count', 'exact')
+            
+            pets, total_count, lower_bound = PetService.search_pets_with_filters(filters, page_number, page_size, count_mode, projection)
+            
+            result = _dump_pets(pets, projection, many=True)
+            
+            return _page_payload(pets, result, total_count, lower_bound, page_number, page_size, count_mode, filters), 200
             
         except ValueError as e:
-            logger.warning(f"Value error getting pets: {str(e)}")
+            logger.warning("Value error getting pets: %s", e)
             return {
                 'message': 'Parâmetros de consulta inválidos'
             }, 400
             
         except Exception as e:
-            logger.error(f"Unexpected error getting pets: {str(e)}")
+            logger.error("Unexpected error getting pets: %s", e)
             return {
                 'message': 'Erro interno do servidor'
             }, 500
@@ -103,12 +293,12 @@ class PetListResource(Resource):
     @pets_ns.response(500, 'Erro interno do servidor', models['error_response'])
     def post(self):
         try:
-            data = pet_create_schema.load(request.json)
+            data = pet_create_validator.load(request.json)
             
             pet = PetService.create_pet_with_endereco(data)
             
             result = pet_schema.dump(pet)
-            logger.info(f"Pet created successfully with ID: {pet.id}")
+            logger.info("Pet created successfully with ID: %s", pet.id)
             
             return {
                 'message': 'Pet criado com sucesso',
@@ -116,49 +306,200 @@ class PetListResource(Resource):
             }, 201
             
         except ValidationError as e:
-            logger.warning(f"Validation error creating pet: {e.messages}")
+            logger.warning("Validation error creating pet: %s", e.messages)
             return {
                 'message': 'Dados inválidos',
                 'errors': e.messages
             }, 400
             
         except ValueError as e:
-            logger.warning(f"Value error creating pet: {str(e)}")
+            logger.warning("Value error creating pet: %s", e)
             return {
                 'message': str(e)
             }, 400
             
         except Exception as e:
-            logger.error(f"Unexpected error creating pet: {str(e)}")
+            logger.error("Unexpected error creating pet: %s", e)
             return {
                 'message': 'Erro interno do servidor'
             }, 500
 
 
+@pets_ns.route('/bulk')
+class PetBulkResource(Resource):
+    @pets_ns.doc('bulk_create_pets', description=(
+        'Importa vários pets de uma vez. Aceita um array JSON (application/json) '
+        'ou um pet por linha (application/x-ndjson, lido sob demanda). Registros '
+        'inválidos são reportados em errors sem interromper a importação.'
+    ))
+    @pets_ns.expect([models['pet_create']])
+    @pets_ns.response(201, 'Pets importados', models['bulk_response'])
+    @pets_ns.response(400, 'Nenhum pet importado', models['error_response'])
+    @pets_ns.response(500, 'Erro interno do servidor', models['error_response'])
+    def post(self):
+        try:
+            if request.mimetype == 'application/x-ndjson':
+                records = ImportService.read_jsonl(request.stream)
+            else:
+                payload = request.get_json(silent=True)
+                if not isinstance(payload, list):
+                    return {
+                        'message': 'Envie um array JSON de pets ou NDJSON (application/x-ndjson)'
+                    }, 400
+                records = enumerate(payload)
+            
+            result = ImportService.import_pets(records)
+            
+            if not result['created']:
+                return {
+                    'message': 'Nenhum pet importado',
+                    'errors': result['errors']
+                }, 400
+            
+            logger.info("Bulk import created %s pets (%s failed)", result['created'], result['failed'])
+            return {
+                'message': f"{result['created']} pets importados, {result['failed']} rejeitados",
+                'data': result
+            }, 201
+            
+        except Exception as e:
+            logger.error("Unexpected error importing pets: %s", e)
+            return {
+                'message': 'Erro interno do servidor'
+            }, 500
+
+
+@pets_ns.route('/facets')
+class PetFacetsResource(Resource):
+    @response_cache.cached
+    @pets_ns.doc('get_pet_facets', description=(
+        'Contagens por tipo, porte, idade, sexo, cidade, estado e semana do '
+        'desaparecimento dos pets que atendem aos filtros, calculadas em uma única consulta.'
+    ))
+    @pets_ns.marshal_with(models['facets_response'])
+    @pets_ns.param('q', 'Busca textual em nome, raça e descrição')
+    @pets_ns.param('nome', 'Filtrar por nome do pet')
+    @pets_ns.param('tipo', 'Filtrar por tipo do pet')
+    @pets_ns.param('cidade', 'Filtrar por cidade onde desapareceu')
+    @pets_ns.param('start_date', 'Data inicial para filtro (ISO format)')
+    @pets_ns.param('end_date', 'Data final para filtro (ISO format)')
+    @pets_ns.param('near', 'Ponto de referência "latitude,longitude"')
+    @pets_ns.param('radius_km', 'Raio em km ao redor de near', type='number')
+    @pets_ns.response(400, 'Parâmetros de consulta inválidos', models['error_response'])
+    @pets_ns.response(500, 'Erro interno do servidor', models['error_response'])
+    def get(self):
+        try:
+            filters = _parse_filters(request.args)
+            facets = FacetService.get_facets(filters)
+            
+            return {
+                'message': f"Facetas de {facets['total_count']} pets",
+                'data': facets
+            }, 200
+            
+        except ValueError as e:
+            logger.warning("Value error getting facets: %s", e)
+            return {
+                'message': 'Parâmetros de consulta inválidos'
+            }, 400
+            
+        except Exception as e:
+            logger.error("Unexpected error getting facets: %s", e)
+            return {
+                'message': 'Erro interno do servidor'
+            }, 500
+
+
+@pets_ns.route('/export')
+class PetExportResource(Resource):
+    @pets_ns.doc('export_pets', description=(
+        'Exporta todos os pets que atendem aos filtros em NDJSON (um pet por linha) '
+        'ou CSV, em streaming. Com Accept-Encoding: gzip a resposta é comprimida.'
+    ))
+    @pets_ns.produces(['application/x-ndjson', 'text/csv'])
+    @pets_ns.param('format', 'Formato da exportação (padrão: ndjson)', enum=list(EXPORT_FORMATS))
+    @pets_ns.param('q', 'Busca textual em nome, raça e descrição')
+    @pets_ns.param('nome', 'Filtrar por nome do pet')
+    @pets_ns.param('tipo', 'Filtrar por tipo do pet')
+    @pets_ns.param('cidade', 'Filtrar por cidade onde desapareceu')
+    @pets_ns.param('start_date', 'Data inicial para filtro (ISO format)')
+    @pets_ns.param('end_date', 'Data final para filtro (ISO format)')
+    @pets_ns.param('near', 'Ponto de referência "latitude,longitude"')
+    @pets_ns.param('radius_km', 'Raio em km ao redor de near', type='number')
+    @pets_ns.param('fields', 'Campos exportados, separados por vírgula')
+    @pets_ns.param('include', 'Relacionamentos incluídos por completo (endereco)')
+    @pets_ns.response(200, 'Arquivo NDJSON ou CSV')
+    @pets_ns.response(400, 'Parâmetros de consulta inválidos', models['error_response'])
+    def get(self):
+        try:
+            export_format = request.args.get('format', 'ndjson')
+            if export_format not in EXPORT_FORMATS:
+                raise ValueError(f"Formato inválido: {export_format}")
+            
+            filters = _parse_filters(request.args)
+            projection = parse_projection(request.args.get('fields'), request.args.get('include'))
+        except ValueError as e:
+            logger.warning("Value error exporting pets: %s", e)
+            return {
+                'message': 'Parâmetros de consulta inválidos'
+            }, 400
+        
+        schema = compiled_serializer(projection, True)
+        batches = ExportService.iter_pets(filters, projection)
+        
+        if export_format == 'csv':
+            body = ExportService.csv(batches, schema, _export_columns(projection))
+            mimetype = 'text/csv'
+        else:
+            body = ExportService.ndjson(batches, schema)
+            mimetype = 'application/x-ndjson'
+        
+        headers = {
+            'Content-Disposition': f'attachment; filename=pets.{export_format}',
+            'Vary': 'Accept-Encoding'
+        }
+        if request.accept_encodings['gzip']:
+            body = ExportService.gzip(body)
+            headers['Content-Encoding'] = 'gzip'
+        
+        return Response(stream_with_context(body), mimetype=mimetype, headers=headers)
+
+
 @pets_ns.route('/<int:pet_id>')
 class PetResource(Resource):
+    @response_cache.cached
     @pets_ns.doc('get_pet_by_id')
     @pets_ns.marshal_with(models['success_response'])
+    @pets_ns.param('fields', 'Campos retornados, separados por vírgula (ex.: id,nome,tipo,cidade)')
+    @pets_ns.param('include', 'Relacionamentos incluídos por completo (endereco)')
+    @pets_ns.response(400, 'Parâmetros de consulta inválidos', models['error_response'])
     @pets_ns.response(404, 'Pet não encontrado', models['error_response'])
     @pets_ns.response(500, 'Erro interno do servidor', models['error_response'])
     def get(self, pet_id):
         try:
-            pet = PetService.get_pet_by_id(pet_id)
+            projection = parse_projection(request.args.get('fields'), request.args.get('include'))
+            pet = PetService.get_pet_by_id(pet_id, projection)
             
             if not pet:
                 return {
                     'message': 'Pet não encontrado'
                 }, 404
             
-            result = pet_schema.dump(pet)
+            result = _dump_pets(pet, projection, many=False)
             
             return {
                 'message': 'Pet encontrado',
                 'data': result
             }, 200
             
+        except ValueError as e:
+            logger.warning("Value error getting pet %s: %s", pet_id, e)
+            return {
+                'message': 'Parâmetros de consulta inválidos'
+            }, 400
+            
         except Exception as e:
-            logger.error(f"Unexpected error getting pet {pet_id}: {str(e)}")
+            logger.error("Unexpected error getting pet %s: %s", pet_id, e)
             return {
                 'message': 'Erro interno do servidor'
             }, 500
@@ -171,7 +512,7 @@ class PetResource(Resource):
     @pets_ns.response(500, 'Erro interno do servidor', models['error_response'])
     def put(self, pet_id):
         try:
-            data = pet_update_schema.load(request.json, partial=True)
+            data = pet_update_validator.load(request.json)
             
             pet = PetService.update_pet_with_endereco(pet_id, data)
             
@@ -188,20 +529,20 @@ class PetResource(Resource):
             }, 200
             
         except ValidationError as e:
-            logger.warning(f"Validation error updating pet {pet_id}: {e.messages}")
+            logger.warning("Validation error updating pet %s: %s", pet_id, e.messages)
             return {
                 'message': 'Dados inválidos',
                 'errors': e.messages
             }, 400
             
         except ValueError as e:
-            logger.warning(f"Value error updating pet {pet_id}: {str(e)}")
+            logger.warning("Value error updating pet %s: %s", pet_id, e)
             return {
                 'message': str(e)
             }, 400
             
         except Exception as e:
-            logger.error(f"Unexpected error updating pet {pet_id}: {str(e)}")
+            logger.error("Unexpected error updating pet %s: %s", pet_id, e)
             return {
                 'message': 'Erro interno do servidor'
             }, 500
@@ -224,7 +565,54 @@ class PetResource(Resource):
             }, 200
             
         except Exception as e:
-            logger.error(f"Unexpected error deleting pet {pet_id}: {str(e)}")
+            logger.error("Unexpected error deleting pet %s: %s", pet_id, e)
+            return {
+                'message': 'Erro interno do servidor'
+            }, 500
+
+
+@pets_ns.route('/<int:pet_id>/matches')
+class PetMatchesResource(Resource):
+    @response_cache.cached
+    @pets_ns.doc('get_pet_matches', description=(
+        'Pets que podem ser o mesmo animal: mesmo tipo, desaparecidos perto '
+        '(ou na mesma cidade) e em datas próximas, ordenados por uma nota que '
+        'combina porte, sexo, idade, raça, descrição, distância e data.'
+    ))
+    @pets_ns.marshal_with(models['matches_response'])
+    @pets_ns.param('limit', f'Quantidade de candidatos (padrão: {DEFAULT_MATCH_LIMIT}, máximo: {MAX_MATCH_LIMIT})', type='integer')
+    @pets_ns.param('radius_km', f'Raio em km ao redor do endereço do pet (padrão: {DEFAULT_MATCH_RADIUS_KM:g})', type='number')
+    @pets_ns.param('window_days', f'Diferença máxima em dias entre as datas de desaparecimento (padrão: {DEFAULT_MATCH_WINDOW_DAYS})', type='integer')
+    @pets_ns.response(400, 'Parâmetros de consulta inválidos', models['error_response'])
+    @pets_ns.response(404, 'Pet não encontrado', models['error_response'])
+    @pets_ns.response(500, 'Erro interno do servidor', models['error_response'])
+    def get(self, pet_id):
+        try:
+            params = _parse_match_params(request.args)
+            matches = MatchService.find_matches_for_pet(pet_id, **params)
+            
+            if matches is None:
+                return {
+                    'message': 'Pet não encontrado'
+                }, 404
+            
+            pets = _dump_pets([match['pet'] for match in matches], None, many=True)
+            for match, pet in zip(matches, pets):
+                match['pet'] = pet
+            
+            return {
+                'message': f'{len(matches)} candidatos encontrados',
+                'data': matches
+            }, 200
+            
+        except ValueError as e:
+            logger.warning("Value error getting matches for pet %s: %s", pet_id, e)
+            return {
+                'message': 'Parâmetros de consulta inválidos'
+            }, 400
+            
+        except Exception as e:
+            logger.error("Unexpected error getting matches for pet %s: %s", pet_id, e)
             return {
                 'message': 'Erro interno do servidor'
             }, 500
\ No newline at end of file
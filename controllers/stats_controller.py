@@ -0,0 +1,133 @@
+from datetime import datetime
+from flask import request
+from flask_restx import Resource, Namespace, fields
+from models import Pet
+from services import StatsService
+from services.stats_service import PERIODS
+from response_cache import response_cache
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+MAX_CITIES = 100
+
+estatisticas_ns = Namespace(
+    'Estatísticas',
+    description='Pets perdidos por período e cidade, servidos da tabela de resumo diário',
+    path='/estatisticas'
+)
+
+serie_point_model = estatisticas_ns.model('StatsSeriesPoint', {
+    'periodo': fields.String(description='Dia (AAAA-MM-DD), mês (AAAA-MM) ou ano (AAAA)', example='2024-01'),
+    'cidade': fields.String(description='Cidade onde os pets desapareceram', example='São Paulo'),
+    'estado': fields.String(description='Estado', example='SP'),
+    'total': fields.Integer(description='Pets perdidos no período', example=12)
+})
+
+serie_response_model = estatisticas_ns.model('StatsSeriesResponse', {
+    'message': fields.String(description='Mensagem de sucesso'),
+    'data': fields.List(fields.Nested(serie_point_model), description='Totais por período e cidade, em ordem de período')
+})
+
+city_total_model = estatisticas_ns.model('StatsCityTotal', {
+    'cidade': fields.String(description='Cidade onde os pets desapareceram', example='São Paulo'),
+    'estado': fields.String(description='Estado', example='SP'),
+    'total': fields.Integer(description='Pets perdidos no intervalo', example=87)
+})
+
+cities_response_model = estatisticas_ns.model('StatsCitiesResponse', {
+    'message': fields.String(description='Mensagem de sucesso'),
+    'data': fields.List(fields.Nested(city_total_model), description='Cidades com mais pets perdidos, da maior para a menor')
+})
+
+
+def _parse_stats_filters(args) -> dict:
+    filters = {}
+    for name in ('start_date', 'end_date'):
+        if args.get(name):
+            filters[name] = datetime.fromisoformat(args[name]).date()
+    for name in ('estado', 'cidade'):
+        if args.get(name):
+            filters[name] = args[name]
+    tipo = args.get('tipo')
+    if tipo:
+        if tipo not in Pet.TIPOS:
+            raise ValueError(f"Tipo inválido: {tipo}")
+        filters['tipo'] = tipo
+    return filters
+
+
+def _stats_params(func):
+    func = estatisticas_ns.param('start_date', 'Primeiro dia do intervalo (ISO format)')(func)
+    func = estatisticas_ns.param('end_date', 'Último dia do intervalo (ISO format)')(func)
+    func = estatisticas_ns.param('estado', 'Filtrar por estado')(func)
+    func = estatisticas_ns.param('cidade', 'Filtrar por cidade (nome exato para cidades da base de CEPs, senão prefixo; sem distinguir acentos)')(func)
+    func = estatisticas_ns.param('tipo', 'Filtrar por tipo do pet', enum=list(Pet.TIPOS))(func)
+    return func
+
+
+@estatisticas_ns.route('/serie')
+class StatsSeriesResource(Resource):
+    @response_cache.cached
+    @estatisticas_ns.doc('get_stats_series')
+    @estatisticas_ns.marshal_with(serie_response_model)
+    @estatisticas_ns.param('periodo', 'Agrupamento da série (padrão: dia)', enum=list(PERIODS))
+    @_stats_params
+    @estatisticas_ns.response(400, 'Parâmetros de consulta inválidos')
+    @estatisticas_ns.response(500, 'Erro interno do servidor')
+    def get(self):
+        try:
+            filters = _parse_stats_filters(request.args)
+            series = StatsService.series(filters, request.args.get('periodo', 'dia'))
+            
+            return {
+                'message': f'{len(series)} pontos na série',
+                'data': series
+            }, 200
+        
+        except ValueError as e:
+            logger.warning("Value error getting stats series: %s", e)
+            return {
+                'message': 'Parâmetros de consulta inválidos'
+            }, 400
+        
+        except Exception as e:
+            logger.error("Unexpected error getting stats series: %s", e)
+            return {
+                'message': 'Erro interno do servidor'
+            }, 500
+
+
+@estatisticas_ns.route('/cidades')
+class StatsCitiesResource(Resource):
+    @response_cache.cached
+    @estatisticas_ns.doc('get_stats_cities')
+    @estatisticas_ns.marshal_with(cities_response_model)
+    @estatisticas_ns.param('limit', f'Número máximo de cidades (1 a {MAX_CITIES}, padrão: 20)', type='integer')
+    @_stats_params
+    @estatisticas_ns.response(400, 'Parâmetros de consulta inválidos')
+    @estatisticas_ns.response(500, 'Erro interno do servidor')
+    def get(self):
+        try:
+            filters = _parse_stats_filters(request.args)
+            limit = int(request.args.get('limit', 20))
+            if not 1 <= limit <= MAX_CITIES:
+                raise ValueError(f"Limite inválido: {limit}")
+            cities = StatsService.cities(filters, limit)
+            
+            return {
+                'message': f'{len(cities)} cidades encontradas',
+                'data': cities
+            }, 200
+        
+        except ValueError as e:
+            logger.warning("Value error getting stats by city: %s", e)
+            return {
+                'message': 'Parâmetros de consulta inválidos'
+            }, 400
+        
+        except Exception as e:
+            logger.error("Unexpected error getting stats by city: %s", e)
+            return {
+                'message': 'Erro interno do servidor'
+            }, 500
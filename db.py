@@ -1,15 +1,181 @@
+import math
+import os
+import sqlite3
+import time
+from contextlib import closing, contextmanager
+from itertools import count
+from typing import List, Optional
+from flask import has_request_context, request
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from alembic import command
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import URL, Engine, make_url
 from flask_migrate import Migrate
 
-db = SQLAlchemy()
+MIGRATIONS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+REPLICA_STICKY_COOKIE = 'db_primary_until'
+WRITE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+
+class RoutingSession(Session):
+    """Sessão que manda as consultas de um bloco ``read_replica()`` para a réplica, até a primeira escrita."""
+    
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        replica = self.info.get('replica')
+        if bind is None and replica is not None and not self.info.get('wrote'):
+            return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _mark_wrote(session, flush_context):
+    session.info['wrote'] = True
+
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
 
+
+class ReplicaSet:
+    """Réplicas de leitura (``DATABASE_REPLICA_URLS``), usadas em rodízio."""
+    
+    def __init__(self):
+        self.engines: List[Engine] = []
+        self.sticky_seconds = 5.0
+        self._counter = count()
+    
+    def init_app(self, app, engine_options=lambda url: {}):
+        self.sticky_seconds = app.config.get('REPLICA_STICKY_SECONDS', 5.0)
+        self.engines = []
+        for url in app.config.get('DATABASE_REPLICA_URLS') or []:
+            url = make_url(url)
+            if is_sqlite_file(url) and not os.path.isabs(url.database):
+                # Mesmo tratamento do Flask-SQLAlchemy para o primário: relativo à pasta instance
+                url = url.set(database=os.path.join(app.instance_path, url.database))
+            engine = create_engine(url, **engine_options(url.render_as_string(hide_password=False)))
+            configure_sqlite(engine, app.config.get('SQLITE_BUSY_TIMEOUT', 5000))
+            dispose_after_fork(engine)
+            self.engines.append(engine)
+        
+        if self.engines:
+            app.after_request(self._stick_writer)
+    
+    def choose(self) -> Optional[Engine]:
+        """Próxima réplica do rodízio, ou ``None`` (primário) sem réplicas ou com o cliente fixado no primário."""
+        if self.is_sticky() or not self.engines:
+            return None
+        return self.engines[next(self._counter) % len(self.engines)]
+    
+    def is_sticky(self) -> bool:
+        """Se a requisição atual é de um cliente que escreveu há pouco (sempre ``False`` sem réplicas)."""
+        if not self.engines or not has_request_context():
+            return False
+        try:
+            return float(request.cookies.get(REPLICA_STICKY_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+    
+    def _stick_writer(self, response):
+        if request.method in WRITE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                REPLICA_STICKY_COOKIE, f'{time.time() + self.sticky_seconds:.3f}',
+                max_age=max(1, math.ceil(self.sticky_seconds)), httponly=True, samesite='Lax'
+            )
+        return response
+
+
+replicas = ReplicaSet()
+
+
+@contextmanager
+def read_replica():
+    """Executa as consultas do bloco em uma réplica de leitura, quando houver."""
+    session = db.session()
+    if session.info.get('replica') is not None:
+        yield session
+        return
+    
+    session.info['replica'] = replicas.choose()
+    try:
+        yield session
+    finally:
+        session.info.pop('replica', None)
+
+
+@contextmanager
+def unit_of_work():
+    """Agrupa as alterações de uma operação em um único flush/commit, sem autoflush."""
+    session = db.session()
+    depth = session.info.get('unit_of_work_depth', 0)
+    session.info['unit_of_work_depth'] = depth + 1
+    try:
+        with session.no_autoflush:
+            yield session
+        if depth == 0:
+            session.commit()
+    except Exception:
+        if depth == 0:
+            session.rollback()
+        raise
+    finally:
+        session.info['unit_of_work_depth'] = depth
+
+def lock_for_write(session) -> bool:
+    """No SQLite, abre a transação com ``BEGIN IMMEDIATE``; devolve ``True`` se o banco ficou travado para escrita."""
+    connection = session.connection()
+    if connection.dialect.name != 'sqlite':
+        return False
+    # Com a transação já aberta o pysqlite já emitiu uma escrita, e o lock já é dela
+    if not connection.connection.driver_connection.in_transaction:
+        connection.exec_driver_sql('BEGIN IMMEDIATE')
+    return True
+
+def is_sqlite_file(url: URL) -> bool:
+    return url.get_backend_name() == 'sqlite' and url.database not in (None, '', ':memory:')
+
+def configure_sqlite(engine: Engine, busy_timeout: int):
+    """Liga o WAL e o ``busy_timeout`` em cada conexão de um SQLite em arquivo."""
+    if not is_sqlite_file(engine.url):
+        return
+    
+    @event.listens_for(engine, 'connect')
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute(f'PRAGMA busy_timeout={int(busy_timeout)}')
+        cursor.close()
+
+def dispose_after_fork(engine: Engine):
+    """Esquece no processo filho as conexões herdadas do pai, sem fechá-las (gunicorn com ``preload_app``)."""
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=lambda: engine.dispose(close=False))
+
+def copy_sqlite_database(source: URL, target: URL):
+    """Copia um SQLite em arquivo para outro com a API de backup (cópia consistente, mesmo em WAL)."""
+    if not (is_sqlite_file(source) and is_sqlite_file(target)):
+        raise ValueError(f"Só é possível copiar SQLite em arquivo: {target}")
+    
+    with closing(sqlite3.connect(source.database)) as source_connection, closing(sqlite3.connect(target.database)) as target_connection:
+        source_connection.backup(target_connection)
+
+def upgrade_empty_database():
+    """Cria o esquema de um banco vazio pelas migrações (as mesmas do ``flask db upgrade``)."""
+    if inspect(db.engine).has_table('pets'):
+        return
+    
+    config = migrate.get_config()
+    config.attributes['configure_logger'] = False
+    command.upgrade(config, 'head')
+
 def init_db(app):
     db.init_app(app)
-    migrate.init_app(app, db)
+    migrate.init_app(app, db, directory=MIGRATIONS_PATH, render_as_batch=True)
     
     with app.app_context():
         from models.endereco import Endereco
         from models.pet import Pet
         
-        db.create_all()
+        configure_sqlite(db.engine, app.config.get('SQLITE_BUSY_TIMEOUT', 5000))
+        dispose_after_fork(db.engine)
+        upgrade_empty_database()
@@ -0,0 +1,12 @@
+"""Configuração do gunicorn (``gunicorn -c gunicorn.conf.py wsgi:application``)."""
+import multiprocessing
+import os
+
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get('WEB_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('WEB_THREADS', 4))
+worker_class = 'gthread'
+preload_app = os.environ.get('WEB_PRELOAD', 'true').lower() == 'true'
+timeout = int(os.environ.get('WEB_TIMEOUT', 30))
+keepalive = 5
+accesslog = '-'
@@ -0,0 +1,17 @@
+from flask import current_app, make_response
+from flask_restx.representations import output_json as restx_output_json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def output_json(data, code, headers=None):
+    """Representação ``application/json`` da API, gerada pelo orjson com ``JSON_ENCODER=orjson``."""
+    if orjson is None or current_app.config.get('JSON_ENCODER') != 'orjson':
+        return restx_output_json(data, code, headers)
+    
+    response = make_response(orjson.dumps(data) + b'\n', code)
+    response.headers.extend(headers or {})
+    return response
@@ -1,17 +1,162 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import random
 import sys
-from datetime import datetime
+import threading
+import uuid
+from datetime import datetime, timezone
+from flask import g, has_request_context, request
 
-def setup_logger():
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler('app.log', mode='a')
-        ]
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Passado como ``extra`` nas linhas INFO de alto volume do caminho de leitura
+# ("Pet found", "Retrieved N pets"...), que ficam sujeitas à amostragem.
+SAMPLED = {'sampled': True}
+
+_listener = None
+_queue_handler = None
+_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """Uma linha JSON por registro, com o ``request_id`` da requisição quando houver."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        request_id = getattr(record, 'request_id', None)
+        if request_id:
+            entry['request_id'] = request_id
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class RequestIdFilter(logging.Filter):
+    """Anexa ao registro o ``request_id`` da requisição corrente (roda na thread da requisição)."""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if has_request_context():
+            record.request_id = g.get('request_id')
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Amostra os registros INFO marcados com ``SAMPLED``, com taxa por módulo."""
+    
+    def __init__(self, default_rate: float = 1.0, rates: dict = None):
+        super().__init__()
+        self.default_rate = default_rate
+        self.rates = rates or {}
+    
+    def rate_for(self, name: str) -> float:
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition('.')[0]
+        return self.default_rate
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO or not getattr(record, 'sampled', False):
+            return True
+        rate = self.rate_for(record.name)
+        return rate >= 1 or random.random() < rate
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Enfileira o registro com a mensagem já montada, deixando a formatação para o listener."""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _parse_rates(value: str) -> dict:
+    rates = {}
+    for item in filter(None, (part.strip() for part in value.split(','))):
+        name, _, rate = item.partition('=')
+        rates[name.strip()] = float(rate)
+    return rates
+
+
+def _build_handlers() -> list:
+    formatter = JsonFormatter() if os.environ.get('LOG_FORMAT', 'json') == 'json' else logging.Formatter(TEXT_FORMAT)
+    
+    stream_handler = logging.StreamHandler(sys.stdout)
+    file_handler = logging.handlers.RotatingFileHandler(
+        os.environ.get('LOG_FILE', 'app.log'),
+        maxBytes=int(os.environ.get('LOG_MAX_BYTES', 10 * 1024 * 1024)),
+        backupCount=int(os.environ.get('LOG_BACKUP_COUNT', 5)),
+        encoding='utf-8',
+        delay=True
     )
+    for handler in (stream_handler, file_handler):
+        handler.setFormatter(formatter)
+    return [stream_handler, file_handler]
+
+
+def _start_listener():
+    global _listener
+    
+    _queue_handler.queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, *_build_handlers(), respect_handler_level=True)
+    _listener.start()
+
+
+def _stop_listener():
+    if _listener is not None:
+        _listener.stop()
+
+
+def setup_logger():
+    """Configura, uma única vez por processo, a fila de logs e o listener que grava no stdout e em ``app.log``."""
+    global _queue_handler
+    
+    with _lock:
+        if _queue_handler is not None:
+            return
+        
+        _queue_handler = DeferredQueueHandler(queue.SimpleQueue())
+        _queue_handler.addFilter(RequestIdFilter())
+        _queue_handler.addFilter(SamplingFilter(
+            default_rate=float(os.environ.get('LOG_SAMPLE_RATE', 1.0)),
+            rates=_parse_rates(os.environ.get('LOG_SAMPLE_RATES', ''))
+        ))
+        
+        root = logging.getLogger()
+        root.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
+        root.addHandler(_queue_handler)
+        
+        _start_listener()
+        atexit.register(_stop_listener)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=_start_listener)
+
+
+def init_request_id(app):
+    """Gera (ou reaproveita o ``X-Request-ID`` recebido) um id por requisição e o devolve na resposta."""
+    
+    @app.before_request
+    def _assign_request_id():
+        g.request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex
+    
+    @app.after_request
+    def _expose_request_id(response):
+        request_id = g.get('request_id')
+        if request_id:
+            response.headers['X-Request-ID'] = request_id
+        return response
+
 
 def get_logger(name):
     setup_logger()
-    return logging.getLogger(name)
\ No newline at end of file
+    return logging.getLogger(name)
@@ -0,0 +1,191 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Sequence, Tuple
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from db import db, replicas
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    """Histograma cumulativo com rótulos, no formato de exposição do Prometheus."""
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float, *labelvalues: str):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+    
+    def render(self) -> str:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = sorted((labels, list(counts), total) for labels, (counts, total) in self._series.items())
+        
+        for labelvalues, counts, total in series:
+            labels = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, labelvalues))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(float(bound))
+                lines.append(f'{self.name}_bucket{{{labels}{"," if labels else ""}le="{le}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{labels}}} {total}')
+            lines.append(f'{self.name}_count{{{labels}}} {cumulative}')
+        return '\n'.join(lines)
+    
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+class Metrics:
+    """Instrumentação por requisição exposta em ``/metrics``: latência, SQL, serialização e bytes da resposta."""
+    
+    def __init__(self, namespace: str = 'busca_pet'):
+        self.enabled = True
+        self.server_timing = False
+        self.request_duration = Histogram(
+            f'{namespace}_request_duration_seconds', 'Latência das requisições HTTP.',
+            ('method', 'endpoint', 'status'), LATENCY_BUCKETS
+        )
+        self.sql_statements = Histogram(
+            f'{namespace}_sql_statements_per_request', 'Comandos SQL executados por requisição.',
+            ('method', 'endpoint'), STATEMENT_BUCKETS
+        )
+        self.sql_duration = Histogram(
+            f'{namespace}_sql_duration_seconds_per_request', 'Tempo total de SQL por requisição.',
+            ('method', 'endpoint'), LATENCY_BUCKETS
+        )
+        self.serialization_duration = Histogram(
+            f'{namespace}_serialization_duration_seconds', 'Tempo de serialização (marshmallow dump) por requisição.',
+            ('method', 'endpoint'), LATENCY_BUCKETS
+        )
+        self.response_size = Histogram(
+            f'{namespace}_response_size_bytes', 'Tamanho do corpo das respostas (exceto streaming).',
+            ('method', 'endpoint'), BYTES_BUCKETS
+        )
+        self.histograms = (
+            self.request_duration, self.sql_statements, self.sql_duration,
+            self.serialization_duration, self.response_size,
+        )
+    
+    def init_app(self, app):
+        self.enabled = app.config.get('METRICS_ENABLED', True)
+        self.server_timing = app.config.get('SERVER_TIMING_ENABLED', False)
+        if not self.enabled and not self.server_timing:
+            return
+        
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        if self.enabled:
+            app.add_url_rule('/metrics', 'metrics', self.render)
+        
+        with app.app_context():
+            self.instrument_engine(db.engine)
+        for engine in replicas.engines:
+            self.instrument_engine(engine)
+    
+    @staticmethod
+    def instrument_engine(engine: Engine):
+        if event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+            return
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(engine, 'handle_error', _handle_error)
+    
+    @contextmanager
+    def serialization(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats = _request_stats()
+            if stats is not None:
+                stats['serialization'] += time.perf_counter() - started
+    
+    def render(self) -> Response:
+        body = '\n'.join(histogram.render() for histogram in self.histograms) + '\n'
+        return Response(body, mimetype='text/plain; version=0.0.4')
+    
+    def clear(self):
+        for histogram in self.histograms:
+            histogram.clear()
+    
+    def _start_request(self):
+        g._metrics = {'started': time.perf_counter(), 'sql_count': 0, 'sql_time': 0.0, 'serialization': 0.0}
+    
+    def _finish_request(self, response: Response) -> Response:
+        stats = _request_stats()
+        if stats is None:
+            return response
+        
+        total = time.perf_counter() - stats['started']
+        endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        
+        if self.enabled and endpoint != '/metrics':
+            method = request.method
+            self.request_duration.observe(total, method, endpoint, str(response.status_code))
+            self.sql_statements.observe(stats['sql_count'], method, endpoint)
+            self.sql_duration.observe(stats['sql_time'], method, endpoint)
+            if stats['serialization']:
+                self.serialization_duration.observe(stats['serialization'], method, endpoint)
+            if not response.is_streamed and response.content_length is not None:
+                self.response_size.observe(response.content_length, method, endpoint)
+        
+        if self.server_timing:
+            response.headers['Server-Timing'] = (
+                f'db;dur={stats["sql_time"] * 1000:.2f};desc="{stats["sql_count"]} queries", '
+                f'serialize;dur={stats["serialization"] * 1000:.2f}, '
+                f'total;dur={total * 1000:.2f}'
+            )
+        return response
+
+
+def _request_stats() -> Optional[dict]:
+    if not has_request_context():
+        return None
+    return g.get('_metrics')
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('metrics_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info['metrics_started'].pop()
+    stats = _request_stats()
+    if stats is not None:
+        stats['sql_count'] += 1
+        stats['sql_time'] += time.perf_counter() - started
+
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get('metrics_started'):
+        connection.info['metrics_started'].pop()
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+metrics = Metrics()
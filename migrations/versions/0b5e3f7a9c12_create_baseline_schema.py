@@ -0,0 +1,81 @@
+"""create baseline schema
+
+Revision ID: 0b5e3f7a9c12
+Revises:
+Create Date: 2026-10-18 10:40:12.517204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b5e3f7a9c12'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+TIPOS = ('Cachorro', 'Gato', 'Ave', 'Outro')
+IDADES = ('Filhote', 'Adulto', 'Idoso')
+PORTES = ('Pequeno', 'Medio', 'Grande')
+SEXOS = ('Macho', 'Femea')
+
+
+def _enums():
+    return (
+        sa.Enum(*TIPOS, name='pet_tipo'),
+        sa.Enum(*IDADES, name='pet_idade'),
+        sa.Enum(*PORTES, name='pet_porte'),
+        sa.Enum(*SEXOS, name='pet_sexo')
+    )
+
+
+def upgrade():
+    # Bancos criados antes das migrações já têm estas tabelas
+    if sa.inspect(op.get_bind()).has_table('pets'):
+        return
+
+    op.create_table(
+        'enderecos',
+        sa.Column('cep', sa.String(length=10), nullable=False),
+        sa.Column('rua', sa.String(length=255), nullable=False),
+        sa.Column('bairro', sa.String(length=100), nullable=False),
+        sa.Column('cidade', sa.String(length=100), nullable=False),
+        sa.Column('estado', sa.String(length=100), nullable=False),
+        sa.Column('pais', sa.String(length=100), nullable=False),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    tipo, idade, porte, sexo = _enums()
+    op.create_table(
+        'pets',
+        sa.Column('tipo', tipo, nullable=False),
+        sa.Column('foto', sa.Text(), nullable=True),
+        sa.Column('nome', sa.String(length=100), nullable=False),
+        sa.Column('idade', idade, nullable=False),
+        sa.Column('porte', porte, nullable=False),
+        sa.Column('raca', sa.String(length=100), nullable=False),
+        sa.Column('info_contato', sa.Text(), nullable=False),
+        sa.Column('sexo', sexo, nullable=False),
+        sa.Column('descricao', sa.Text(), nullable=False),
+        sa.Column('observacoes', sa.Text(), nullable=True),
+        sa.Column('data_desaparecimento', sa.DateTime(), nullable=False),
+        sa.Column('endereco_id', sa.Integer(), nullable=False),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['endereco_id'], ['enderecos.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('pets')
+    op.drop_table('enderecos')
+
+    connection = op.get_bind()
+    for enum in _enums():
+        enum.drop(connection, checkfirst=True)
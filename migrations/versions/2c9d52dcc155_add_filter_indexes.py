@@ -0,0 +1,68 @@
+"""add filter indexes and cidade_normalizada
+
+Revision ID: 2c9d52dcc155
+Revises: 0b5e3f7a9c12
+Create Date: 2026-10-18 10:45:34.088388
+
+"""
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2c9d52dcc155'
+down_revision = '0b5e3f7a9c12'
+branch_labels = None
+depends_on = None
+
+
+def _normalize_text(value):
+    # Cópia da normalização desta revisão: a migração não depende do código da aplicação
+    if value is None:
+        return None
+    decomposed = unicodedata.normalize('NFKD', value)
+    unaccented = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return re.sub(r'\s+', ' ', unaccented).strip().lower()
+
+
+def upgrade():
+    with op.batch_alter_table('enderecos', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('cidade_normalizada', sa.String(length=100), nullable=True))
+
+    connection = op.get_bind()
+    enderecos = sa.table(
+        'enderecos',
+        sa.column('id', sa.Integer),
+        sa.column('cidade', sa.String),
+        sa.column('cidade_normalizada', sa.String)
+    )
+    rows = connection.execute(sa.select(enderecos.c.id, enderecos.c.cidade)).fetchall()
+    if rows:
+        connection.execute(
+            enderecos.update().where(enderecos.c.id == sa.bindparam('endereco_id')),
+            [{'endereco_id': row.id, 'cidade_normalizada': _normalize_text(row.cidade)} for row in rows]
+        )
+
+    with op.batch_alter_table('enderecos', schema=None) as batch_op:
+        batch_op.create_index('ix_enderecos_cidade_normalizada', ['cidade_normalizada'], unique=False)
+
+    with op.batch_alter_table('pets', schema=None) as batch_op:
+        batch_op.create_index('ix_pets_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_pets_tipo_created_at_id', ['tipo', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_pets_data_desaparecimento', ['data_desaparecimento'], unique=False)
+        batch_op.create_index('ix_pets_endereco_id', ['endereco_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('pets', schema=None) as batch_op:
+        batch_op.drop_index('ix_pets_endereco_id')
+        batch_op.drop_index('ix_pets_data_desaparecimento')
+        batch_op.drop_index('ix_pets_tipo_created_at_id')
+        batch_op.drop_index('ix_pets_created_at_id')
+
+    with op.batch_alter_table('enderecos', schema=None) as batch_op:
+        batch_op.drop_index('ix_enderecos_cidade_normalizada')
+        batch_op.drop_column('cidade_normalizada')
@@ -0,0 +1,26 @@
+"""add foto_hash
+
+Revision ID: 3c488b92f3da
+Revises: 46b3e5d61bd5
+Create Date: 2026-10-18 10:50:49.583058
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c488b92f3da'
+down_revision = '46b3e5d61bd5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('pets', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('foto_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('pets', schema=None) as batch_op:
+        batch_op.drop_column('foto_hash')
@@ -0,0 +1,92 @@
+"""add search index
+
+Revision ID: 46b3e5d61bd5
+Revises: 2c9d52dcc155
+Create Date: 2026-10-18 10:47:40.312145
+
+"""
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '46b3e5d61bd5'
+down_revision = '2c9d52dcc155'
+branch_labels = None
+depends_on = None
+
+# Tabela FTS5 como criada nesta revisão
+FTS_TABLE = 'pets_fts'
+FTS_COLUMNS = ('nome', 'raca', 'descricao')
+
+
+def _normalize_text(value):
+    if value is None:
+        return None
+    decomposed = unicodedata.normalize('NFKD', value)
+    unaccented = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return re.sub(r'\s+', ' ', unaccented).strip().lower()
+
+
+def _busca_normalizada(nome, raca, descricao):
+    return _normalize_text(' '.join(value for value in (nome, raca, descricao) if value))
+
+
+def upgrade():
+    with op.batch_alter_table('pets', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('busca_normalizada', sa.Text(), nullable=True))
+
+    connection = op.get_bind()
+    pets = sa.table(
+        'pets',
+        sa.column('id', sa.Integer),
+        sa.column('nome', sa.String),
+        sa.column('raca', sa.String),
+        sa.column('descricao', sa.Text),
+        sa.column('busca_normalizada', sa.Text)
+    )
+    rows = connection.execute(sa.select(pets.c.id, pets.c.nome, pets.c.raca, pets.c.descricao)).fetchall()
+    if rows:
+        connection.execute(
+            pets.update().where(pets.c.id == sa.bindparam('pet_id')),
+            [
+                {'pet_id': row.id, 'busca_normalizada': _busca_normalizada(row.nome, row.raca, row.descricao)}
+                for row in rows
+            ]
+        )
+
+    if connection.dialect.name == 'sqlite':
+        exists = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+        ).first() is not None
+        if not exists:
+            connection.exec_driver_sql(
+                f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                f"{', '.join(FTS_COLUMNS)}, tokenize = 'unicode61 remove_diacritics 2')"
+            )
+            if rows:
+                connection.exec_driver_sql(
+                    f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(FTS_COLUMNS)}) VALUES (?, ?, ?, ?)",
+                    [(row.id, _normalize_text(row.nome), _normalize_text(row.raca), _normalize_text(row.descricao)) for row in rows]
+                )
+    elif connection.dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.create_index(
+            'ix_pets_busca_normalizada_trgm', 'pets', ['busca_normalizada'],
+            postgresql_using='gin',
+            postgresql_ops={'busca_normalizada': 'gin_trgm_ops'}
+        )
+
+
+def downgrade():
+    connection = op.get_bind()
+    if connection.dialect.name == 'sqlite':
+        op.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+    elif connection.dialect.name == 'postgresql':
+        op.drop_index('ix_pets_busca_normalizada_trgm', table_name='pets')
+
+    with op.batch_alter_table('pets', schema=None) as batch_op:
+        batch_op.drop_column('busca_normalizada')
@@ -0,0 +1,83 @@
+"""add pet daily summaries
+
+Revision ID: a7d3e9c21f54
+Revises: fbd0ebc6ff88
+Create Date: 2026-10-18 13:42:10.284113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3e9c21f54'
+down_revision = 'fbd0ebc6ff88'
+branch_labels = None
+depends_on = None
+
+
+def _populate_summary(connection):
+    """Recalcula ``pet_daily_summaries`` com um ``GROUP BY`` sobre as tabelas desta revisão."""
+    pets = sa.table(
+        'pets',
+        sa.column('tipo', sa.String),
+        sa.column('data_desaparecimento', sa.DateTime),
+        sa.column('endereco_id', sa.Integer)
+    )
+    enderecos = sa.table(
+        'enderecos',
+        sa.column('id', sa.Integer),
+        sa.column('cidade', sa.String),
+        sa.column('estado', sa.String),
+        sa.column('cidade_normalizada', sa.String)
+    )
+    summary = sa.table(
+        'pet_daily_summaries',
+        sa.column('dia', sa.Date),
+        sa.column('estado', sa.String),
+        sa.column('cidade_normalizada', sa.String),
+        sa.column('tipo', sa.String),
+        sa.column('cidade', sa.String),
+        sa.column('total', sa.Integer)
+    )
+    if connection.dialect.name == 'sqlite':
+        dia = sa.func.date(pets.c.data_desaparecimento)
+    else:
+        dia = sa.cast(pets.c.data_desaparecimento, sa.Date)
+    cidade_normalizada = sa.func.coalesce(enderecos.c.cidade_normalizada, '')
+
+    select = sa.select(
+        dia, enderecos.c.estado, cidade_normalizada, pets.c.tipo, sa.func.max(enderecos.c.cidade), sa.func.count()
+    ).select_from(pets.join(enderecos, enderecos.c.id == pets.c.endereco_id)).group_by(
+        dia, enderecos.c.estado, cidade_normalizada, pets.c.tipo
+    )
+    connection.execute(sa.text('DELETE FROM pet_daily_summaries'))
+    connection.execute(summary.insert().from_select(
+        ['dia', 'estado', 'cidade_normalizada', 'tipo', 'cidade', 'total'], select
+    ))
+
+
+def upgrade():
+    connection = op.get_bind()
+    # O db.create_all() da aplicação pode ter criado a tabela antes da migração
+    if not sa.inspect(connection).has_table('pet_daily_summaries'):
+        op.create_table('pet_daily_summaries',
+        sa.Column('dia', sa.Date(), nullable=False),
+        sa.Column('estado', sa.String(length=100), nullable=False),
+        sa.Column('cidade_normalizada', sa.String(length=100), nullable=False),
+        sa.Column('tipo', sa.String(length=20), nullable=False),
+        sa.Column('cidade', sa.String(length=100), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('dia', 'estado', 'cidade_normalizada', 'tipo')
+        )
+        with op.batch_alter_table('pet_daily_summaries', schema=None) as batch_op:
+            batch_op.create_index('ix_pet_daily_summaries_cidade_normalizada_dia', ['cidade_normalizada', 'dia'], unique=False)
+
+    _populate_summary(connection)
+
+
+def downgrade():
+    with op.batch_alter_table('pet_daily_summaries', schema=None) as batch_op:
+        batch_op.drop_index('ix_pet_daily_summaries_cidade_normalizada_dia')
+
+    op.drop_table('pet_daily_summaries')
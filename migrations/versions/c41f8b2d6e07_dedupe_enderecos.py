@@ -0,0 +1,138 @@
+"""dedupe enderecos
+
+Revision ID: c41f8b2d6e07
+Revises: a7d3e9c21f54
+Create Date: 2026-10-18 14:20:37.915402
+
+"""
+import hashlib
+import re
+import unicodedata
+from collections import defaultdict
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41f8b2d6e07'
+down_revision = 'a7d3e9c21f54'
+branch_labels = None
+depends_on = None
+
+RTREE_TABLE = 'enderecos_rtree'
+
+
+def _normalize_text(value):
+    if value is None:
+        return None
+    decomposed = unicodedata.normalize('NFKD', value)
+    unaccented = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return re.sub(r'\s+', ' ', unaccented).strip().lower()
+
+
+def _address_hash(cep, rua, bairro, cidade, estado, pais):
+    # Deve produzir o mesmo hash que a aplicação gravava quando esta revisão foi escrita
+    parts = [re.sub(r'\D', '', cep or '')] + [_normalize_text(part) or '' for part in (rua, bairro, cidade, estado, pais)]
+    return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+def _rebuild_summary(connection):
+    pets = sa.table(
+        'pets',
+        sa.column('tipo', sa.String),
+        sa.column('data_desaparecimento', sa.DateTime),
+        sa.column('endereco_id', sa.Integer)
+    )
+    enderecos = sa.table(
+        'enderecos',
+        sa.column('id', sa.Integer),
+        sa.column('cidade', sa.String),
+        sa.column('estado', sa.String),
+        sa.column('cidade_normalizada', sa.String)
+    )
+    summary = sa.table(
+        'pet_daily_summaries',
+        sa.column('dia', sa.Date),
+        sa.column('estado', sa.String),
+        sa.column('cidade_normalizada', sa.String),
+        sa.column('tipo', sa.String),
+        sa.column('cidade', sa.String),
+        sa.column('total', sa.Integer)
+    )
+    if connection.dialect.name == 'sqlite':
+        dia = sa.func.date(pets.c.data_desaparecimento)
+    else:
+        dia = sa.cast(pets.c.data_desaparecimento, sa.Date)
+    cidade_normalizada = sa.func.coalesce(enderecos.c.cidade_normalizada, '')
+
+    connection.execute(summary.delete())
+    connection.execute(summary.insert().from_select(
+        ['dia', 'estado', 'cidade_normalizada', 'tipo', 'cidade', 'total'],
+        sa.select(
+            dia, enderecos.c.estado, cidade_normalizada, pets.c.tipo, sa.func.max(enderecos.c.cidade), sa.func.count()
+        ).select_from(pets.join(enderecos, enderecos.c.id == pets.c.endereco_id)).group_by(
+            dia, enderecos.c.estado, cidade_normalizada, pets.c.tipo
+        )
+    ))
+
+
+def upgrade():
+    with op.batch_alter_table('enderecos', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('endereco_hash', sa.String(length=64), nullable=True))
+
+    connection = op.get_bind()
+    enderecos = sa.table(
+        'enderecos',
+        sa.column('id', sa.Integer),
+        sa.column('cep', sa.String),
+        sa.column('rua', sa.String),
+        sa.column('bairro', sa.String),
+        sa.column('cidade', sa.String),
+        sa.column('estado', sa.String),
+        sa.column('pais', sa.String),
+        sa.column('endereco_hash', sa.String)
+    )
+    pets = sa.table('pets', sa.column('endereco_id', sa.Integer))
+
+    # O endereço de menor id de cada grupo fica; os pets dos demais passam para ele
+    groups = defaultdict(list)
+    rows = connection.execute(sa.select(enderecos).order_by(enderecos.c.id)).fetchall()
+    for row in rows:
+        groups[_address_hash(row.cep, row.rua, row.bairro, row.cidade, row.estado, row.pais or 'Brasil')].append(row.id)
+
+    if groups:
+        connection.execute(
+            enderecos.update().where(enderecos.c.id == sa.bindparam('endereco_id')).values(endereco_hash=sa.bindparam('hash')),
+            [{'endereco_id': ids[0], 'hash': endereco_hash} for endereco_hash, ids in groups.items()]
+        )
+
+    merged = [(ids[0], duplicate_id) for ids in groups.values() for duplicate_id in ids[1:]]
+    if merged:
+        connection.execute(
+            pets.update().where(pets.c.endereco_id == sa.bindparam('duplicate_id')).values(endereco_id=sa.bindparam('kept_id')),
+            [{'kept_id': kept_id, 'duplicate_id': duplicate_id} for kept_id, duplicate_id in merged]
+        )
+        connection.execute(
+            enderecos.delete().where(enderecos.c.id == sa.bindparam('duplicate_id')),
+            [{'duplicate_id': duplicate_id} for _, duplicate_id in merged]
+        )
+        rtree_exists = connection.dialect.name == 'sqlite' and connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (RTREE_TABLE,)
+        ).first() is not None
+        if rtree_exists:
+            connection.exec_driver_sql(
+                f"DELETE FROM {RTREE_TABLE} WHERE id = ?", [(duplicate_id,) for _, duplicate_id in merged]
+            )
+        # Grafias diferentes do estado (SP/sp) agora são um endereço só
+        _rebuild_summary(connection)
+
+    with op.batch_alter_table('enderecos', schema=None) as batch_op:
+        batch_op.alter_column('endereco_hash', existing_type=sa.String(length=64), nullable=False)
+        batch_op.create_index('ix_enderecos_endereco_hash', ['endereco_hash'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('enderecos', schema=None) as batch_op:
+        batch_op.drop_index('ix_enderecos_endereco_hash')
+        batch_op.drop_column('endereco_hash')
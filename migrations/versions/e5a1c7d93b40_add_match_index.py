@@ -0,0 +1,26 @@
+"""add tipo/data_desaparecimento index for matching
+
+Revision ID: e5a1c7d93b40
+Revises: c41f8b2d6e07
+Create Date: 2026-10-18 16:05:12.481733
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a1c7d93b40'
+down_revision = 'c41f8b2d6e07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('pets', schema=None) as batch_op:
+        batch_op.create_index('ix_pets_tipo_data_desaparecimento', ['tipo', 'data_desaparecimento'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('pets', schema=None) as batch_op:
+        batch_op.drop_index('ix_pets_tipo_data_desaparecimento')
@@ -0,0 +1,100 @@
+"""add endereco coordinates
+
+Revision ID: fbd0ebc6ff88
+Revises: 3c488b92f3da
+Create Date: 2026-10-18 10:57:00.616503
+
+"""
+import csv
+import os
+import re
+from bisect import bisect_right
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'fbd0ebc6ff88'
+down_revision = '3c488b92f3da'
+branch_labels = None
+depends_on = None
+
+RTREE_TABLE = 'enderecos_rtree'
+CEP_DATASET = os.environ.get('CEP_DATASET_PATH') or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, 'data', 'cep_faixas.csv'
+)
+
+
+def _coordinates_by_cep():
+    """Função ``cep -> (latitude, longitude)`` sobre as faixas da base de CEPs."""
+    with open(CEP_DATASET, newline='', encoding='utf-8') as dataset:
+        faixas = sorted(
+            (int(row['cep_inicio']), int(row['cep_fim']),
+             float(row['latitude']) if row['latitude'] else None,
+             float(row['longitude']) if row['longitude'] else None)
+            for row in csv.DictReader(dataset)
+        )
+    starts = [faixa[0] for faixa in faixas]
+
+    def lookup(cep):
+        digits = re.sub(r'\D', '', cep or '')
+        if len(digits) != 8:
+            return None, None
+        position = bisect_right(starts, int(digits)) - 1
+        if position < 0 or int(digits) > faixas[position][1]:
+            return None, None
+        return faixas[position][2], faixas[position][3]
+
+    return lookup
+
+
+def upgrade():
+    with op.batch_alter_table('enderecos', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('latitude', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('longitude', sa.Float(), nullable=True))
+
+    connection = op.get_bind()
+    enderecos = sa.table(
+        'enderecos',
+        sa.column('id', sa.Integer),
+        sa.column('cep', sa.String),
+        sa.column('latitude', sa.Float),
+        sa.column('longitude', sa.Float)
+    )
+    rows = connection.execute(sa.select(enderecos.c.id, enderecos.c.cep)).fetchall()
+    if rows:
+        coordinates_for_cep = _coordinates_by_cep()
+        params = []
+        for row in rows:
+            latitude, longitude = coordinates_for_cep(row.cep)
+            params.append({'endereco_id': row.id, 'latitude': latitude, 'longitude': longitude})
+        connection.execute(enderecos.update().where(enderecos.c.id == sa.bindparam('endereco_id')), params)
+
+    with op.batch_alter_table('enderecos', schema=None) as batch_op:
+        batch_op.create_index('ix_enderecos_latitude_longitude', ['latitude', 'longitude'], unique=False)
+
+    if connection.dialect.name == 'sqlite':
+        exists = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (RTREE_TABLE,)
+        ).first() is not None
+        if not exists:
+            connection.exec_driver_sql(
+                f"CREATE VIRTUAL TABLE {RTREE_TABLE} USING rtree(id, min_lat, max_lat, min_lon, max_lon)"
+            )
+            connection.exec_driver_sql(
+                f"INSERT INTO {RTREE_TABLE} (id, min_lat, max_lat, min_lon, max_lon) "
+                "SELECT id, latitude, latitude, longitude, longitude FROM enderecos "
+                "WHERE latitude IS NOT NULL AND longitude IS NOT NULL"
+            )
+
+
+def downgrade():
+    connection = op.get_bind()
+    if connection.dialect.name == 'sqlite':
+        op.execute(f'DROP TABLE IF EXISTS {RTREE_TABLE}')
+
+    with op.batch_alter_table('enderecos', schema=None) as batch_op:
+        batch_op.drop_index('ix_enderecos_latitude_longitude')
+        batch_op.drop_column('longitude')
+        batch_op.drop_column('latitude')
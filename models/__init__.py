@@ -1,5 +1,6 @@
 from .base import BaseModel
 from .endereco import Endereco
 from .pet import Pet
+from .pet_daily_summary import PetDailySummary
 
-__all__ = ['BaseModel', 'Endereco', 'Pet']
+__all__ = ['BaseModel', 'Endereco', 'Pet', 'PetDailySummary']
\ No newline at end of file
@@ -1,5 +1,5 @@
 from datetime import datetime
-from db import db
+from db import db, unit_of_work
 
 
 class BaseModel(db.Model):
@@ -10,10 +10,10 @@ class BaseModel(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     def save(self):
-        db.session.add(self)
-        db.session.commit()
+        with unit_of_work():
+            db.session.add(self)
         return self
     
     def delete(self):
-        db.session.delete(self)
-        db.session.commit()
+        with unit_of_work():
+            db.session.delete(self)
@@ -1,5 +1,9 @@
+from sqlalchemy import event
+from sqlalchemy.orm import validates
 from .base import BaseModel
 from db import db
+from normalizer import normalize_text, address_hash
+from cep_index import coordinates_for_cep
 
 
 class Endereco(BaseModel):
@@ -11,6 +15,40 @@ class Endereco(BaseModel):
     cidade = db.Column(db.String(100), nullable=False)
     estado = db.Column(db.String(100), nullable=False)
     pais = db.Column(db.String(100), nullable=False, default='Brasil')
+    cidade_normalizada = db.Column(db.String(100), nullable=True)
+    latitude = db.Column(db.Float, nullable=True)
+    longitude = db.Column(db.Float, nullable=True)
+    endereco_hash = db.Column(db.String(64), nullable=False)
+    
+    __table_args__ = (
+        db.Index('ix_enderecos_endereco_hash', 'endereco_hash', unique=True),
+        db.Index('ix_enderecos_cidade_normalizada', 'cidade_normalizada'),
+        db.Index('ix_enderecos_latitude_longitude', 'latitude', 'longitude'),
+    )
+    
+    @validates('cidade')
+    def _sync_cidade_normalizada(self, key, value):
+        self.cidade_normalizada = normalize_text(value)
+        return value
+    
+    @validates('cep')
+    def _sync_coordenadas(self, key, value):
+        self.latitude, self.longitude = coordinates_for_cep(value)
+        return value
+    
+    @staticmethod
+    def hash_for(endereco_data: dict) -> str:
+        """Chave de deduplicação: pets perdidos no mesmo endereço (normalizado) compartilham a linha."""
+        return address_hash(
+            endereco_data.get('cep'), endereco_data.get('rua'), endereco_data.get('bairro'),
+            endereco_data.get('cidade'), endereco_data.get('estado'), endereco_data.get('pais') or 'Brasil'
+        )
     
     def __repr__(self):
-        return f'<Endereco {self.rua}, {self.cidade}>'
\ No newline at end of file
+        return f'<Endereco {self.rua}, {self.cidade}>'
+
+
+@event.listens_for(Endereco, 'before_insert')
+@event.listens_for(Endereco, 'before_update')
+def _sync_endereco_hash(mapper, connection, target):
+    target.endereco_hash = Endereco.hash_for({column: getattr(target, column) for column in ('cep', 'rua', 'bairro', 'cidade', 'estado', 'pais')})
\ No newline at end of file
@@ -1,6 +1,8 @@
+from sqlalchemy import event
 from .base import BaseModel
 from .endereco import Endereco
 from db import db
+from normalizer import normalize_text
 
 
 class Pet(BaseModel):
@@ -13,6 +15,7 @@ class Pet(BaseModel):
     
     tipo = db.Column(db.Enum(*TIPOS, name='pet_tipo'), nullable=False)
     foto = db.Column(db.Text, nullable=True)
+    foto_hash = db.Column(db.String(64), nullable=True)
     nome = db.Column(db.String(100), nullable=False)
     idade = db.Column(db.Enum(*IDADES, name='pet_idade'), nullable=False)
     porte = db.Column(db.Enum(*PORTES, name='pet_porte'), nullable=False)
@@ -22,9 +25,34 @@ class Pet(BaseModel):
     descricao = db.Column(db.Text, nullable=False)
     observacoes = db.Column(db.Text, nullable=True)
     data_desaparecimento = db.Column(db.DateTime, nullable=False)
+    busca_normalizada = db.Column(db.Text, nullable=True)
     
     endereco_id = db.Column(db.Integer, db.ForeignKey('enderecos.id'), nullable=False)
-    endereco = db.relationship('Endereco', backref='pets', lazy=True)
+    # Um endereço só é apagado sem pets (``release_endereco``): não há filhos para carregar
+    endereco = db.relationship('Endereco', backref=db.backref('pets', passive_deletes=True), lazy=True)
+    
+    __table_args__ = (
+        db.Index('ix_pets_created_at_id', 'created_at', 'id'),
+        db.Index('ix_pets_tipo_created_at_id', 'tipo', 'created_at', 'id'),
+        db.Index('ix_pets_data_desaparecimento', 'data_desaparecimento'),
+        db.Index('ix_pets_tipo_data_desaparecimento', 'tipo', 'data_desaparecimento'),
+        db.Index('ix_pets_endereco_id', 'endereco_id'),
+        db.Index(
+            'ix_pets_busca_normalizada_trgm', 'busca_normalizada',
+            postgresql_using='gin',
+            postgresql_ops={'busca_normalizada': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+    )
+    
+    @staticmethod
+    def build_busca_normalizada(nome, raca, descricao):
+        return normalize_text(' '.join(value for value in (nome, raca, descricao) if value))
     
     def __repr__(self):
-        return f'<Pet {self.nome} - {self.tipo}>'
\ No newline at end of file
+        return f'<Pet {self.nome} - {self.tipo}>'
+
+
+@event.listens_for(Pet, 'before_insert')
+@event.listens_for(Pet, 'before_update')
+def _sync_busca_normalizada(mapper, connection, target):
+    target.busca_normalizada = Pet.build_busca_normalizada(target.nome, target.raca, target.descricao)
\ No newline at end of file
@@ -0,0 +1,20 @@
+from db import db
+
+
+class PetDailySummary(db.Model):
+    """Pets perdidos por dia, cidade e tipo, mantido pelo ``StatsService``."""
+    __tablename__ = 'pet_daily_summaries'
+    
+    dia = db.Column(db.Date, primary_key=True)
+    estado = db.Column(db.String(100), primary_key=True)
+    cidade_normalizada = db.Column(db.String(100), primary_key=True)
+    tipo = db.Column(db.String(20), primary_key=True)
+    cidade = db.Column(db.String(100), nullable=False)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        db.Index('ix_pet_daily_summaries_cidade_normalizada_dia', 'cidade_normalizada', 'dia'),
+    )
+    
+    def __repr__(self):
+        return f'<PetDailySummary {self.dia} {self.cidade}/{self.estado} {self.tipo}: {self.total}>'
\ No newline at end of file
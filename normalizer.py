@@ -0,0 +1,32 @@
+import hashlib
+import re
+import unicodedata
+from typing import Optional
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_NON_DIGITS_RE = re.compile(r'\D')
+
+
+def normalize_text(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    
+    decomposed = unicodedata.normalize('NFKD', value)
+    unaccented = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return _WHITESPACE_RE.sub(' ', unaccented).strip().lower()
+
+
+def prefix_upper_bound(prefix: str) -> str:
+    return prefix + '\uffff'
+
+
+def cep_digits(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    return _NON_DIGITS_RE.sub('', value)
+
+
+def address_hash(cep: Optional[str], rua: Optional[str], bairro: Optional[str], cidade: Optional[str], estado: Optional[str], pais: Optional[str]) -> str:
+    """SHA-256 do endereço normalizado: só os dígitos do CEP e o texto sem acentos, em minúsculas."""
+    parts = [cep_digits(cep) or ''] + [normalize_text(part) or '' for part in (rua, bairro, cidade, estado, pais)]
+    return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
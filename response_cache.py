@@ -0,0 +1,115 @@
+import hashlib
+import uuid
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+from typing import Optional
+from flask import Response, request
+from flask_restx.utils import unpack
+from cache import CacheBackend, TTLCache
+from db import replicas
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ResponseCache:
+    """Cache das respostas GET já serializadas, com ETag/Last-Modified e 304."""
+    
+    def __init__(self, namespace: str = 'pets', backend: Optional[CacheBackend] = None):
+        self.namespace = namespace
+        self.backend = backend or TTLCache(maxsize=1024, ttl=30)
+        self.enabled = True
+    
+    def init_app(self, app, backend: Optional[CacheBackend] = None):
+        self.enabled = app.config.get('RESPONSE_CACHE_ENABLED', True)
+        if backend is not None:
+            self.backend = backend
+        else:
+            self.backend = TTLCache(
+                maxsize=app.config.get('RESPONSE_CACHE_SIZE', 1024),
+                ttl=app.config.get('RESPONSE_CACHE_TTL', 30)
+            )
+    
+    @property
+    def _generation_key(self) -> str:
+        return f'{self.namespace}:generation'
+    
+    def generation(self) -> str:
+        return self._current_generation()[0]
+    
+    def changed_at(self) -> datetime:
+        return self._current_generation()[1]
+    
+    def invalidate(self):
+        previous = self.backend.get(self._generation_key)
+        self._new_generation(previous[1] if previous is not None else None)
+    
+    def _current_generation(self) -> tuple:
+        generation = self.backend.get(self._generation_key)
+        if generation is None:
+            generation = self._new_generation()
+        return generation
+    
+    def _new_generation(self, previous_changed_at: Optional[datetime] = None) -> tuple:
+        # Last-Modified tem resolução de segundos: uma escrita no mesmo segundo
+        # da geração anterior ainda precisa invalidar o If-Modified-Since
+        changed_at = datetime.now(timezone.utc).replace(microsecond=0)
+        if previous_changed_at is not None and changed_at <= previous_changed_at:
+            changed_at = previous_changed_at + timedelta(seconds=1)
+        generation = (uuid.uuid4().hex, changed_at)
+        self.backend.set(self._generation_key, generation, ttl=float('inf'))
+        return generation
+    
+    def make_key(self) -> str:
+        args = '&'.join(f'{name}={value}' for name, value in sorted(request.args.items(multi=True)))
+        mask = request.headers.get('X-Fields', '')
+        return f'{self.namespace}:{self.generation()}:{request.path}?{args}#{mask}'
+    
+    def cached(self, func):
+        @wraps(func)
+        def wrapper(resource, *args, **kwargs):
+            if not self.enabled or request.method != 'GET':
+                return func(resource, *args, **kwargs)
+            
+            key = self.make_key()
+            entry = None if replicas.is_sticky() else self.backend.get(key)
+            if entry is None:
+                data, code, headers = unpack(func(resource, *args, **kwargs))
+                response = resource.api.make_response(data, code, headers=headers)
+                if code != 200:
+                    return response
+                entry = self.store(key, data, response)
+            
+            return self.conditional_response(entry)
+        
+        return wrapper
+    
+    def store(self, key: str, data, response: Response) -> dict:
+        entry = {
+            'body': response.get_data(),
+            'mimetype': response.mimetype,
+            'etag': hashlib.sha1(response.get_data()).hexdigest(),
+            'last_modified': _last_modified(data) or self.changed_at()
+        }
+        self.backend.set(key, entry)
+        return entry
+    
+    def conditional_response(self, entry: dict) -> Response:
+        response = Response(entry['body'], status=200, mimetype=entry['mimetype'])
+        response.set_etag(entry['etag'])
+        if entry['last_modified'] is not None:
+            response.last_modified = entry['last_modified']
+        response.cache_control.public = True
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+
+def _last_modified(data) -> Optional[datetime]:
+    # Só o detalhe usa o ``updated_at``: remoções e pets que saem de uma página
+    # filtrada não alteram o ``updated_at`` dos itens que continuam na lista
+    item = data.get('data') if isinstance(data, dict) else None
+    updated_at = item.get('updated_at') if isinstance(item, dict) else None
+    return datetime.fromisoformat(updated_at) if updated_at else None
+
+
+response_cache = ResponseCache()
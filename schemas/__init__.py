@@ -1,9 +1,13 @@
 from .endereco import EnderecoSchema, endereco_schema, enderecos_schema
-from .pet import PetSchema, PetCreateSchema, PetUpdateSchema, pet_schema, pets_schema, pet_create_schema, pet_update_schema
+from .pet import PetSchema, PetCreateSchema, PetUpdateSchema, pet_schema, pets_schema, pet_create_schema, pets_create_schema, pet_update_schema, pet_create_validator, pet_update_validator
+from .serializer import PetSerializer, compiled_serializer
+from .validator import SpecValidator
 from .error import ErrorSchema, ValidationErrorSchema, error_schema, validation_error_schema
 
 __all__ = [
     'EnderecoSchema', 'endereco_schema', 'enderecos_schema',
-    'PetSchema', 'PetCreateSchema', 'PetUpdateSchema', 'pet_schema', 'pets_schema', 'pet_create_schema', 'pet_update_schema',
+    'PetSchema', 'PetCreateSchema', 'PetUpdateSchema', 'pet_schema', 'pets_schema', 'pet_create_schema', 'pets_create_schema', 'pet_update_schema',
+    'pet_create_validator', 'pet_update_validator',
+    'PetSerializer', 'compiled_serializer', 'SpecValidator',
     'ErrorSchema', 'ValidationErrorSchema', 'error_schema', 'validation_error_schema'
 ]
\ No newline at end of file
@@ -0,0 +1,55 @@
+from collections import namedtuple
+from typing import Optional
+from .spec import PET_SPEC, ENDERECO_SPEC, field_names
+
+PET_FIELDS = field_names(PET_SPEC)
+ENDERECO_FIELDS = field_names(ENDERECO_SPEC)
+ENDERECO_SHORTCUTS = ('cep', 'rua', 'bairro', 'cidade', 'estado', 'pais')
+
+Projection = namedtuple('Projection', ['pet_fields', 'endereco_fields'])
+
+
+def parse_projection(fields_param: Optional[str], include_param: Optional[str] = None) -> Optional[Projection]:
+    """Converte ``?fields=`` e ``?include=`` em uma projeção (``None`` sem ``fields``)."""
+    if not fields_param:
+        return None
+    
+    includes = {name.strip() for name in (include_param or '').split(',') if name.strip()}
+    unknown_includes = includes - {'endereco'}
+    if unknown_includes:
+        raise ValueError(f"Include inválido: {', '.join(sorted(unknown_includes))}")
+    
+    pet_fields = set()
+    endereco_fields = set(ENDERECO_FIELDS) if 'endereco' in includes else set()
+    for name in (name.strip() for name in fields_param.split(',')):
+        if not name:
+            continue
+        if name == 'endereco':
+            endereco_fields.update(ENDERECO_FIELDS)
+            pet_fields.add('endereco')
+        elif name.startswith('endereco.') and name[len('endereco.'):] in ENDERECO_FIELDS:
+            endereco_fields.add(name[len('endereco.'):])
+        elif name in PET_FIELDS:
+            pet_fields.add(name)
+        elif name in ENDERECO_SHORTCUTS:
+            endereco_fields.add(name)
+        else:
+            raise ValueError(f"Campo inválido: {name}")
+    
+    if endereco_fields:
+        pet_fields.add('endereco')
+    if not pet_fields:
+        raise ValueError("Nenhum campo selecionado")
+    
+    return Projection(
+        tuple(field for field in PET_FIELDS if field in pet_fields),
+        tuple(field for field in ENDERECO_FIELDS if field in endereco_fields)
+    )
+
+
+def projection_mask(projection: Projection) -> str:
+    fields = [
+        'endereco{' + ','.join(projection.endereco_fields) + '}' if field == 'endereco' else field
+        for field in projection.pet_fields
+    ]
+    return '{' + ','.join(fields) + '}'
@@ -0,0 +1,87 @@
+from functools import lru_cache
+from typing import Optional
+from services.foto_service import FotoService
+from .projection import PET_FIELDS, ENDERECO_FIELDS, Projection
+from .spec import PET_SPEC, ENDERECO_SPEC, DATETIME
+
+PET_DATETIME_FIELDS = tuple(spec.name for spec in PET_SPEC if spec.kind == DATETIME)
+ENDERECO_DATETIME_FIELDS = tuple(spec.name for spec in ENDERECO_SPEC if spec.kind == DATETIME)
+
+# Padrões declarados nos modelos do Swagger: o marshal do restx os usa quando o valor é nulo.
+ENDERECO_MODEL_DEFAULTS = {spec.name: spec.default for spec in ENDERECO_SPEC if spec.default is not None}
+
+
+def _isoformat(value):
+    return None if value is None else value.isoformat()
+
+
+class PetSerializer:
+    """Serializador de ``Pet``/``Endereco`` gerado por projeção, com a mesma saída dos schemas."""
+    
+    def __init__(self, projection: Optional[Projection] = None, foto_size: Optional[int] = None, many: bool = False, marshalled: bool = False):
+        self.projection = projection
+        self.foto_size = foto_size
+        self.many = many
+        self.marshalled = marshalled
+        self.source = self._source()
+        
+        namespace = {'isoformat': _isoformat, 'foto_url': FotoService.foto_url}
+        exec(compile(self.source, f'<PetSerializer {projection}>', 'exec'), namespace)
+        self.serialize = namespace['serialize']
+    
+    def dump(self, obj):
+        if self.many:
+            return list(map(self.serialize, obj))
+        return self.serialize(obj)
+    
+    def _source(self) -> str:
+        pet_fields = PET_FIELDS if self.projection is None else self.projection.pet_fields
+        endereco_fields = ENDERECO_FIELDS if self.projection is None else self.projection.endereco_fields
+        if self.projection is not None and not self.marshalled and 'endereco' in pet_fields:
+            # Como o ``PetSchema`` com ``only``, que serializa o aninhado por último
+            pet_fields = tuple(field for field in pet_fields if field != 'endereco') + ('endereco',)
+        
+        entries = []
+        for field in pet_fields:
+            if field == 'endereco_id':
+                # load_only no schema: nunca é serializado, e o marshal o completa com nulo
+                if self.marshalled:
+                    entries.append("'endereco_id': None")
+            elif field == 'foto':
+                entries.append(f"'foto': foto_url(pet.foto_hash, {self.foto_size!r}) if pet.foto_hash else pet.foto")
+            elif field == 'endereco':
+                entries.append(f"'endereco': {self._endereco_source(endereco_fields)}")
+            elif field in PET_DATETIME_FIELDS:
+                entries.append(f"'{field}': isoformat(pet.{field})")
+            else:
+                entries.append(f"'{field}': pet.{field}")
+        
+        lines = ['def serialize(pet):']
+        if 'endereco' in pet_fields:
+            lines.append('    endereco = pet.endereco')
+        lines.append('    return {')
+        lines.extend(f'        {entry},' for entry in entries)
+        lines.append('    }')
+        return '\n'.join(lines) + '\n'
+    
+    def _endereco_source(self, endereco_fields) -> str:
+        entries = []
+        for field in endereco_fields:
+            if field in ENDERECO_DATETIME_FIELDS:
+                value = f'isoformat(endereco.{field})'
+            else:
+                value = f'endereco.{field}'
+            if self.marshalled and field in ENDERECO_MODEL_DEFAULTS:
+                value = f'{value} if endereco.{field} is not None else {ENDERECO_MODEL_DEFAULTS[field]!r}'
+            entries.append(f"'{field}': {value}")
+        present = '{' + ', '.join(entries) + '}'
+        
+        if not self.marshalled:
+            return f'None if endereco is None else {present}'
+        missing = {field: ENDERECO_MODEL_DEFAULTS.get(field) for field in endereco_fields}
+        return f'{missing!r} if endereco is None else {present}'
+
+
+@lru_cache(maxsize=128)
+def compiled_serializer(projection: Optional[Projection], many: bool, foto_size: Optional[int] = None, marshalled: bool = False) -> PetSerializer:
+    return PetSerializer(projection, foto_size, many, marshalled)
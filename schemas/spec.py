@@ -0,0 +1,173 @@
+from collections import namedtuple
+from flask_restx import fields as model_fields
+from marshmallow import fields as schema_fields, validate
+from models.pet import Pet
+
+DUMP = 'dump'
+CREATE = 'create'
+UPDATE = 'update'
+ALL_MODES = frozenset({DUMP, CREATE, UPDATE})
+
+STRING = 'string'
+INTEGER = 'integer'
+FLOAT = 'float'
+DATETIME = 'datetime'
+NESTED = 'nested'
+
+FieldSpec = namedtuple('FieldSpec', [
+    'name', 'kind', 'description', 'example', 'required', 'choices', 'min_length', 'max_length',
+    'default', 'nullable', 'readonly', 'load_only', 'serialize', 'modes', 'docs', 'pattern', 'pattern_error'
+], defaults=(None, None, None, None, None, None, False, False, False, None, ALL_MODES, None, None, None))
+FieldSpec.__doc__ = """Definição de um campo, de onde saem os schemas, os modelos do Swagger e o validador; ``modes`` diz em quais representações ele aparece."""
+
+ENDERECO_SPEC = (
+    FieldSpec('id', INTEGER, 'ID único do endereço', readonly=True, modes={DUMP}),
+    FieldSpec(
+        'cep', STRING, 'CEP', '01310100', required='CEP é obrigatório',
+        pattern=r'^\d{5}-?\d{3}$', pattern_error='CEP deve ter 8 dígitos (com ou sem hífen)'
+    ),
+    FieldSpec('rua', STRING, 'Rua e número', 'Rua das Flores, 123', required='Rua é obrigatória', min_length=1, max_length=255),
+    FieldSpec('bairro', STRING, 'Bairro', 'Centro', required='Bairro é obrigatório', min_length=1, max_length=100),
+    FieldSpec(
+        'cidade', STRING, 'Cidade', 'São Paulo', min_length=1, max_length=100,
+        docs={CREATE: 'Cidade (preenchida e padronizada pelo CEP quando ele está na base)'}
+    ),
+    FieldSpec(
+        'estado', STRING, 'Estado', 'SP', min_length=1, max_length=100,
+        docs={CREATE: 'Estado (preenchido e padronizado pelo CEP quando ele está na base)'}
+    ),
+    FieldSpec('pais', STRING, 'País', 'Brasil', min_length=1, max_length=100, default='Brasil'),
+    FieldSpec('latitude', FLOAT, 'Latitude aproximada, obtida do CEP', -23.5505, readonly=True, modes={DUMP}),
+    FieldSpec('longitude', FLOAT, 'Longitude aproximada, obtida do CEP', -46.6333, readonly=True, modes={DUMP}),
+    FieldSpec('created_at', DATETIME, 'Data de criação', readonly=True, modes={DUMP}),
+    FieldSpec('updated_at', DATETIME, 'Data de atualização', readonly=True, modes={DUMP}),
+)
+
+PET_SPEC = (
+    FieldSpec('id', INTEGER, 'ID único do pet', readonly=True, modes={DUMP}),
+    FieldSpec('tipo', STRING, 'Tipo do pet', 'Cachorro', required='Tipo é obrigatório', choices=Pet.TIPOS),
+    FieldSpec(
+        'foto', STRING, 'URL da foto ou base64', 'https://placehold.co/220x220?text=Pré-visualização',
+        nullable=True, serialize='get_foto',
+        docs={DUMP: 'URL da foto (fotos enviadas em base64 são servidas por /api/fotos/{hash})'}
+    ),
+    FieldSpec('nome', STRING, 'Nome do pet', 'Rex', required='Nome é obrigatório', min_length=1, max_length=100),
+    FieldSpec('idade', STRING, 'Idade do pet', 'Adulto', required='Idade é obrigatória', choices=Pet.IDADES),
+    FieldSpec('porte', STRING, 'Porte do pet', 'Grande', required='Porte é obrigatório', choices=Pet.PORTES),
+    FieldSpec('raca', STRING, 'Raça do pet', 'Pastor Alemão', required='Raça é obrigatória', min_length=1, max_length=100),
+    FieldSpec(
+        'info_contato', STRING, 'Informações de contato', 'João Silva - (11) 99999-9999',
+        required='Informações de contato são obrigatórias', min_length=1
+    ),
+    FieldSpec('sexo', STRING, 'Sexo do pet', 'Macho', required='Sexo é obrigatório', choices=Pet.SEXOS),
+    FieldSpec(
+        'descricao', STRING, 'Descrição do pet', 'Cachorro muito dócil, pelagem marrom',
+        required='Descrição é obrigatória', min_length=1
+    ),
+    FieldSpec('observacoes', STRING, 'Observações adicionais', 'Tem uma cicatriz na pata esquerda', nullable=True),
+    FieldSpec(
+        'data_desaparecimento', DATETIME, 'Data do desaparecimento', '2024-01-15T10:30:00',
+        required='Data de desaparecimento é obrigatória'
+    ),
+    FieldSpec('endereco_id', INTEGER, 'ID do endereço de desaparecimento', load_only=True, modes={DUMP, UPDATE}),
+    FieldSpec('endereco', NESTED, 'Endereço onde o pet desapareceu', readonly=True, modes={DUMP}),
+    FieldSpec(
+        'endereco_desaparecimento', NESTED, 'Endereço onde o pet desapareceu',
+        required='Endereço de desaparecimento é obrigatório', modes={CREATE, UPDATE},
+        docs={UPDATE: 'Endereço onde o pet desapareceu (atualiza ou cria novo)'}
+    ),
+    FieldSpec('created_at', DATETIME, 'Data de criação', readonly=True, modes={DUMP}),
+    FieldSpec('updated_at', DATETIME, 'Data de atualização', readonly=True, modes={DUMP}),
+)
+
+_SCHEMA_FIELDS = {
+    STRING: schema_fields.String,
+    INTEGER: schema_fields.Integer,
+    FLOAT: schema_fields.Float,
+    DATETIME: schema_fields.DateTime,
+}
+_MODEL_FIELDS = {
+    STRING: model_fields.String,
+    INTEGER: model_fields.Integer,
+    FLOAT: model_fields.Float,
+    DATETIME: model_fields.DateTime,
+}
+
+
+def field_names(specs, mode: str = DUMP) -> tuple:
+    return tuple(spec.name for spec in specs if mode in spec.modes)
+
+
+def load_specs(specs, mode: str) -> tuple:
+    """Campos aceitos na entrada do modo (os ``readonly`` são só de saída)."""
+    return tuple(spec for spec in specs if mode in spec.modes and not spec.readonly)
+
+
+def build_schema_fields(specs, mode: str, nested=None) -> dict:
+    """Campos marshmallow do modo, na ordem da definição; ``nested`` é o schema dos campos aninhados."""
+    declared = {}
+    for spec in specs:
+        if mode not in spec.modes:
+            continue
+        
+        kwargs = {}
+        if mode == DUMP and spec.readonly:
+            kwargs['dump_only'] = True
+        if mode == DUMP and spec.load_only:
+            kwargs['load_only'] = True
+        if spec.required and mode != UPDATE:
+            kwargs['required'] = True
+            kwargs['error_messages'] = {'required': spec.required}
+        validators = []
+        if spec.choices:
+            validators.append(validate.OneOf(spec.choices))
+        elif spec.min_length is not None or spec.max_length is not None:
+            validators.append(validate.Length(min=spec.min_length, max=spec.max_length))
+        if spec.pattern:
+            validators.append(validate.Regexp(spec.pattern, error=spec.pattern_error))
+        if validators:
+            kwargs['validate'] = validators[0] if len(validators) == 1 else validators
+        if spec.nullable or mode == UPDATE:
+            kwargs['allow_none'] = True
+        if spec.default is not None:
+            kwargs['load_default'] = spec.default
+        
+        if mode == DUMP and spec.serialize:
+            declared[spec.name] = schema_fields.Method(spec.serialize, allow_none=True)
+        elif spec.kind == NESTED:
+            declared[spec.name] = schema_fields.Nested(nested, **kwargs)
+        else:
+            declared[spec.name] = _SCHEMA_FIELDS[spec.kind](**kwargs)
+    return declared
+
+
+def build_model_fields(specs, mode: str, nested=None) -> dict:
+    """Campos do modelo Flask-RESTX do modo; ``nested`` é o modelo dos campos aninhados."""
+    declared = {}
+    for spec in specs:
+        if mode not in spec.modes:
+            continue
+        
+        kwargs = {'description': (spec.docs or {}).get(mode, spec.description)}
+        if spec.required and mode != UPDATE:
+            kwargs['required'] = True
+        if spec.readonly:
+            kwargs['readonly'] = True
+        if spec.example is not None:
+            kwargs['example'] = spec.example
+        if spec.choices:
+            kwargs['enum'] = list(spec.choices)
+        if spec.min_length is not None:
+            kwargs['min_length'] = spec.min_length
+        if spec.max_length is not None:
+            kwargs['max_length'] = spec.max_length
+        if spec.pattern:
+            kwargs['pattern'] = spec.pattern
+        if spec.default is not None:
+            kwargs['default'] = spec.default
+        
+        if spec.kind == NESTED:
+            declared[spec.name] = model_fields.Nested(nested, **kwargs)
+        else:
+            declared[spec.name] = _MODEL_FIELDS[spec.kind](**kwargs)
+    return declared
@@ -0,0 +1,120 @@
+import re
+from marshmallow import Schema, ValidationError, fields
+from .spec import UPDATE, STRING, INTEGER, DATETIME, NESTED, load_specs
+
+_from_iso_datetime = fields.DateTime.DESERIALIZATION_FUNCS['iso']
+
+MISSING = object()
+INVALID = object()
+
+
+def _parse_datetime(value):
+    if type(value) is not str or not value:
+        return INVALID
+    try:
+        return _from_iso_datetime(value)
+    except (TypeError, AttributeError, ValueError):
+        return INVALID
+
+
+def _check_integer(value):
+    return value if type(value) is int else INVALID
+
+
+def _string_check(spec):
+    # Como no schema: ``OneOf`` ou ``Length``, mais o ``Regexp`` quando houver
+    if spec.choices:
+        choices = frozenset(spec.choices)
+        check = lambda value: value if type(value) is str and value in choices else INVALID
+    else:
+        min_length = spec.min_length or 0
+        max_length = spec.max_length if spec.max_length is not None else float('inf')
+        check = lambda value: value if type(value) is str and min_length <= len(value) <= max_length else INVALID
+    if not spec.pattern:
+        return check
+    
+    match = re.compile(spec.pattern).match
+    return lambda value: value if check(value) is not INVALID and match(value) is not None else INVALID
+
+
+def _record_check(specs, partial: bool, allow_none: bool, nested=None):
+    """Confere um dicionário campo a campo; devolve os dados carregados ou ``INVALID``."""
+    keys = frozenset(spec.name for spec in specs)
+    checks = []
+    for spec in specs:
+        if spec.kind == STRING:
+            check = _string_check(spec)
+        elif spec.kind == INTEGER:
+            check = _check_integer
+        elif spec.kind == DATETIME:
+            check = _parse_datetime
+        else:
+            check = nested
+        required = bool(spec.required) and not partial
+        default = MISSING if partial or spec.default is None else spec.default
+        checks.append((spec.name, required, default, bool(spec.nullable) or allow_none, check))
+    
+    def record_check(data):
+        if type(data) is not dict or not keys.issuperset(data):
+            return INVALID
+        
+        loaded = {}
+        for name, required, default, nullable, check in checks:
+            value = data.get(name, MISSING)
+            if value is MISSING:
+                if required:
+                    return INVALID
+                if default is not MISSING:
+                    loaded[name] = default
+            elif value is None:
+                if not nullable:
+                    return INVALID
+                loaded[name] = None
+            else:
+                value = check(value)
+                if value is INVALID:
+                    return INVALID
+                loaded[name] = value
+        return loaded
+    
+    return record_check
+
+
+class SpecValidator:
+    """Validação rápida da entrada de um schema de escrita, com o schema como fallback para os erros."""
+    
+    def __init__(self, schema: Schema, specs, mode: str, nested_specs=()):
+        self.schema = schema
+        self.partial = mode == UPDATE
+        # Com ``partial`` o endereço aninhado também aceita campos ausentes, mas não nulos
+        nested = _record_check(load_specs(nested_specs, mode), self.partial, allow_none=False)
+        self.check = _record_check(load_specs(specs, mode), self.partial, allow_none=self.partial, nested=nested)
+    
+    def load(self, data, many: bool = False):
+        """Mesmo contrato do ``Schema.load``: devolve os dados ou levanta ``ValidationError``."""
+        if many:
+            return self._load_many(data)
+        
+        loaded = self.check(data)
+        if loaded is INVALID:
+            return self.schema.load(data, partial=self.partial)
+        return loaded
+    
+    def _load_many(self, data) -> list:
+        if type(data) is not list:
+            return self.schema.load(data, many=True, partial=self.partial)
+        
+        loaded, errors = [], {}
+        for index, record in enumerate(data):
+            result = self.check(record)
+            if result is INVALID:
+                try:
+                    result = self.schema.load(record, partial=self.partial)
+                except ValidationError as e:
+                    errors[index] = e.messages
+                    result = e.valid_data
+            loaded.append(result)
+        
+        if errors:
+            raise ValidationError(errors, valid_data=loaded)
+        return loaded
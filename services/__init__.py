@@ -1,4 +1,13 @@
 from .endereco_service import EnderecoService
-from .pet_service import PetService
+from .search_service import SearchService
+from .geo_service import GeoService
+from .foto_service import FotoService
+from .thumbnail_service import ThumbnailService
+from .pet_service import PetService, encode_cursor, decode_cursor
+from .facet_service import FacetService
+from .stats_service import StatsService
+from .match_service import MatchService
+from .import_service import ImportService
+from .export_service import ExportService
 
-__all__ = ['EnderecoService', 'PetService']
+__all__ = ['EnderecoService', 'SearchService', 'GeoService', 'FotoService', 'ThumbnailService', 'PetService', 'FacetService', 'StatsService', 'MatchService', 'ImportService', 'ExportService', 'encode_cursor', 'decode_cursor']
@@ -0,0 +1,53 @@
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import Pet
+from services.pet_service import PetService
+from logger import SAMPLED, get_logger
+
+logger = get_logger(__name__)
+
+
+class AsyncPetService:
+    """Leituras de ``PetService`` sobre uma ``AsyncSession`` (usadas pelo ponto de entrada ASGI)."""
+    
+    @staticmethod
+    async def get_pet_by_id(session: AsyncSession, pet_id: int, projection=None) -> Optional[Pet]:
+        try:
+            pet = await session.get(Pet, pet_id, options=PetService._load_options(projection))
+            if pet:
+                logger.info("Pet found with ID: %s", pet_id, extra=SAMPLED)
+            else:
+                logger.warning("Pet not found with ID: %s", pet_id)
+            return pet
+        except Exception as e:
+            logger.error("Error getting pet by ID %s: %s", pet_id, e)
+            raise
+    
+    @staticmethod
+    async def search_pets_with_filters(session: AsyncSession, filters: dict, page_number: int = 1, page_size: int = 20, count_mode: str = 'exact', projection=None) -> tuple[List[Pet], Optional[int], bool]:
+        try:
+            statement = select(Pet).options(*PetService._load_options(projection))
+            statement = PetService._apply_filters(statement, filters, ranked=True)
+            statement = statement.order_by(Pet.created_at.desc(), Pet.id.desc())
+            
+            total_count, lower_bound = await AsyncPetService._count(session, statement, filters, count_mode)
+            
+            offset = (page_number - 1) * page_size
+            pets = list((await session.scalars(statement.offset(offset).limit(page_size))).all())
+            
+            filter_str = PetService._describe_filters(filters)
+            logger.info("Found %s pets with filters (%s) (page %s, total: %s)", len(pets), filter_str, page_number, total_count, extra=SAMPLED)
+            return pets, total_count, lower_bound
+        except Exception as e:
+            logger.error("Error searching pets with filters: %s", e)
+            raise
+    
+    @staticmethod
+    async def _count(session: AsyncSession, statement, filters: dict, count_mode: str = 'exact') -> tuple[Optional[int], bool]:
+        cached = PetService._cached_count(filters, count_mode)
+        if cached is not None or count_mode == 'none':
+            return cached, False
+        
+        total_count = await session.scalar(PetService._count_statement(statement, filters, count_mode)) or 0
+        return PetService._counted(total_count, filters, count_mode)
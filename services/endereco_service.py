@@ -1,6 +1,9 @@
 from typing import List, Optional
-from models import Endereco
-from db import db
+from sqlalchemy.exc import IntegrityError
+from models import Pet, Endereco
+from db import db, lock_for_write, unit_of_work
+from cep_index import default_index
+from normalizer import cep_digits, normalize_text, prefix_upper_bound
 from logger import get_logger
 
 logger = get_logger(__name__)
@@ -9,63 +12,124 @@ logger = get_logger(__name__)
 class EnderecoService:
     
     @staticmethod
-    def create_endereco(endereco_data: dict) -> Endereco:
+    def resolve_cep(cep: str) -> Optional[dict]:
+        """Cidade, estado e coordenadas do CEP pela base local de faixas (``None`` se não estiver nela)."""
+        faixa = default_index().lookup(cep)
+        if faixa is None:
+            return None
+        return {
+            'cep': cep_digits(cep),
+            'cidade': faixa.cidade,
+            'estado': faixa.estado,
+            'latitude': faixa.latitude,
+            'longitude': faixa.longitude
+        }
+    
+    @staticmethod
+    def complete_endereco(endereco_data: dict) -> dict:
+        """Preenche e canoniza o endereço pelo CEP; fora da base, exige cidade e estado."""
+        endereco_data = dict(endereco_data)
+        resolved = EnderecoService.resolve_cep(endereco_data.get('cep'))
+        if resolved is not None:
+            endereco_data.update(cep=resolved['cep'], cidade=resolved['cidade'], estado=resolved['estado'])
+            return endereco_data
+        
+        missing = [field for field in ('cidade', 'estado') if not endereco_data.get(field)]
+        if missing:
+            raise ValueError(f"CEP {endereco_data.get('cep')} não encontrado; informe {' e '.join(missing)}")
+        return endereco_data
+    
+    @staticmethod
+    def cidade_conditions(column, cidade: str) -> tuple:
+        """Filtro de cidade: igualdade para nomes da base de CEPs, prefixo para os demais."""
+        cidade = normalize_text(cidade)
+        if default_index().is_cidade(cidade):
+            return (column == cidade,)
+        return column >= cidade, column < prefix_upper_bound(cidade)
+    
+    @staticmethod
+    def get_or_create_endereco(endereco_data: dict) -> Endereco:
+        """Devolve o endereço com o mesmo hash normalizado, travado até o commit, ou cria um novo."""
+        endereco_hash = Endereco.hash_for(endereco_data)
         try:
-            endereco = Endereco(**endereco_data)
-            endereco.save()
-            logger.info(f"Endereco created with ID: {endereco.id}")
+            with unit_of_work() as session:
+                serialized = lock_for_write(session)
+                endereco = EnderecoService._find_by_hash(session, endereco_hash)
+                if endereco is None and serialized:
+                    endereco = Endereco(**endereco_data)
+                    session.add(endereco)
+                    logger.info("Endereco created for CEP: %s", endereco.cep)
+                elif endereco is None:
+                    try:
+                        with session.begin_nested():
+                            endereco = Endereco(**endereco_data)
+                            session.add(endereco)
+                        logger.info("Endereco created for CEP: %s", endereco.cep)
+                    except IntegrityError:
+                        endereco = EnderecoService._find_by_hash(session, endereco_hash)
+                        if endereco is None:
+                            raise
             return endereco
         except Exception as e:
-            logger.error(f"Error creating endereco: {str(e)}")
-            db.session.rollback()
+            logger.error("Error getting or creating endereco: %s", e)
             raise
     
+    @staticmethod
+    def get_or_create_enderecos(enderecos_data: List[dict]) -> List[Endereco]:
+        """Versão em lote de ``get_or_create_endereco``: uma busca pelos hashes do lote inteiro."""
+        hashes = [Endereco.hash_for(endereco_data) for endereco_data in enderecos_data]
+        with unit_of_work() as session:
+            lock_for_write(session)
+            statement = db.select(Endereco).where(Endereco.endereco_hash.in_(set(hashes))).with_for_update()
+            enderecos = {endereco.endereco_hash: endereco for endereco in session.scalars(statement)}
+            for endereco_hash, endereco_data in zip(hashes, enderecos_data):
+                if endereco_hash not in enderecos:
+                    enderecos[endereco_hash] = Endereco(**endereco_data)
+                    session.add(enderecos[endereco_hash])
+        return [enderecos[endereco_hash] for endereco_hash in hashes]
+    
+    @staticmethod
+    def _find_by_hash(session, endereco_hash: str) -> Optional[Endereco]:
+        statement = db.select(Endereco).where(Endereco.endereco_hash == endereco_hash).with_for_update()
+        return session.scalars(statement).first()
+    
+    @staticmethod
+    def endereco_data(endereco: Endereco) -> dict:
+        return {column: getattr(endereco, column) for column in ('cep', 'rua', 'bairro', 'cidade', 'estado', 'pais')}
+    
     @staticmethod
     def get_endereco_by_id(endereco_id: int) -> Optional[Endereco]:
         try:
-            endereco = Endereco.query.get(endereco_id)
+            endereco = db.session.get(Endereco, endereco_id)
             if endereco:
-                logger.info(f"Endereco found with ID: {endereco_id}")
+                logger.info("Endereco found with ID: %s", endereco_id)
             else:
-                logger.warning(f"Endereco not found with ID: {endereco_id}")
+                logger.warning("Endereco not found with ID: %s", endereco_id)
             return endereco
         except Exception as e:
-            logger.error(f"Error getting endereco by ID {endereco_id}: {str(e)}")
+            logger.error("Error getting endereco by ID %s: %s", endereco_id, e)
             raise
     
     @staticmethod
-    def update_endereco(endereco_id: int, endereco_data: dict) -> Optional[Endereco]:
+    def release_endereco(endereco_id: int) -> bool:
+        """Apaga o endereço se nenhum pet o referencia mais; devolve ``True`` se apagou."""
         try:
-            endereco = Endereco.query.get(endereco_id)
-            if not endereco:
-                logger.warning(f"Endereco not found for update with ID: {endereco_id}")
-                return None
-            
-            for key, value in endereco_data.items():
-                if hasattr(endereco, key):
-                    setattr(endereco, key, value)
-            
-            endereco.save()
-            logger.info(f"Endereco updated with ID: {endereco_id}")
-            return endereco
-        except Exception as e:
-            logger.error(f"Error updating endereco {endereco_id}: {str(e)}")
-            db.session.rollback()
-            raise
-
-    @staticmethod
-    def delete_endereco(endereco_id: int) -> bool:
-        try:
-            endereco = Endereco.query.get(endereco_id)
-            if not endereco:
-                logger.warning(f"Endereco not found for deletion with ID: {endereco_id}")
-                return False
-            
-            endereco.delete()
-            logger.info(f"Endereco deleted with ID: {endereco_id}")
+            with unit_of_work() as session:
+                lock_for_write(session)
+                session.flush()
+                locked = session.execute(
+                    db.select(Endereco.id).where(Endereco.id == endereco_id).with_for_update()
+                ).first()
+                if locked is None:
+                    logger.warning("Endereco not found for release with ID: %s", endereco_id)
+                    return False
+                
+                if session.query(Pet.id).filter(Pet.endereco_id == endereco_id).first() is not None:
+                    return False
+                
+                session.delete(session.get(Endereco, endereco_id))
+            logger.info("Endereco deleted with ID: %s", endereco_id)
             return True
         except Exception as e:
-            logger.error(f"Error deleting endereco {endereco_id}: {str(e)}")
-            db.session.rollback()
+            logger.error("Error releasing endereco %s: %s", endereco_id, e)
             raise
-    
@@ -0,0 +1,71 @@
+import csv
+import io
+import json
+import zlib
+from typing import Iterable, Iterator, List
+from models import Pet
+from services import PetService
+from db import db
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+EXPORT_FORMATS = ('ndjson', 'csv')
+EXPORT_BATCH_SIZE = 1000
+
+
+class ExportService:
+    """Exportação em streaming dos pets filtrados (``GET /api/pets/export``)."""
+    
+    @staticmethod
+    def iter_pets(filters: dict, projection=None, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[Pet]]:
+        """Gera os pets em lotes de ``batch_size`` lidos por um cursor do servidor."""
+        statement = db.select(Pet).options(*PetService._load_options(projection))
+        statement = PetService._apply_filters(statement, filters)
+        statement = statement.order_by(Pet.created_at.desc(), Pet.id.desc())
+        
+        total = 0
+        result = db.session.execute(statement.execution_options(yield_per=batch_size))
+        for pets in result.scalars().partitions():
+            total += len(pets)
+            yield pets
+        
+        filter_str = PetService._describe_filters(filters)
+        logger.info("Exported %s pets with filters (%s)", total, filter_str)
+    
+    @staticmethod
+    def ndjson(batches: Iterable[List[Pet]], schema) -> Iterator[bytes]:
+        for pets in batches:
+            yield ''.join(
+                json.dumps(item, ensure_ascii=False, separators=(',', ':')) + '\n'
+                for item in schema.dump(pets)
+            ).encode('utf-8')
+    
+    @staticmethod
+    def csv(batches: Iterable[List[Pet]], schema, columns: List[str]) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        
+        for pets in batches:
+            for item in schema.dump(pets):
+                endereco = item.get('endereco') or {}
+                writer.writerow([
+                    endereco.get(column[len('endereco.'):]) if column.startswith('endereco.') else item.get(column)
+                    for column in columns
+                ])
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+        
+        if buffer.tell():
+            yield buffer.getvalue().encode('utf-8')
+    
+    @staticmethod
+    def gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+        for chunk in chunks:
+            compressed = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
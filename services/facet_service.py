@@ -0,0 +1,101 @@
+from datetime import date, timedelta
+from sqlalchemy import func, literal, literal_column
+from models import Pet, Endereco
+from services.pet_service import PetService, count_cache
+from db import db
+from logger import SAMPLED, get_logger
+
+logger = get_logger(__name__)
+
+ENUM_FACETS = {
+    'tipo': Pet.TIPOS,
+    'porte': Pet.PORTES,
+    'idade': Pet.IDADES,
+    'sexo': Pet.SEXOS,
+}
+FACETS = tuple(ENUM_FACETS) + ('cidade', 'estado', 'semana')
+
+
+class FacetService:
+    """Contagens por faceta (``GET /api/pets/facets``) com os mesmos filtros da listagem."""
+    
+    @staticmethod
+    def get_facets(filters: dict) -> dict:
+        """Devolve ``total_count`` e, para cada faceta, a lista de ``{value, count}``."""
+        key = ('facets',) + PetService._count_key(filters)
+        facets = count_cache.get(key)
+        if facets is not None:
+            return facets
+        
+        try:
+            facets = FacetService._compute(filters)
+        except Exception as e:
+            logger.error("Error computing facets: %s", e)
+            raise
+        
+        count_cache.set(key, facets)
+        filter_str = PetService._describe_filters(filters)
+        logger.info("Computed facets for %s pets with filters (%s)", facets['total_count'], filter_str, extra=SAMPLED)
+        return facets
+    
+    @staticmethod
+    def _compute(filters: dict) -> dict:
+        """Todas as facetas em uma consulta: um ``GROUP BY`` por faceta unidos com ``UNION ALL``."""
+        statement = db.select(
+            Pet.id, Pet.tipo, Pet.porte, Pet.idade, Pet.sexo, Pet.data_desaparecimento, Pet.endereco_id
+        )
+        filtered = PetService._apply_filters(statement, filters).cte('filtered')
+        with_endereco = filtered.join(Endereco, Endereco.id == filtered.c.endereco_id)
+        week = FacetService._week_start(filtered.c.data_desaparecimento)
+        
+        branches = [db.select(literal('total'), literal(None, db.String), func.count()).select_from(filtered)]
+        branches.extend(
+            db.select(literal(name), db.cast(filtered.c[name], db.String), func.count()).group_by(filtered.c[name])
+            for name in ENUM_FACETS
+        )
+        branches.extend([
+            # Grafias da mesma cidade (com e sem acento) contam juntas; max() prefere a acentuada
+            db.select(literal('cidade'), func.max(Endereco.cidade), func.count())
+            .select_from(with_endereco).group_by(Endereco.cidade_normalizada),
+            db.select(literal('estado'), Endereco.estado, func.count())
+            .select_from(with_endereco).group_by(Endereco.estado),
+            db.select(literal('semana'), week, func.count()).group_by(week),
+        ])
+        rows = db.session.execute(db.union_all(*branches)).all()
+        
+        total_count = 0
+        counts = {name: {} for name in FACETS}
+        for facet, value, count in rows:
+            if facet == 'total':
+                total_count = count
+            elif facet == 'semana':
+                # Em bancos sem expressão de semana o valor vem por dia e é agrupado aqui
+                value = _monday(value)
+                counts['semana'][value] = counts['semana'].get(value, 0) + count
+            else:
+                counts[facet][value] = count
+        
+        facets = {'total_count': total_count}
+        for name, choices in ENUM_FACETS.items():
+            facets[name] = [{'value': value, 'count': counts[name].get(value, 0)} for value in choices]
+        for name in ('cidade', 'estado'):
+            ranked = sorted(counts[name].items(), key=lambda item: (-item[1], item[0]))
+            facets[name] = [{'value': value, 'count': count} for value, count in ranked]
+        facets['semana'] = [{'value': value, 'count': count} for value, count in sorted(counts['semana'].items())]
+        return facets
+    
+    @staticmethod
+    def _week_start(column):
+        """Segunda-feira da semana de ``column`` como texto ``AAAA-MM-DD`` (ou o dia, fora de SQLite/PostgreSQL)."""
+        # Constantes inline, para que o SELECT e o GROUP BY tenham a mesma expressão
+        dialect = db.engine.dialect.name
+        if dialect == 'sqlite':
+            return func.date(column, literal_column("'weekday 0'"), literal_column("'-6 days'"))
+        if dialect == 'postgresql':
+            return func.to_char(func.date_trunc(literal_column("'week'"), column), literal_column("'YYYY-MM-DD'"))
+        return db.cast(func.date(column), db.String)
+
+
+def _monday(value) -> str:
+    day = value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+    return (day - timedelta(days=day.weekday())).isoformat()
@@ -0,0 +1,78 @@
+import base64
+import binascii
+import hashlib
+import re
+from typing import Optional
+from flask import current_app
+from storage import PhotoStorage
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+FOTO_URL_PREFIX = '/api/fotos/'
+
+_DATA_URI_RE = re.compile(r'^data:(?P<mimetype>[\w.+-]+/[\w.+-]+)?(;[\w-]+=[\w-]+)*;base64,(?P<data>.*)$', re.DOTALL)
+_HASH_RE = re.compile(r'^[0-9a-f]{64}$')
+
+_MAGIC_NUMBERS = (
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+)
+
+
+class FotoService:
+    
+    @staticmethod
+    def storage() -> PhotoStorage:
+        return current_app.extensions['foto_storage']
+    
+    @staticmethod
+    def decode_foto(value: Optional[str]) -> Optional[bytes]:
+        if not value or value.startswith(('http://', 'https://', '/')):
+            return None
+        
+        match = _DATA_URI_RE.match(value)
+        encoded = match.group('data') if match else value
+        try:
+            data = base64.b64decode(''.join(encoded.split()), validate=True)
+        except (binascii.Error, ValueError):
+            if match:
+                raise ValueError("Foto em base64 inválida")
+            return None
+        
+        if not match and FotoService.guess_mimetype(data[:16]) == 'application/octet-stream':
+            return None
+        return data
+    
+    @staticmethod
+    def store_foto(value: Optional[str]) -> tuple[Optional[str], Optional[str]]:
+        """Retorna ``(foto, foto_hash)``: fotos em base64 vão para o storage e só o hash fica no pet."""
+        data = FotoService.decode_foto(value)
+        if data is None:
+            return value, None
+        
+        foto_hash = hashlib.sha256(data).hexdigest()
+        FotoService.storage().save(foto_hash, data)
+        logger.info("Foto stored with hash: %s (%s bytes)", foto_hash, len(data))
+        return None, foto_hash
+    
+    @staticmethod
+    def is_valid_hash(foto_hash: str) -> bool:
+        return bool(_HASH_RE.match(foto_hash))
+    
+    @staticmethod
+    def guess_mimetype(header: bytes) -> str:
+        for magic, mimetype in _MAGIC_NUMBERS:
+            if header.startswith(magic):
+                return mimetype
+        if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+            return 'image/webp'
+        return 'application/octet-stream'
+    
+    @staticmethod
+    def foto_url(foto_hash: str, size: Optional[int] = None) -> str:
+        if size:
+            return f'{FOTO_URL_PREFIX}{foto_hash}?size={size}'
+        return f'{FOTO_URL_PREFIX}{foto_hash}'
@@ -0,0 +1,166 @@
+import math
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from models import Endereco
+from db import db
+from logger import get_logger
+from cep_index import coordinates_for_cep
+
+logger = get_logger(__name__)
+
+RTREE_TABLE = 'enderecos_rtree'
+KM_PER_DEGREE = 111.32
+DEFAULT_RADIUS_KM = 10.0
+MAX_RADIUS_KM = 500.0
+
+_BBOX_PADDING = 1e-4
+
+
+class GeoService:
+    
+    @staticmethod
+    def backend() -> str:
+        if db.engine.dialect.name == 'sqlite':
+            return 'rtree'
+        return 'btree'
+    
+    @staticmethod
+    def bounding_box(latitude: float, longitude: float, radius_km: float) -> tuple[float, float, float, float]:
+        delta_lat = radius_km / KM_PER_DEGREE + _BBOX_PADDING
+        delta_lon = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01)) + _BBOX_PADDING
+        return latitude - delta_lat, latitude + delta_lat, longitude - delta_lon, longitude + delta_lon
+    
+    @staticmethod
+    def distance_squared(latitude: float, longitude: float):
+        """Distância ao quadrado (km²) até o ponto, pela projeção equiretangular."""
+        km_per_degree_lon = KM_PER_DEGREE * math.cos(math.radians(latitude))
+        delta_lat = (Endereco.latitude - latitude) * KM_PER_DEGREE
+        delta_lon = (Endereco.longitude - longitude) * km_per_degree_lon
+        return delta_lat * delta_lat + delta_lon * delta_lon
+    
+    @staticmethod
+    def within(base_query, latitude: float, longitude: float, radius_km: float):
+        """Restringe a consulta (já com ``Endereco`` no join) aos endereços dentro do raio."""
+        min_lat, max_lat, min_lon, max_lon = GeoService.bounding_box(latitude, longitude, radius_km)
+        
+        if GeoService.backend() == 'rtree':
+            rtree = db.table(
+                RTREE_TABLE,
+                db.column('id'), db.column('min_lat'), db.column('max_lat'), db.column('min_lon'), db.column('max_lon')
+            )
+            candidates = db.select(rtree.c.id).where(
+                rtree.c.max_lat >= min_lat,
+                rtree.c.min_lat <= max_lat,
+                rtree.c.max_lon >= min_lon,
+                rtree.c.min_lon <= max_lon
+            )
+            base_query = base_query.filter(Endereco.id.in_(candidates))
+        else:
+            base_query = base_query.filter(
+                Endereco.latitude.between(min_lat, max_lat),
+                Endereco.longitude.between(min_lon, max_lon)
+            )
+        
+        return base_query.filter(GeoService.distance_squared(latitude, longitude) <= radius_km * radius_km)
+    
+    @staticmethod
+    def rebuild_index(batch_size: int = 1000) -> int:
+        """Recalcula as coordenadas de todos os endereços a partir do CEP e refaz o índice espacial."""
+        try:
+            connection = db.session.connection()
+            enderecos = Endereco.__table__
+            
+            total = 0
+            last_id = 0
+            while True:
+                rows = connection.execute(
+                    db.select(enderecos.c.id, enderecos.c.cep)
+                    .where(enderecos.c.id > last_id)
+                    .order_by(enderecos.c.id)
+                    .limit(batch_size)
+                ).all()
+                if not rows:
+                    break
+                
+                params = []
+                for row in rows:
+                    latitude, longitude = coordinates_for_cep(row.cep)
+                    params.append({'endereco_id': row.id, 'latitude': latitude, 'longitude': longitude})
+                connection.execute(enderecos.update().where(enderecos.c.id == db.bindparam('endereco_id')), params)
+                total += len(rows)
+                last_id = rows[-1].id
+            
+            if GeoService.backend() == 'rtree':
+                if rtree_table_exists(connection):
+                    connection.exec_driver_sql(f'DELETE FROM {RTREE_TABLE}')
+                else:
+                    create_rtree_table(connection)
+                populate_rtree_table(connection, batch_size)
+            
+            db.session.commit()
+            logger.info("Spatial index rebuilt with %s enderecos", total)
+            return total
+        except Exception as e:
+            logger.error("Error rebuilding spatial index: %s", e)
+            db.session.rollback()
+            raise
+
+
+def rtree_table_exists(connection) -> bool:
+    return connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (RTREE_TABLE,)
+    ).first() is not None
+
+
+def create_rtree_table(connection):
+    connection.exec_driver_sql(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {RTREE_TABLE} USING rtree(id, min_lat, max_lat, min_lon, max_lon)"
+    )
+
+
+def populate_rtree_table(connection, batch_size: int = 1000):
+    last_id = 0
+    while True:
+        rows = connection.exec_driver_sql(
+            "SELECT id, latitude, longitude FROM enderecos WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, batch_size)
+        ).fetchall()
+        if not rows:
+            break
+        _insert_rtree_rows(connection, rows)
+        last_id = rows[-1][0]
+
+
+def _insert_rtree_rows(connection, rows):
+    params = [
+        (endereco_id, latitude, latitude, longitude, longitude)
+        for endereco_id, latitude, longitude in rows
+        if latitude is not None and longitude is not None
+    ]
+    if params:
+        connection.exec_driver_sql(
+            f"INSERT INTO {RTREE_TABLE} (id, min_lat, max_lat, min_lon, max_lon) VALUES (?, ?, ?, ?, ?)",
+            params
+        )
+
+
+@event.listens_for(Session, 'after_flush')
+def _sync_spatial_index(session, flush_context):
+    connection = session.connection()
+    if connection.dialect.name != 'sqlite':
+        return
+    
+    changed = [
+        obj for obj in list(session.new) + list(session.dirty)
+        if isinstance(obj, Endereco) and (
+            obj in session.new
+            or any(inspect(obj).attrs[column].history.has_changes() for column in ('latitude', 'longitude'))
+        )
+    ]
+    deleted_ids = [obj.id for obj in session.deleted if isinstance(obj, Endereco)]
+    
+    stale_ids = [(endereco.id,) for endereco in changed if endereco not in session.new] + [(endereco_id,) for endereco_id in deleted_ids]
+    if stale_ids:
+        connection.exec_driver_sql(f"DELETE FROM {RTREE_TABLE} WHERE id = ?", stale_ids)
+    
+    _insert_rtree_rows(connection, [(endereco.id, endereco.latitude, endereco.longitude) for endereco in changed])
@@ -0,0 +1,129 @@
+import json
+from itertools import islice
+from typing import Iterable, Iterator
+from marshmallow import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from models import Pet, Endereco
+from services import EnderecoService, FotoService, ThumbnailService, PetService
+from db import lock_for_write, unit_of_work
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+IMPORT_BATCH_SIZE = 500
+
+
+class ImportService:
+    """Importação em lote de pets (``POST /api/pets/bulk`` e ``flask pets import``)."""
+    
+    @staticmethod
+    def read_jsonl(lines: Iterable) -> Iterator[tuple[int, object]]:
+        """Lê JSON Lines sob demanda, gerando ``(linha, registro)`` ou ``(linha, ValueError)``."""
+        for line_number, line in enumerate(lines, start=1):
+            if isinstance(line, bytes):
+                line = line.decode('utf-8')
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError:
+                yield line_number, ValueError(f"JSON inválido na linha {line_number}")
+    
+    @staticmethod
+    def import_pets(records: Iterable[tuple[int, object]], batch_size: int = IMPORT_BATCH_SIZE) -> dict:
+        """Valida e grava os registros em lotes de ``batch_size``, uma transação por lote."""
+        result = {'created': 0, 'failed': 0, 'ids': [], 'errors': []}
+        
+        records = iter(records)
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                break
+            ImportService._import_batch(batch, result)
+        
+        if result['created']:
+            PetService._invalidate_caches(delta=result['created'])
+        
+        logger.info("Bulk import finished: %s created, %s failed", result['created'], result['failed'])
+        return result
+    
+    @staticmethod
+    def _import_batch(batch: list, result: dict):
+        from schemas import pet_create_validator
+        
+        def fail(ref, errors):
+            result['failed'] += 1
+            result['errors'].append({'index': ref, 'errors': errors})
+        
+        candidates = []
+        for ref, record in batch:
+            if isinstance(record, Exception):
+                fail(ref, {'_schema': [str(record)]})
+            else:
+                candidates.append((ref, record))
+        
+        try:
+            loaded = pet_create_validator.load([record for _, record in candidates], many=True)
+            invalid = {}
+        except ValidationError as e:
+            loaded, invalid = e.valid_data, e.messages
+        
+        valid = []
+        for position, (ref, _) in enumerate(candidates):
+            if position in invalid:
+                fail(ref, invalid[position])
+                continue
+            
+            pet_data = dict(loaded[position])
+            try:
+                pet_data['foto'], pet_data['foto_hash'] = FotoService.store_foto(pet_data.get('foto'))
+            except ValueError as e:
+                fail(ref, {'foto': [str(e)]})
+                continue
+            try:
+                pet_data['endereco_desaparecimento'] = EnderecoService.complete_endereco(pet_data['endereco_desaparecimento'])
+            except ValueError as e:
+                fail(ref, {'endereco_desaparecimento': [str(e)]})
+                continue
+            valid.append((ref, pet_data))
+        
+        if not valid:
+            return
+        
+        try:
+            with unit_of_work() as session:
+                enderecos = EnderecoService.get_or_create_enderecos([pet_data['endereco_desaparecimento'] for _, pet_data in valid])
+                pets = [ImportService._build_pet(pet_data, endereco) for (_, pet_data), endereco in zip(valid, enderecos)]
+                session.add_all(pets)
+                session.flush()
+                created = [(pet.id, pet.foto_hash) for pet in pets]
+        except SQLAlchemyError as e:
+            logger.warning("Bulk import batch failed, retrying record by record: %s", e)
+            created = ImportService._import_one_by_one(valid, fail)
+        
+        for pet_id, foto_hash in created:
+            result['created'] += 1
+            result['ids'].append(pet_id)
+            ThumbnailService.enqueue(foto_hash)
+    
+    @staticmethod
+    def _build_pet(pet_data: dict, endereco: Endereco) -> Pet:
+        pet_data = dict(pet_data)
+        pet_data.pop('endereco_desaparecimento')
+        return Pet(endereco=endereco, **pet_data)
+    
+    @staticmethod
+    def _import_one_by_one(valid: list, fail) -> list:
+        created = []
+        with unit_of_work() as session:
+            lock_for_write(session)
+            for ref, pet_data in valid:
+                try:
+                    with session.begin_nested():
+                        endereco = EnderecoService.get_or_create_endereco(pet_data['endereco_desaparecimento'])
+                        pet = ImportService._build_pet(pet_data, endereco)
+                        session.add(pet)
+                    created.append((pet.id, pet.foto_hash))
+                except SQLAlchemyError as e:
+                    fail(ref, {'_schema': [str(e.orig if getattr(e, 'orig', None) else e)]})
+        return created
@@ -0,0 +1,204 @@
+import math
+import re
+from array import array
+from datetime import timedelta
+from typing import List, Optional
+from sqlalchemy import case, func
+from models import Pet, Endereco
+from services.endereco_service import EnderecoService
+from services.geo_service import GeoService, KM_PER_DEGREE
+from db import db
+from logger import SAMPLED, get_logger
+from normalizer import normalize_text
+
+logger = get_logger(__name__)
+
+DEFAULT_MATCH_LIMIT = 10
+MAX_MATCH_LIMIT = 50
+DEFAULT_MATCH_RADIUS_KM = 20.0
+DEFAULT_MATCH_WINDOW_DAYS = 30
+MAX_MATCH_CANDIDATES = 5000
+
+MATCH_WEIGHTS = {
+    'porte': 0.15,
+    'sexo': 0.10,
+    'idade': 0.10,
+    'raca': 0.20,
+    'descricao': 0.15,
+    'distancia': 0.15,
+    'data': 0.15,
+}
+
+_TOKEN_RE = re.compile(r'\w{2,}')
+
+
+class MatchService:
+    """Candidatos a serem o mesmo animal que um pet (ou um relato de pet encontrado), do mais para o menos provável."""
+    
+    @staticmethod
+    def find_matches_for_pet(pet_id: int, limit: int = DEFAULT_MATCH_LIMIT, radius_km: float = DEFAULT_MATCH_RADIUS_KM,
+                             window_days: int = DEFAULT_MATCH_WINDOW_DAYS) -> Optional[List[dict]]:
+        """Candidatos para o pet ``pet_id`` (ele mesmo excluído); ``None`` se o pet não existe."""
+        pet = db.session.get(Pet, pet_id, options=[db.joinedload(Pet.endereco)])
+        if pet is None:
+            logger.warning("Pet not found for matching with ID: %s", pet_id)
+            return None
+        
+        reference = {
+            'id': pet.id,
+            'tipo': pet.tipo,
+            'porte': pet.porte,
+            'sexo': pet.sexo,
+            'idade': pet.idade,
+            'raca': pet.raca,
+            'descricao': pet.descricao,
+            'data_desaparecimento': pet.data_desaparecimento,
+            'latitude': pet.endereco.latitude if pet.endereco else None,
+            'longitude': pet.endereco.longitude if pet.endereco else None,
+            'cidade': pet.endereco.cidade if pet.endereco else None,
+        }
+        return MatchService.find_matches(reference, limit, radius_km, window_days)
+    
+    @staticmethod
+    def find_matches(reference: dict, limit: int = DEFAULT_MATCH_LIMIT, radius_km: float = DEFAULT_MATCH_RADIUS_KM,
+                     window_days: int = DEFAULT_MATCH_WINDOW_DAYS) -> List[dict]:
+        """Pontua os pets parecidos com ``reference`` e devolve os ``limit`` melhores."""
+        try:
+            rows = MatchService._candidates(reference, radius_km, window_days)
+            if not rows:
+                return []
+            
+            ids = [row.id for row in rows]
+            distances = _distances_km(reference, rows)
+            scores = MatchService._score(reference, rows, distances, radius_km, window_days)
+            
+            total = array('d', bytes(8 * len(rows)))
+            for criterion, weight in MATCH_WEIGHTS.items():
+                for position, value in enumerate(scores[criterion]):
+                    total[position] += weight * value
+            
+            ranked = sorted(range(len(rows)), key=lambda position: (-total[position], ids[position]))[:limit]
+            pets = {
+                pet.id: pet
+                for pet in Pet.query.options(db.joinedload(Pet.endereco)).filter(Pet.id.in_([ids[position] for position in ranked]))
+            }
+            
+            logger.info("Scored %s match candidates for pet %s", len(rows), reference.get('id'), extra=SAMPLED)
+            return [
+                {
+                    'pet': pets[ids[position]],
+                    'score': round(total[position], 4),
+                    'distance_km': None if distances[position] is None else round(distances[position], 2),
+                    'scores': {criterion: round(scores[criterion][position], 4) for criterion in MATCH_WEIGHTS}
+                }
+                for position in ranked
+                if ids[position] in pets
+            ]
+        except Exception as e:
+            logger.error("Error finding matches for pet %s: %s", reference.get('id'), e)
+            raise
+    
+    @staticmethod
+    def _candidates(reference: dict, radius_km: float, window_days: int) -> list:
+        data = reference['data_desaparecimento']
+        window = timedelta(days=window_days)
+        
+        base_query = db.session.query(
+            Pet.id, Pet.porte, Pet.sexo, Pet.idade, Pet.raca, Pet.descricao, Pet.data_desaparecimento,
+            Endereco.latitude, Endereco.longitude
+        ).join(Endereco, Pet.endereco_id == Endereco.id).filter(
+            Pet.tipo == reference['tipo'],
+            Pet.data_desaparecimento.between(data - window, data + window)
+        )
+        if reference.get('id') is not None:
+            base_query = base_query.filter(Pet.id != reference['id'])
+        
+        # Nota parcial calculada no banco (tudo menos raça e descrição), para cortar o bloco pelos melhores
+        partial_score = MATCH_WEIGHTS['data'] * (1 - _days_between(Pet.data_desaparecimento, data) / float(window_days))
+        for criterion in ('porte', 'sexo', 'idade'):
+            if reference.get(criterion) is not None:
+                partial_score = partial_score + case((getattr(Pet, criterion) == reference[criterion], MATCH_WEIGHTS[criterion]), else_=0.0)
+        
+        if reference.get('latitude') is not None and reference.get('longitude') is not None:
+            base_query = GeoService.within(base_query, reference['latitude'], reference['longitude'], radius_km)
+            # Distância ao quadrado: mantém a ordem sem depender de sqrt no banco
+            distance_squared = GeoService.distance_squared(reference['latitude'], reference['longitude'])
+            partial_score = partial_score + MATCH_WEIGHTS['distancia'] * (1 - distance_squared / (radius_km * radius_km))
+        elif reference.get('cidade'):
+            base_query = base_query.filter(*EnderecoService.cidade_conditions(Endereco.cidade_normalizada, reference['cidade']))
+        
+        rows = base_query.order_by(partial_score.desc(), Pet.id).limit(MAX_MATCH_CANDIDATES + 1).all()
+        if len(rows) > MAX_MATCH_CANDIDATES:
+            logger.warning(
+                "Match candidates for pet %s truncated to the %s best (tipo: %s, window: %s days, radius: %s km)",
+                reference.get('id'), MAX_MATCH_CANDIDATES, reference['tipo'], window_days, radius_km
+            )
+            rows = rows[:MAX_MATCH_CANDIDATES]
+        return rows
+    
+    @staticmethod
+    def _score(reference: dict, rows: list, distances: list, radius_km: float, window_days: int) -> dict:
+        """Nota de 0 a 1 de cada critério para todos os candidatos, uma coluna por critério."""
+        columns = list(zip(*rows))
+        porte, sexo, idade, raca, descricao, data = columns[1:7]
+        
+        raca_tokens = _tokens(reference.get('raca'))
+        descricao_tokens = _tokens(reference.get('descricao'))
+        reference_data = reference['data_desaparecimento']
+        window_seconds = timedelta(days=window_days).total_seconds()
+        
+        return {
+            'porte': _equality(porte, reference.get('porte')),
+            'sexo': _equality(sexo, reference.get('sexo')),
+            'idade': _equality(idade, reference.get('idade')),
+            'raca': array('d', (_jaccard(raca_tokens, _tokens(value)) for value in raca)),
+            'descricao': array('d', (_jaccard(descricao_tokens, _tokens(value)) for value in descricao)),
+            'distancia': array('d', (
+                0.0 if distance is None else max(0.0, 1.0 - distance / radius_km)
+                for distance in distances
+            )),
+            'data': array('d', (
+                max(0.0, 1.0 - abs((value - reference_data).total_seconds()) / window_seconds)
+                for value in data
+            )),
+        }
+
+
+def _equality(column, expected) -> array:
+    if expected is None:
+        return array('d', bytes(8 * len(column)))
+    return array('d', (1.0 if value == expected else 0.0 for value in column))
+
+
+def _tokens(value: Optional[str]) -> frozenset:
+    return frozenset(_TOKEN_RE.findall(normalize_text(value) or ''))
+
+
+def _jaccard(reference: frozenset, candidate: frozenset) -> float:
+    if not reference or not candidate:
+        return 0.0
+    return len(reference & candidate) / len(reference | candidate)
+
+
+def _days_between(column, value):
+    """Distância em dias (com fração) entre a coluna e ``value``, calculada no banco."""
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        return func.abs(func.julianday(column) - func.julianday(value.isoformat(sep=' ')))
+    if dialect == 'postgresql':
+        return func.abs(func.extract('epoch', column - value)) / 86400.0
+    return func.abs(func.datediff(column, value))
+
+
+def _distances_km(reference: dict, rows: list) -> list:
+    """Distância equiretangular (a mesma de ``GeoService``) até cada candidato; ``None`` sem coordenadas."""
+    latitude, longitude = reference.get('latitude'), reference.get('longitude')
+    if latitude is None or longitude is None:
+        return [None] * len(rows)
+    
+    km_per_degree_lon = KM_PER_DEGREE * math.cos(math.radians(latitude))
+    return [
+        None if row.latitude is None or row.longitude is None
+        else math.hypot((row.latitude - latitude) * KM_PER_DEGREE, (row.longitude - longitude) * km_per_degree_lon)
+        for row in rows
+    ]
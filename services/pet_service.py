@@ -1,12 +1,48 @@
+import base64
+import json
+import os
 from typing import List, Optional
 from datetime import datetime
+from sqlalchemy import and_, func, or_
 from models import Pet, Endereco
-from services import EnderecoService
-from db import db
-from logger import get_logger
+from services import EnderecoService, SearchService, GeoService, FotoService, ThumbnailService
+from cache import TTLCache
+from response_cache import response_cache
+from db import db, read_replica, replicas, unit_of_work
+from logger import SAMPLED, get_logger
+from normalizer import normalize_text
 
 logger = get_logger(__name__)
 
+COUNT_MODES = ('exact', 'estimate', 'none')
+ESTIMATE_COUNT_LIMIT = 1000
+
+count_cache = TTLCache(
+    maxsize=int(os.environ.get('COUNT_CACHE_SIZE', 512)),
+    ttl=float(os.environ.get('COUNT_CACHE_TTL', 60))
+)
+
+
+def encode_cursor(pet: Pet, direction: str = 'next') -> str:
+    payload = {'c': pet.created_at.isoformat(), 'i': pet.id, 'd': direction}
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str) -> tuple[datetime, int, str]:
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        created_at = datetime.fromisoformat(payload['c'])
+        pet_id = int(payload['i'])
+        direction = payload.get('d', 'next')
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Cursor inválido: {token}") from e
+    
+    if direction not in ('next', 'prev'):
+        raise ValueError(f"Cursor inválido: {token}")
+    return created_at, pet_id, direction
+
 
 class PetService:
     
@@ -16,141 +52,329 @@ class PetService:
             endereco_data = pet_data.pop('endereco_desaparecimento', None)
             if not endereco_data:
                 raise ValueError("Endereço de desaparecimento é obrigatório")
+            endereco_data = EnderecoService.complete_endereco(endereco_data)
             
-            endereco = EnderecoService.create_endereco(endereco_data)
+            pet_data['foto'], pet_data['foto_hash'] = FotoService.store_foto(pet_data.get('foto'))
             
-            pet_data['endereco_id'] = endereco.id
-            pet = Pet(**pet_data)
-            pet.save()
+            with unit_of_work() as session:
+                endereco = EnderecoService.get_or_create_endereco(endereco_data)
+                pet = Pet(endereco=endereco, **pet_data)
+                session.add(pet)
+            PetService._invalidate_caches(delta=1)
+            ThumbnailService.enqueue(pet.foto_hash)
             
-            logger.info(f"Pet created with ID: {pet.id} and endereco ID: {endereco.id}")
+            logger.info("Pet created with ID: %s and endereco ID: %s", pet.id, endereco.id)
             return pet
         except Exception as e:
-            logger.error(f"Error creating pet with endereco: {str(e)}")
+            logger.error("Error creating pet with endereco: %s", e)
             db.session.rollback()
             raise
     
     @staticmethod
-    def get_pet_by_id(pet_id: int) -> Optional[Pet]:
+    def get_pet_by_id(pet_id: int, projection=None) -> Optional[Pet]:
         try:
-            pet = Pet.query.options(db.joinedload(Pet.endereco)).get(pet_id)
+            with read_replica():
+                pet = Pet.query.options(*PetService._load_options(projection)).get(pet_id)
             if pet:
-                logger.info(f"Pet found with ID: {pet_id}")
+                logger.info("Pet found with ID: %s", pet_id, extra=SAMPLED)
             else:
-                logger.warning(f"Pet not found with ID: {pet_id}")
+                logger.warning("Pet not found with ID: %s", pet_id)
             return pet
         except Exception as e:
-            logger.error(f"Error getting pet by ID {pet_id}: {str(e)}")
+            logger.error("Error getting pet by ID %s: %s", pet_id, e)
             raise
     
     @staticmethod
     def get_all_pets(page_number: int = 1, page_size: int = 20) -> tuple[List[Pet], int]:
         try:
-            total_count = Pet.query.count()
-            
-            offset = (page_number - 1) * page_size
-            pets = Pet.query.options(db.joinedload(Pet.endereco)).order_by(Pet.created_at.desc()).offset(offset).limit(page_size).all()
+            with read_replica():
+                total_count = Pet.query.count()
+                
+                offset = (page_number - 1) * page_size
+                pets = Pet.query.options(db.joinedload(Pet.endereco)).order_by(Pet.created_at.desc(), Pet.id.desc()).offset(offset).limit(page_size).all()
             
-            logger.info(f"Retrieved {len(pets)} pets (page {page_number}, total: {total_count})")
+            logger.info("Retrieved %s pets (page %s, total: %s)", len(pets), page_number, total_count, extra=SAMPLED)
             return pets, total_count
         except Exception as e:
-            logger.error(f"Error getting all pets: {str(e)}")
+            logger.error("Error getting all pets: %s", e)
             raise
     
     @staticmethod
-    def search_pets_with_filters(filters: dict, page_number: int = 1, page_size: int = 20) -> tuple[List[Pet], int]:
+    def search_pets_with_filters(filters: dict, page_number: int = 1, page_size: int = 20, count_mode: str = 'exact', projection=None) -> tuple[List[Pet], Optional[int], bool]:
         try:
-            base_query = Pet.query.options(db.joinedload(Pet.endereco))
-            
-            if 'nome' in filters:
-                base_query = base_query.filter(Pet.nome.ilike(f'%{filters["nome"]}%'))
+            base_query = Pet.query.options(*PetService._load_options(projection))
+            base_query = PetService._apply_filters(base_query, filters, ranked=True)
+            base_query = base_query.order_by(Pet.created_at.desc(), Pet.id.desc())
             
-            if 'tipo' in filters:
-                base_query = base_query.filter(Pet.tipo == filters['tipo'])
+            with read_replica():
+                total_count, lower_bound = PetService._count(base_query, filters, count_mode)
+                
+                offset = (page_number - 1) * page_size
+                pets = base_query.offset(offset).limit(page_size).all()
             
-            if 'cidade' in filters:
-                base_query = base_query.join(Endereco).filter(
-                    Endereco.cidade.ilike(f'%{filters["cidade"]}%')
-                )
+            filter_str = PetService._describe_filters(filters)
+            logger.info("Found %s pets with filters (%s) (page %s, total: %s)", len(pets), filter_str, page_number, total_count, extra=SAMPLED)
+            return pets, total_count, lower_bound
+        except Exception as e:
+            logger.error("Error searching pets with filters: %s", e)
+            raise
+    
+    @staticmethod
+    def search_pets_by_cursor(filters: dict, page_size: int = 20, cursor: Optional[str] = None, projection=None) -> tuple[List[Pet], Optional[str], Optional[str]]:
+        try:
+            if filters.get('sort') == 'distance':
+                raise ValueError("Ordenação por distância não suporta paginação por cursor")
+            if 'q' in filters:
+                raise ValueError("Busca textual (ordenada por relevância) não suporta paginação por cursor")
             
-            if 'start_date' in filters and 'end_date' in filters:
-                base_query = base_query.filter(
-                    Pet.data_desaparecimento.between(filters['start_date'], filters['end_date'])
-                )
+            base_query = Pet.query.options(*PetService._load_options(projection))
+            base_query = PetService._apply_filters(base_query, filters)
             
-            base_query = base_query.order_by(Pet.created_at.desc())
+            direction = 'next'
+            if cursor:
+                created_at, pet_id, direction = decode_cursor(cursor)
+                if direction == 'next':
+                    base_query = base_query.filter(or_(
+                        Pet.created_at < created_at,
+                        and_(Pet.created_at == created_at, Pet.id < pet_id)
+                    ))
+                else:
+                    base_query = base_query.filter(or_(
+                        Pet.created_at > created_at,
+                        and_(Pet.created_at == created_at, Pet.id > pet_id)
+                    ))
             
-            total_count = base_query.count()
+            if direction == 'next':
+                base_query = base_query.order_by(Pet.created_at.desc(), Pet.id.desc())
+            else:
+                base_query = base_query.order_by(Pet.created_at.asc(), Pet.id.asc())
             
-            offset = (page_number - 1) * page_size
-            pets = base_query.offset(offset).limit(page_size).all()
+            with read_replica():
+                rows = base_query.limit(page_size + 1).all()
+            has_more = len(rows) > page_size
+            pets = rows[:page_size]
             
-            filter_description = []
-            if 'nome' in filters:
-                filter_description.append(f"nome: {filters['nome']}")
-            if 'tipo' in filters:
-                filter_description.append(f"tipo: {filters['tipo']}")
-            if 'cidade' in filters:
-                filter_description.append(f"cidade: {filters['cidade']}")
-            if 'start_date' in filters and 'end_date' in filters:
-                filter_description.append(f"data: {filters['start_date']} - {filters['end_date']}")
+            if direction == 'next':
+                next_cursor = encode_cursor(pets[-1], 'next') if has_more else None
+                prev_cursor = encode_cursor(pets[0], 'prev') if cursor and pets else None
+            else:
+                pets.reverse()
+                prev_cursor = encode_cursor(pets[0], 'prev') if has_more else None
+                next_cursor = encode_cursor(pets[-1], 'next') if pets else None
             
-            filter_str = ", ".join(filter_description) if filter_description else "sem filtros"
-            logger.info(f"Found {len(pets)} pets with filters ({filter_str}) (page {page_number}, total: {total_count})")
-            return pets, total_count
+            filter_str = PetService._describe_filters(filters)
+            logger.info("Found %s pets with filters (%s) (cursor %s)", len(pets), filter_str, direction, extra=SAMPLED)
+            return pets, next_cursor, prev_cursor
+        except ValueError:
+            # Parâmetros inválidos: o controller responde 400 e registra o aviso
+            raise
         except Exception as e:
-            logger.error(f"Error searching pets with filters: {str(e)}")
+            logger.error("Error searching pets by cursor: %s", e)
             raise
+    
+    @staticmethod
+    def _load_options(projection=None) -> list:
+        if projection is None:
+            return [db.joinedload(Pet.endereco)]
+        
+        columns = {'id', 'created_at'}
+        for field in projection.pet_fields:
+            if field == 'foto':
+                columns.update(('foto', 'foto_hash'))
+            elif field != 'endereco':
+                columns.add(field)
+        
+        options = []
+        if projection.endereco_fields:
+            columns.add('endereco_id')
+            options.append(db.joinedload(Pet.endereco).load_only(
+                *(getattr(Endereco, field) for field in projection.endereco_fields)
+            ))
+        options.insert(0, db.load_only(*(getattr(Pet, column) for column in sorted(columns))))
+        return options
+    
+    @staticmethod
+    def _apply_filters(base_query, filters: dict, ranked: bool = False):
+        relevance = None
+        if 'q' in filters:
+            base_query, relevance = SearchService.search(base_query, filters['q'])
+        
+        if 'cidade' in filters or 'near' in filters:
+            base_query = base_query.join(Endereco)
+        
+        if 'near' in filters:
+            latitude, longitude = filters['near']
+            base_query = GeoService.within(base_query, latitude, longitude, filters['radius_km'])
+            if ranked and filters.get('sort') == 'distance':
+                base_query = base_query.order_by(GeoService.distance_squared(latitude, longitude))
+        
+        if ranked and relevance is not None:
+            base_query = base_query.order_by(relevance)
+        
+        if 'nome' in filters:
+            base_query = base_query.filter(Pet.nome.ilike(f'%{filters["nome"]}%'))
+        
+        if 'tipo' in filters:
+            base_query = base_query.filter(Pet.tipo == filters['tipo'])
+        
+        if 'cidade' in filters:
+            base_query = base_query.filter(*EnderecoService.cidade_conditions(Endereco.cidade_normalizada, filters['cidade']))
+        
+        if 'start_date' in filters and 'end_date' in filters:
+            base_query = base_query.filter(
+                Pet.data_desaparecimento.between(filters['start_date'], filters['end_date'])
+            )
+        
+        return base_query
+    
+    @staticmethod
+    def _count_key(filters: dict) -> tuple:
+        key = []
+        for name, value in sorted(filters.items()):
+            if name == 'sort':
+                continue
+            if name == 'q':
+                value = tuple(SearchService.tokenize(value))
+            elif name in ('nome', 'cidade'):
+                value = normalize_text(value)
+            elif isinstance(value, datetime):
+                value = value.isoformat()
+            key.append((name, value))
+        return tuple(key)
+    
+    @staticmethod
+    def _count(base_query, filters: dict, count_mode: str = 'exact') -> tuple[Optional[int], bool]:
+        cached = PetService._cached_count(filters, count_mode)
+        if cached is not None or count_mode == 'none':
+            return cached, False
+        
+        total_count = db.session.execute(PetService._count_statement(base_query.statement, filters, count_mode)).scalar() or 0
+        return PetService._counted(total_count, filters, count_mode)
+    
+    @staticmethod
+    def _cached_count(filters: dict, count_mode: str) -> Optional[int]:
+        """Valida ``count_mode`` e devolve a contagem em cache dos filtros, se houver."""
+        if count_mode not in COUNT_MODES:
+            raise ValueError(f"Modo de contagem inválido: {count_mode}")
+        
+        if count_mode == 'none' or replicas.is_sticky():
+            return None
+        return count_cache.get(PetService._count_key(filters), allow_expired=count_mode == 'estimate')
+    
+    @staticmethod
+    def _count_statement(statement, filters: dict, count_mode: str):
+        """``SELECT`` da contagem ``exact`` ou ``estimate`` sobre a consulta filtrada (síncrona ou assíncrona)."""
+        if count_mode == 'estimate' and not filters:
+            return db.select(func.max(Pet.id))
+        
+        matching = statement.with_only_columns(Pet.id).order_by(None)
+        if count_mode == 'estimate':
+            matching = matching.limit(ESTIMATE_COUNT_LIMIT + 1)
+        return db.select(func.count()).select_from(matching.subquery())
+    
+    @staticmethod
+    def _counted(total_count: int, filters: dict, count_mode: str) -> tuple[int, bool]:
+        """Guarda a contagem exata em cache; uma estimativa que passou do limite vira ``(limite, True)``."""
+        if count_mode == 'exact':
+            count_cache.set(PetService._count_key(filters), total_count)
+        elif filters and total_count > ESTIMATE_COUNT_LIMIT:
+            return ESTIMATE_COUNT_LIMIT, True
+        return total_count, False
+    
+    @staticmethod
+    def _invalidate_caches(delta: int = 0):
+        PetService._invalidate_counts(delta)
+        response_cache.invalidate()
+    
+    @staticmethod
+    def _invalidate_counts(delta: int = 0):
+        unfiltered_key = PetService._count_key({})
+        unfiltered_count = count_cache.get(unfiltered_key)
+        count_cache.clear()
+        if unfiltered_count is not None and delta:
+            count_cache.set(unfiltered_key, unfiltered_count + delta)
+    
+    @staticmethod
+    def _describe_filters(filters: dict) -> str:
+        filter_description = []
+        if 'q' in filters:
+            filter_description.append(f"q: {filters['q']}")
+        if 'nome' in filters:
+            filter_description.append(f"nome: {filters['nome']}")
+        if 'tipo' in filters:
+            filter_description.append(f"tipo: {filters['tipo']}")
+        if 'cidade' in filters:
+            filter_description.append(f"cidade: {filters['cidade']}")
+        if 'near' in filters:
+            filter_description.append(f"near: {filters['near'][0]},{filters['near'][1]} ({filters['radius_km']} km)")
+        if 'start_date' in filters and 'end_date' in filters:
+            filter_description.append(f"data: {filters['start_date']} - {filters['end_date']}")
+        
+        return ", ".join(filter_description) if filter_description else "sem filtros"
 
     @staticmethod
     def update_pet_with_endereco(pet_id: int, pet_data: dict) -> Optional[Pet]:
         try:
-            pet = Pet.query.get(pet_id)
-            if not pet:
-                logger.warning(f"Pet not found for update with ID: {pet_id}")
-                return None
+            with unit_of_work() as session:
+                pet = session.get(Pet, pet_id, options=[db.joinedload(Pet.endereco)])
+                if not pet:
+                    logger.warning("Pet not found for update with ID: %s", pet_id)
+                    return None
+                
+                # Mantido aqui, o endereço antigo continua no identity map e o release_endereco não o relê
+                previous_endereco = pet.endereco
+                endereco_data = pet_data.pop('endereco_desaparecimento', None)
+                if endereco_data:
+                    # O endereço é compartilhado com outros pets: em vez de alterá-lo,
+                    # o pet passa a apontar para o endereço com os dados novos
+                    if pet.endereco is not None:
+                        endereco_data = {**EnderecoService.endereco_data(pet.endereco), **endereco_data}
+                    pet.endereco = EnderecoService.get_or_create_endereco(EnderecoService.complete_endereco(endereco_data))
+                
+                endereco_id = pet_data.pop('endereco_id', None)
+                if endereco_id is not None and endereco_id != pet.endereco_id:
+                    endereco = EnderecoService.get_endereco_by_id(endereco_id)
+                    if not endereco:
+                        raise ValueError(f"Endereço não encontrado com ID: {endereco_id}")
+                    pet.endereco = endereco
+                
+                if previous_endereco is not None and pet.endereco is not None and pet.endereco.id != previous_endereco.id:
+                    EnderecoService.release_endereco(previous_endereco.id)
+                
+                foto = pet_data.pop('foto', None)
+                new_foto_hash = None
+                if foto is not None:
+                    pet.foto, pet.foto_hash = FotoService.store_foto(foto)
+                    new_foto_hash = pet.foto_hash
+                
+                for key, value in pet_data.items():
+                    if hasattr(pet, key) and value is not None:
+                        setattr(pet, key, value)
             
-            endereco_data = pet_data.pop('endereco_desaparecimento', None)
-            if endereco_data:
-                if pet.endereco_id:
-                    updated_endereco = EnderecoService.update_endereco(pet.endereco_id, endereco_data)
-                    if not updated_endereco:
-                        endereco = EnderecoService.create_endereco(endereco_data)
-                        pet_data['endereco_id'] = endereco.id
-                else:
-                    endereco = EnderecoService.create_endereco(endereco_data)
-                    pet_data['endereco_id'] = endereco.id
-            
-            if 'endereco_id' in pet_data:
-                endereco = EnderecoService.get_endereco_by_id(pet_data['endereco_id'])
-                if not endereco:
-                    raise ValueError(f"Endereço não encontrado com ID: {pet_data['endereco_id']}")
-            
-            for key, value in pet_data.items():
-                if hasattr(pet, key) and value is not None:
-                    setattr(pet, key, value)
-            
-            pet.save()
-            logger.info(f"Pet updated with endereco with ID: {pet_id}")
+            PetService._invalidate_caches()
+            ThumbnailService.enqueue(new_foto_hash)
+            logger.info("Pet updated with endereco with ID: %s", pet_id)
             return pet
         except Exception as e:
-            logger.error(f"Error updating pet with endereco {pet_id}: {str(e)}")
+            logger.error("Error updating pet with endereco %s: %s", pet_id, e)
             db.session.rollback()
             raise
     
     @staticmethod
     def delete_pet(pet_id: int) -> bool:
         try:
-            pet = Pet.query.get(pet_id)
-            if not pet:
-                logger.warning(f"Pet not found for deletion with ID: {pet_id}")
-                return False
-            
-            pet.delete()
-            EnderecoService.delete_endereco(pet.endereco_id)
-            logger.info(f"Pet deleted with ID: {pet_id}")
+            with unit_of_work() as session:
+                pet = session.get(Pet, pet_id, options=[db.joinedload(Pet.endereco)])
+                if not pet:
+                    logger.warning("Pet not found for deletion with ID: %s", pet_id)
+                    return False
+                
+                session.delete(pet)
+                EnderecoService.release_endereco(pet.endereco_id)
+            PetService._invalidate_caches(delta=-1)
+            logger.info("Pet deleted with ID: %s", pet_id)
             return True
         except Exception as e:
-            logger.error(f"Error deleting pet {pet_id}: {str(e)}")
+            logger.error("Error deleting pet %s: %s", pet_id, e)
             db.session.rollback()
             raise
\ No newline at end of file
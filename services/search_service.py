@@ -0,0 +1,161 @@
+import re
+from typing import List
+from sqlalchemy import event, false, inspect, text
+from sqlalchemy.orm import Session
+from models import Pet
+from db import db
+from logger import get_logger
+from normalizer import normalize_text
+
+logger = get_logger(__name__)
+
+FTS_TABLE = 'pets_fts'
+FTS_COLUMNS = ('nome', 'raca', 'descricao')
+FTS_WEIGHTS = (10.0, 5.0, 1.0)
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+class SearchService:
+    
+    @staticmethod
+    def backend() -> str:
+        dialect = db.engine.dialect.name
+        if dialect == 'sqlite':
+            return 'fts5'
+        if dialect == 'postgresql':
+            return 'trigram'
+        return 'like'
+    
+    @staticmethod
+    def tokenize(q: str) -> List[str]:
+        return _TOKEN_RE.findall(normalize_text(q) or '')
+    
+    @staticmethod
+    def search(base_query, q: str):
+        """Restringe a consulta ao texto livre ``q`` e devolve ``(query, relevancia)``."""
+        tokens = SearchService.tokenize(q)
+        if not tokens:
+            return base_query.filter(false()), None
+        
+        backend = SearchService.backend()
+        
+        if backend == 'fts5':
+            match = ' '.join(f'"{token}"*' for token in tokens)
+            weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+            ranked = text(
+                f"SELECT rowid AS pet_id, bm25({FTS_TABLE}, {weights}) AS score "
+                f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match"
+            ).bindparams(match=match).columns(
+                db.column('pet_id', db.Integer), db.column('score', db.Float)
+            ).subquery('fts')
+            base_query = base_query.join(ranked, Pet.id == ranked.c.pet_id)
+            return base_query, ranked.c.score
+        
+        for token in tokens:
+            base_query = base_query.filter(Pet.busca_normalizada.like(f'%{token}%'))
+        
+        if backend == 'trigram':
+            return base_query, db.func.similarity(Pet.busca_normalizada, ' '.join(tokens)).desc()
+        return base_query, None
+    
+    @staticmethod
+    def rebuild_index(batch_size: int = 1000) -> int:
+        try:
+            connection = db.session.connection()
+            pets = Pet.__table__
+            
+            total = 0
+            last_id = 0
+            while True:
+                rows = connection.execute(
+                    db.select(pets.c.id, pets.c.nome, pets.c.raca, pets.c.descricao)
+                    .where(pets.c.id > last_id)
+                    .order_by(pets.c.id)
+                    .limit(batch_size)
+                ).all()
+                if not rows:
+                    break
+                
+                connection.execute(
+                    pets.update().where(pets.c.id == db.bindparam('pet_id')),
+                    [
+                        {'pet_id': row.id, 'busca_normalizada': Pet.build_busca_normalizada(row.nome, row.raca, row.descricao)}
+                        for row in rows
+                    ]
+                )
+                total += len(rows)
+                last_id = rows[-1].id
+            
+            if SearchService.backend() == 'fts5':
+                connection.exec_driver_sql(f'DELETE FROM {FTS_TABLE}')
+                populate_fts_table(connection, batch_size)
+            
+            db.session.commit()
+            logger.info("Search index rebuilt with %s pets", total)
+            return total
+        except Exception as e:
+            logger.error("Error rebuilding search index: %s", e)
+            db.session.rollback()
+            raise
+
+
+def fts_table_exists(connection) -> bool:
+    return connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+    ).first() is not None
+
+
+def create_fts_table(connection):
+    columns = ', '.join(FTS_COLUMNS)
+    connection.exec_driver_sql(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        f"{columns}, tokenize = 'unicode61 remove_diacritics 2')"
+    )
+
+
+def populate_fts_table(connection, batch_size: int = 1000):
+    last_id = 0
+    while True:
+        rows = connection.exec_driver_sql(
+            f"SELECT id, {', '.join(FTS_COLUMNS)} FROM pets WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, batch_size)
+        ).fetchall()
+        if not rows:
+            break
+        _insert_fts_rows(connection, rows)
+        last_id = rows[-1][0]
+
+
+def _insert_fts_rows(connection, rows):
+    params = [
+        (row[0], *(normalize_text(value) for value in row[1:]))
+        for row in rows
+    ]
+    if params:
+        connection.exec_driver_sql(
+            f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(FTS_COLUMNS)}) VALUES (?, ?, ?, ?)",
+            params
+        )
+
+
+@event.listens_for(Session, 'after_flush')
+def _sync_search_index(session, flush_context):
+    connection = session.connection()
+    if connection.dialect.name != 'sqlite':
+        return
+    
+    changed = [
+        obj for obj in list(session.new) + list(session.dirty)
+        if isinstance(obj, Pet) and (
+            obj in session.new
+            or any(inspect(obj).attrs[column].history.has_changes() for column in FTS_COLUMNS)
+        )
+    ]
+    deleted_ids = [obj.id for obj in session.deleted if isinstance(obj, Pet)]
+    
+    stale_ids = [(pet.id,) for pet in changed if pet not in session.new] + [(pet_id,) for pet_id in deleted_ids]
+    if stale_ids:
+        connection.exec_driver_sql(f"DELETE FROM {FTS_TABLE} WHERE rowid = ?", stale_ids)
+    
+    _insert_fts_rows(connection, [(pet.id, pet.nome, pet.raca, pet.descricao) for pet in changed])
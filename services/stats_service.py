@@ -0,0 +1,266 @@
+from collections import Counter
+from datetime import date, datetime
+from typing import List, Optional
+from sqlalchemy import event, func, inspect
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from models import Pet, Endereco, PetDailySummary
+from db import db
+from logger import SAMPLED, get_logger
+from services.endereco_service import EnderecoService
+
+logger = get_logger(__name__)
+
+PERIODS = ('dia', 'mes', 'ano')
+SUMMARY_KEY = ('dia', 'estado', 'cidade_normalizada', 'tipo')
+
+_UPSERT_INSERTS = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+
+
+class StatsService:
+    """Séries de pets perdidos por cidade servidas da tabela ``pet_daily_summaries``."""
+    
+    @staticmethod
+    def series(filters: dict, periodo: str = 'dia') -> List[dict]:
+        """Total de pets perdidos por período (dia, mês ou ano) e cidade."""
+        if periodo not in PERIODS:
+            raise ValueError(f"Período inválido: {periodo}")
+        
+        statement = db.select(
+            PetDailySummary.dia, PetDailySummary.estado, PetDailySummary.cidade_normalizada,
+            func.max(PetDailySummary.cidade), func.sum(PetDailySummary.total)
+        ).group_by(PetDailySummary.dia, PetDailySummary.estado, PetDailySummary.cidade_normalizada)
+        rows = db.session.execute(StatsService._apply_filters(statement, filters)).all()
+        
+        totals = Counter()
+        cidades = {}
+        for dia, estado, cidade_normalizada, cidade, total in rows:
+            key = (_period(dia, periodo), estado, cidade_normalizada)
+            totals[key] += total
+            cidades[key] = cidade
+        
+        series = [
+            {'periodo': key[0], 'cidade': cidades[key], 'estado': key[1], 'total': total}
+            for key, total in sorted(totals.items())
+            if total
+        ]
+        logger.info("Built %s series points from %s summary rows (%s)", len(series), len(rows), periodo, extra=SAMPLED)
+        return series
+    
+    @staticmethod
+    def cities(filters: dict, limit: int = 20) -> List[dict]:
+        """Cidades com mais pets perdidos no intervalo, da maior para a menor."""
+        total = func.sum(PetDailySummary.total)
+        statement = db.select(
+            PetDailySummary.estado, func.max(PetDailySummary.cidade), total
+        ).group_by(PetDailySummary.estado, PetDailySummary.cidade_normalizada)
+        statement = StatsService._apply_filters(statement, filters).having(total > 0)
+        statement = statement.order_by(total.desc(), PetDailySummary.estado, PetDailySummary.cidade_normalizada).limit(limit)
+        
+        return [
+            {'cidade': cidade, 'estado': estado, 'total': count}
+            for estado, cidade, count in db.session.execute(statement)
+        ]
+    
+    @staticmethod
+    def _apply_filters(statement, filters: dict):
+        if 'start_date' in filters:
+            statement = statement.where(PetDailySummary.dia >= filters['start_date'])
+        if 'end_date' in filters:
+            statement = statement.where(PetDailySummary.dia <= filters['end_date'])
+        if 'estado' in filters:
+            statement = statement.where(PetDailySummary.estado == filters['estado'])
+        if 'cidade' in filters:
+            statement = statement.where(*EnderecoService.cidade_conditions(PetDailySummary.cidade_normalizada, filters['cidade']))
+        if 'tipo' in filters:
+            statement = statement.where(PetDailySummary.tipo == filters['tipo'])
+        return statement
+    
+    @staticmethod
+    def rebuild() -> int:
+        """Recalcula todos os contadores a partir de ``pets`` e ``enderecos`` (backfill)."""
+        try:
+            connection = db.session.connection()
+            connection.execute(PetDailySummary.__table__.delete())
+            total = populate_summary(connection)
+            db.session.commit()
+            logger.info("Daily summary rebuilt with %s rows", total)
+            return total
+        except Exception as e:
+            logger.error("Error rebuilding daily summary: %s", e)
+            db.session.rollback()
+            raise
+
+
+def populate_summary(connection) -> int:
+    """``INSERT ... SELECT`` com um ``GROUP BY`` por (dia, estado, cidade, tipo) sobre os pets."""
+    pets, enderecos = Pet.__table__, Endereco.__table__
+    if connection.dialect.name == 'sqlite':
+        dia = func.date(pets.c.data_desaparecimento)
+    else:
+        dia = db.cast(pets.c.data_desaparecimento, db.Date)
+    cidade_normalizada = func.coalesce(enderecos.c.cidade_normalizada, '')
+    
+    select = db.select(
+        dia, enderecos.c.estado, cidade_normalizada, pets.c.tipo, func.max(enderecos.c.cidade), func.count()
+    ).select_from(pets.join(enderecos, enderecos.c.id == pets.c.endereco_id)).group_by(
+        dia, enderecos.c.estado, cidade_normalizada, pets.c.tipo
+    )
+    summary = PetDailySummary.__table__
+    connection.execute(summary.insert().from_select(SUMMARY_KEY + ('cidade', 'total'), select))
+    return connection.execute(db.select(func.count()).select_from(summary)).scalar()
+
+
+def apply_deltas(connection, deltas: Counter, cidades: dict):
+    """Soma cada diferença ao contador da chave (criando-o) e apaga os que zeraram."""
+    rows = [
+        dict(zip(SUMMARY_KEY, key), cidade=cidades[key], total=delta)
+        for key, delta in deltas.items()
+        if delta
+    ]
+    if not rows:
+        return
+    
+    summary = PetDailySummary.__table__
+    matches_key = [summary.c[name] == db.bindparam(f'key_{name}') for name in SUMMARY_KEY]
+    insert = _UPSERT_INSERTS.get(connection.dialect.name)
+    if insert is not None:
+        statement = insert(summary)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(SUMMARY_KEY),
+            set_={'total': summary.c.total + statement.excluded.total, 'cidade': statement.excluded.cidade}
+        )
+        connection.execute(statement, rows)
+    else:
+        update = summary.update().where(*matches_key).values(
+            total=summary.c.total + db.bindparam('delta'), cidade=db.bindparam('new_cidade')
+        )
+        for row in rows:
+            params = {f'key_{name}': row[name] for name in SUMMARY_KEY}
+            if connection.execute(update, dict(params, delta=row['total'], new_cidade=row['cidade'])).rowcount == 0:
+                connection.execute(summary.insert(), row)
+    
+    decremented = [{f'key_{name}': row[name] for name in SUMMARY_KEY} for row in rows if row['total'] < 0]
+    if decremented:
+        connection.execute(summary.delete().where(*matches_key, summary.c.total <= 0), decremented)
+
+
+def _period(dia, periodo: str) -> str:
+    if isinstance(dia, str):
+        dia = date.fromisoformat(dia)
+    if periodo == 'mes':
+        return dia.strftime('%Y-%m')
+    if periodo == 'ano':
+        return dia.strftime('%Y')
+    return dia.isoformat()
+
+
+def _committed(obj, key: str):
+    """Valor de ``key`` antes das alterações pendentes (o atual, se não mudou)."""
+    history = inspect(obj).attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return None if history.added else getattr(obj, key)
+
+
+def _summary_key(data_desaparecimento, tipo, estado, cidade_normalizada) -> Optional[tuple]:
+    if data_desaparecimento is None or tipo is None or estado is None:
+        return None
+    dia = data_desaparecimento.date() if isinstance(data_desaparecimento, datetime) else data_desaparecimento
+    return dia, estado, cidade_normalizada or '', tipo
+
+
+def _current_key(pet: Pet, endereco: Optional[Endereco], cidades: dict) -> Optional[tuple]:
+    if endereco is None:
+        return None
+    key = _summary_key(pet.data_desaparecimento, pet.tipo, endereco.estado, endereco.cidade_normalizada)
+    if key is not None:
+        cidades[key] = endereco.cidade
+    return key
+
+
+def _committed_key(pet: Pet, cidades: dict) -> Optional[tuple]:
+    endereco = _committed(pet, 'endereco')
+    if endereco is None:
+        return None
+    key = _summary_key(
+        _committed(pet, 'data_desaparecimento'), _committed(pet, 'tipo'),
+        _committed(endereco, 'estado'), _committed(endereco, 'cidade_normalizada')
+    )
+    if key is not None:
+        cidades.setdefault(key, _committed(endereco, 'cidade'))
+    return key
+
+
+def _endereco_of(session, pet: Pet) -> Optional[Endereco]:
+    if pet.endereco is None and pet.endereco_id is not None:
+        with session.no_autoflush:
+            return session.get(Endereco, pet.endereco_id)
+    return pet.endereco
+
+
+def _noop(target, value, oldvalue, initiator):
+    return value
+
+
+# Sem active_history um atributo expirado (após o commit) perde o valor antigo
+# ao ser reatribuído, e o contador de origem não seria decrementado
+for _attribute in (Pet.tipo, Pet.data_desaparecimento, Pet.endereco, Endereco.cidade, Endereco.cidade_normalizada, Endereco.estado):
+    event.listen(_attribute, 'set', _noop, active_history=True, retval=True)
+
+
+@event.listens_for(Session, 'before_flush')
+def _collect_summary_deltas(session, flush_context, instances):
+    deltas = Counter()
+    cidades = {}
+    
+    for pet in session.new:
+        if isinstance(pet, Pet):
+            deltas[_current_key(pet, _endereco_of(session, pet), cidades)] += 1
+    for pet in session.deleted:
+        if isinstance(pet, Pet):
+            deltas[_committed_key(pet, cidades)] -= 1
+    
+    handled_ids = {obj.id for obj in session.deleted if isinstance(obj, Pet)}
+    for pet in session.dirty:
+        if isinstance(pet, Pet) and pet not in session.deleted:
+            handled_ids.add(pet.id)
+            deltas[_committed_key(pet, cidades)] -= 1
+            deltas[_current_key(pet, _endereco_of(session, pet), cidades)] += 1
+    
+    # Pets que não estão na sessão mas cujo endereço mudou de cidade/estado
+    moved = [
+        endereco for endereco in session.dirty
+        if isinstance(endereco, Endereco) and endereco not in session.deleted and any(
+            inspect(endereco).attrs[column].history.has_changes() for column in ('cidade_normalizada', 'estado')
+        )
+    ]
+    if moved:
+        by_id = {endereco.id: endereco for endereco in moved}
+        pets = Pet.__table__
+        statement = db.select(pets.c.endereco_id, pets.c.data_desaparecimento, pets.c.tipo).where(
+            pets.c.endereco_id.in_(by_id), pets.c.id.not_in(handled_ids)
+        )
+        for endereco_id, data_desaparecimento, tipo in session.connection().execute(statement):
+            endereco = by_id[endereco_id]
+            old_key = _summary_key(
+                data_desaparecimento, tipo, _committed(endereco, 'estado'), _committed(endereco, 'cidade_normalizada')
+            )
+            new_key = _summary_key(data_desaparecimento, tipo, endereco.estado, endereco.cidade_normalizada)
+            cidades.setdefault(old_key, _committed(endereco, 'cidade'))
+            cidades[new_key] = endereco.cidade
+            deltas[old_key] -= 1
+            deltas[new_key] += 1
+    
+    deltas.pop(None, None)
+    if any(deltas.values()):
+        flush_context.attributes['summary_deltas'] = (deltas, cidades)
+
+
+@event.listens_for(Session, 'after_flush')
+def _apply_summary_deltas(session, flush_context):
+    pending = flush_context.attributes.get('summary_deltas')
+    if pending is not None:
+        apply_deltas(session.connection(), *pending)
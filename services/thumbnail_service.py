@@ -0,0 +1,88 @@
+import io
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+from flask import current_app
+from storage import PhotoStorage
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+THUMBNAIL_SIZES = (220, 640)
+LIST_FOTO_SIZE = 220
+DETAIL_FOTO_SIZE = 640
+
+
+class ThumbnailService:
+    """Gera as miniaturas das fotos em um pool de threads, fora do ciclo da requisição."""
+    
+    _executor: Optional[ThreadPoolExecutor] = None
+    _lock = threading.Lock()
+    
+    @staticmethod
+    def derivative_key(foto_hash: str, size: int) -> str:
+        return f'{foto_hash}_{size}'
+    
+    @staticmethod
+    def executor() -> ThreadPoolExecutor:
+        with ThumbnailService._lock:
+            if ThumbnailService._executor is None:
+                ThumbnailService._executor = ThreadPoolExecutor(
+                    max_workers=current_app.config.get('THUMBNAIL_WORKERS', 2),
+                    thread_name_prefix='thumbnails'
+                )
+            return ThumbnailService._executor
+    
+    @staticmethod
+    def reset_executor():
+        """Esquece o pool e o lock herdados no processo filho (workers do gunicorn com ``preload_app``)."""
+        ThumbnailService._executor = None
+        ThumbnailService._lock = threading.Lock()
+    
+    @staticmethod
+    def enqueue(foto_hash: Optional[str]) -> Optional[Future]:
+        if not foto_hash:
+            return None
+        
+        storage = current_app.extensions['foto_storage']
+        return ThumbnailService.executor().submit(ThumbnailService.generate, storage, foto_hash)
+    
+    @staticmethod
+    def generate(storage: PhotoStorage, foto_hash: str) -> int:
+        try:
+            from PIL import Image
+        except ImportError:
+            logger.warning("Pillow is not installed, skipping thumbnails")
+            return 0
+        
+        generated = 0
+        try:
+            with storage.open(foto_hash) as foto_file:
+                original = Image.open(foto_file)
+                original.load()
+            
+            for size in THUMBNAIL_SIZES:
+                key = ThumbnailService.derivative_key(foto_hash, size)
+                if storage.exists(key):
+                    continue
+                
+                image = original.copy()
+                image.thumbnail((size, size))
+                if image.mode != 'RGB':
+                    image = image.convert('RGB')
+                
+                buffer = io.BytesIO()
+                image.save(buffer, format='JPEG', quality=85, optimize=True)
+                storage.save(key, buffer.getvalue())
+                generated += 1
+            
+            logger.info("Generated %s thumbnails for foto %s", generated, foto_hash)
+            return generated
+        except Exception as e:
+            logger.error("Error generating thumbnails for foto %s: %s", foto_hash, e)
+            return generated
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=ThumbnailService.reset_executor)
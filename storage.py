@@ -0,0 +1,65 @@
+import os
+import tempfile
+from typing import BinaryIO
+
+
+class PhotoStorage:
+    """Interface de armazenamento de fotos endereçado por conteúdo (hash sha256)."""
+    
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+    
+    def save(self, key: str, data: bytes):
+        raise NotImplementedError
+    
+    def open(self, key: str) -> BinaryIO:
+        raise NotImplementedError
+    
+    def delete(self, key: str):
+        raise NotImplementedError
+
+
+class LocalPhotoStorage(PhotoStorage):
+    """Guarda cada blob uma única vez em ``<root>/<ab>/<cd>/<hash>``."""
+    
+    def __init__(self, root: str):
+        self.root = root
+    
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key[2:4], key)
+    
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+    
+    def save(self, key: str, data: bytes):
+        path = self.path(key)
+        if os.path.exists(path):
+            return
+        
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    def open(self, key: str) -> BinaryIO:
+        return open(self.path(key), 'rb')
+    
+    def delete(self, key: str):
+        path = self.path(key)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def init_storage(app, storage: PhotoStorage = None):
+    if storage is None:
+        root = app.config.get('FOTO_STORAGE_PATH') or os.path.join(app.instance_path, 'fotos')
+        storage = LocalPhotoStorage(root)
+    app.extensions['foto_storage'] = storage
+    return storage
@@ -1,95 +1,13 @@
 from flask_restx import fields
-from datetime import datetime
+from schemas.spec import PET_SPEC, ENDERECO_SPEC, DUMP, CREATE, UPDATE, build_model_fields
 
 def create_swagger_models(api):
-    endereco_model = api.model('Endereco', {
-        'id': fields.Integer(readonly=True, description='ID único do endereço'),
-        'cep': fields.String(required=True, description='CEP', example='01234567'),
-        'rua': fields.String(required=True, description='Rua e número', example='Rua das Flores, 123'),
-        'bairro': fields.String(required=True, description='Bairro', example='Centro'),
-        'cidade': fields.String(required=True, description='Cidade', example='São Paulo'),
-        'estado': fields.String(required=True, description='Estado', example='SP'),
-        'pais': fields.String(description='País', example='Brasil', default='Brasil'),
-        'created_at': fields.DateTime(readonly=True, description='Data de criação'),
-        'updated_at': fields.DateTime(readonly=True, description='Data de atualização')
-    })
-    
-    endereco_input_model = api.model('EnderecoInput', {
-        'cep': fields.String(required=True, description='CEP', example='01234567'),
-        'rua': fields.String(required=True, description='Rua e número', example='Rua das Flores, 123'),
-        'bairro': fields.String(required=True, description='Bairro', example='Centro'),
-        'cidade': fields.String(required=True, description='Cidade', example='São Paulo'),
-        'estado': fields.String(required=True, description='Estado', example='SP'),
-        'pais': fields.String(description='País', example='Brasil', default='Brasil')
-    })
-    
-    pet_model = api.model('Pet', {
-        'id': fields.Integer(readonly=True, description='ID único do pet'),
-        'tipo': fields.String(required=True, description='Tipo do pet', 
-                             enum=['Cachorro', 'Gato', 'Ave', 'Outro'], example='Cachorro'),
-        'foto': fields.String(description='URL da foto ou base64', example='https://placehold.co/220x220?text=Pré-visualização'),
-        'nome': fields.String(required=True, description='Nome do pet', example='Rex'),
-        'idade': fields.String(required=True, description='Idade do pet',
-                              enum=['Filhote', 'Adulto', 'Idoso'], example='Adulto'),
-        'porte': fields.String(required=True, description='Porte do pet',
-                              enum=['Pequeno', 'Medio', 'Grande'], example='Grande'),
-        'raca': fields.String(required=True, description='Raça do pet', example='Pastor Alemão'),
-        'info_contato': fields.String(required=True, description='Informações de contato', 
-                                     example='João Silva - (11) 99999-9999'),
-        'sexo': fields.String(required=True, description='Sexo do pet',
-                             enum=['Macho', 'Femea'], example='Macho'),
-        'descricao': fields.String(required=True, description='Descrição do pet', 
-                                  example='Cachorro muito dócil, pelagem marrom'),
-        'observacoes': fields.String(description='Observações adicionais', 
-                                    example='Tem uma cicatriz na pata esquerda'),
-        'data_desaparecimento': fields.DateTime(required=True, description='Data do desaparecimento',
-                                               example='2024-01-15T10:30:00'),
-        'endereco_id': fields.Integer(description='ID do endereço de desaparecimento'),
-        'endereco': fields.Nested(endereco_model, description='Endereço onde o pet desapareceu'),
-        'created_at': fields.DateTime(readonly=True, description='Data de criação'),
-        'updated_at': fields.DateTime(readonly=True, description='Data de atualização')
-    })
-    
-    pet_create_model = api.model('PetCreate', {
-        'tipo': fields.String(required=True, description='Tipo do pet',
-                             enum=['Cachorro', 'Gato', 'Ave', 'Outro'], example='Cachorro'),
-        'foto': fields.String(description='URL da foto ou base64', example='https://placehold.co/220x220?text=Pré-visualização'),
-        'nome': fields.String(required=True, description='Nome do pet', example='Rex'),
-        'idade': fields.String(required=True, description='Idade do pet',
-                              enum=['Filhote', 'Adulto', 'Idoso'], example='Adulto'),
-        'porte': fields.String(required=True, description='Porte do pet',
-                              enum=['Pequeno', 'Medio', 'Grande'], example='Grande'),
-        'raca': fields.String(required=True, description='Raça do pet', example='Pastor Alemão'),
-        'info_contato': fields.String(required=True, description='Informações de contato',
-                                     example='João Silva - (11) 99999-9999'),
-        'sexo': fields.String(required=True, description='Sexo do pet',
-                             enum=['Macho', 'Femea'], example='Macho'),
-        'descricao': fields.String(required=True, description='Descrição do pet',
-                                  example='Cachorro muito dócil, pelagem marrom'),
-        'observacoes': fields.String(description='Observações adicionais',
-                                    example='Tem uma cicatriz na pata esquerda'),
-        'data_desaparecimento': fields.DateTime(required=True, description='Data do desaparecimento',
-                                               example='2024-01-15T10:30:00'),
-        'endereco_desaparecimento': fields.Nested(endereco_input_model, required=True,
-                                                  description='Endereço onde o pet desapareceu')
-    })
+    endereco_model = api.model('Endereco', build_model_fields(ENDERECO_SPEC, DUMP))
+    endereco_input_model = api.model('EnderecoInput', build_model_fields(ENDERECO_SPEC, CREATE))
     
-    pet_update_model = api.model('PetUpdate', {
-        'tipo': fields.String(description='Tipo do pet', enum=['Cachorro', 'Gato', 'Ave', 'Outro']),
-        'foto': fields.String(description='URL da foto ou base64'),
-        'nome': fields.String(description='Nome do pet'),
-        'idade': fields.String(description='Idade do pet', enum=['Filhote', 'Adulto', 'Idoso']),
-        'porte': fields.String(description='Porte do pet', enum=['Pequeno', 'Medio', 'Grande']),
-        'raca': fields.String(description='Raça do pet'),
-        'info_contato': fields.String(description='Informações de contato'),
-        'sexo': fields.String(description='Sexo do pet', enum=['Macho', 'Femea']),
-        'descricao': fields.String(description='Descrição do pet'),
-        'observacoes': fields.String(description='Observações adicionais'),
-        'data_desaparecimento': fields.DateTime(description='Data do desaparecimento'),
-        'endereco_id': fields.Integer(description='ID do endereço de desaparecimento'),
-        'endereco_desaparecimento': fields.Nested(endereco_input_model, 
-                                                  description='Endereço onde o pet desapareceu (atualiza ou cria novo)')
-    })
+    pet_model = api.model('Pet', build_model_fields(PET_SPEC, DUMP, endereco_model))
+    pet_create_model = api.model('PetCreate', build_model_fields(PET_SPEC, CREATE, endereco_input_model))
+    pet_update_model = api.model('PetUpdate', build_model_fields(PET_SPEC, UPDATE, endereco_input_model))
     
     success_response_model = api.model('SuccessResponse', {
         'message': fields.String(description='Mensagem de sucesso'),
@@ -101,6 +19,18 @@ def create_swagger_models(api):
         'errors': fields.Raw(description='Detalhes dos erros')
     })
     
+    bulk_result_model = api.model('BulkResult', {
+        'created': fields.Integer(description='Pets criados', example=498),
+        'failed': fields.Integer(description='Registros rejeitados', example=2),
+        'ids': fields.List(fields.Integer, description='IDs dos pets criados'),
+        'errors': fields.Raw(description='Erros por registro: index (posição no array ou linha do NDJSON) e errors')
+    })
+    
+    bulk_response_model = api.model('BulkResponse', {
+        'message': fields.String(description='Resumo da importação'),
+        'data': fields.Nested(bulk_result_model, description='Resultado da importação')
+    })
+    
     pet_types_model = api.model('PetTypes', {
         'tipos': fields.List(fields.String, description='Tipos de pets disponíveis'),
         'idades': fields.List(fields.String, description='Idades disponíveis'),
@@ -113,8 +43,45 @@ def create_swagger_models(api):
         'page_size': fields.Integer(description='Tamanho da página', example=20),
         'total_count': fields.Integer(description='Total de registros', example=150),
         'total_pages': fields.Integer(description='Total de páginas', example=8),
+        'count_exact': fields.Boolean(description='Indica se total_count é a contagem exata (false com count=estimate)', example=True),
+        'total_count_is_lower_bound': fields.Boolean(description='Indica que a estimativa atingiu o limite: há mais de total_count pets e total_pages é null', example=False),
         'has_next': fields.Boolean(description='Indica se há próxima página', example=True),
-        'has_prev': fields.Boolean(description='Indica se há página anterior', example=False)
+        'has_prev': fields.Boolean(description='Indica se há página anterior', example=False),
+        'next_cursor': fields.String(description='Cursor opaco para a próxima página'),
+        'prev_cursor': fields.String(description='Cursor opaco para a página anterior')
+    })
+    
+    facet_count_model = api.model('FacetCount', {
+        'value': fields.String(description='Valor da faceta', example='Cachorro'),
+        'count': fields.Integer(description='Pets com esse valor', example=42)
+    })
+    
+    facets_model = api.model('Facets', {
+        'total_count': fields.Integer(description='Total de pets que atendem aos filtros', example=150),
+        'tipo': fields.List(fields.Nested(facet_count_model), description='Contagem por tipo (todos os tipos, inclusive zerados)'),
+        'porte': fields.List(fields.Nested(facet_count_model), description='Contagem por porte'),
+        'idade': fields.List(fields.Nested(facet_count_model), description='Contagem por idade'),
+        'sexo': fields.List(fields.Nested(facet_count_model), description='Contagem por sexo'),
+        'cidade': fields.List(fields.Nested(facet_count_model), description='Contagem por cidade (sem distinguir acentos), da maior para a menor'),
+        'estado': fields.List(fields.Nested(facet_count_model), description='Contagem por estado, da maior para a menor'),
+        'semana': fields.List(fields.Nested(facet_count_model), description='Contagem por semana do desaparecimento (segunda-feira, AAAA-MM-DD)')
+    })
+    
+    facets_response_model = api.model('FacetsResponse', {
+        'message': fields.String(description='Mensagem de sucesso'),
+        'data': fields.Nested(facets_model, description='Contagens por faceta')
+    })
+    
+    match_model = api.model('Match', {
+        'score': fields.Float(description='Semelhança com o pet de referência, de 0 a 1', example=0.82),
+        'distance_km': fields.Float(description='Distância entre os endereços em km (nulo sem coordenadas)', example=3.4),
+        'scores': fields.Raw(description='Nota de 0 a 1 de cada critério: porte, sexo, idade, raca, descricao, distancia, data'),
+        'pet': fields.Nested(pet_model, description='Pet candidato')
+    })
+    
+    matches_response_model = api.model('MatchesResponse', {
+        'message': fields.String(description='Mensagem de sucesso'),
+        'data': fields.List(fields.Nested(match_model), description='Candidatos, do mais para o menos provável')
     })
     
     paginated_response_model = api.model('PaginatedResponse', {
@@ -131,7 +98,14 @@ def create_swagger_models(api):
         'pet_update': pet_update_model,
         'success_response': success_response_model,
         'error_response': error_response_model,
+        'bulk_result': bulk_result_model,
+        'bulk_response': bulk_response_model,
         'pet_types': pet_types_model,
         'pagination': pagination_model,
+        'facet_count': facet_count_model,
+        'facets': facets_model,
+        'facets_response': facets_response_model,
+        'match': match_model,
+        'matches_response': matches_response_model,
         'paginated_response': paginated_response_model
     }
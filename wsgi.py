@@ -0,0 +1,5 @@
+#!/usr/bin/env python3
+"""Ponto de entrada WSGI (``gunicorn -c gunicorn.conf.py wsgi:application``)."""
+from app import create_app
+
+application = create_app()